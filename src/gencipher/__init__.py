@@ -0,0 +1,36 @@
+"""Python tool for deciphering cryptograms using genetic algorithms.
+
+The public classes are imported on first access, so importing gencipher
+does not load NumPy or the n-gram tables until they are needed.
+"""
+import importlib
+
+# typing alone takes longer to import than the rest of this module
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from typing import Any
+
+
+_EXPORTS = {
+    "Budget": "gencipher.budget",
+    "CipherKey": "gencipher.cipherkey",
+    "DecipherService": "gencipher.service",
+    "GeneticDecipher": "gencipher.model",
+    "Ngram": "gencipher.ngram",
+    "ResultCache": "gencipher.cache",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> "Any":
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute "
+                             f"{name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
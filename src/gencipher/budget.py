@@ -0,0 +1,88 @@
+import time
+from typing import Optional
+
+
+class BudgetValueError(ValueError):
+    """Inappropriate budget value."""
+    def __init__(self, var_name: str) -> None:
+        super().__init__(f"Invalid {var_name} value. Must be None or a "
+                         "number greater than zero (0).")
+
+
+class Budget:
+    """Wall-clock and fitness evaluation budget of a decipher run.
+
+    The budget is checked by the genetic algorithm before each fitness
+    evaluation, so a run can be stopped in the middle of a generation
+    or a full crossover.
+    """
+    def __init__(
+        self,
+        max_time: Optional[float] = None,
+        max_evaluations: Optional[int] = None
+    ) -> None:
+        """Create a Budget object.
+
+        Args:
+            max_time (float, optional): The maximum wall-clock time in
+            seconds. Defaults to None (unlimited).
+            max_evaluations (int, optional): The maximum number of
+            fitness evaluations. Defaults to None (unlimited).
+        """
+        if max_time is not None and max_time <= 0:
+            raise BudgetValueError("max_time")
+        if max_evaluations is not None and max_evaluations <= 0:
+            raise BudgetValueError("max_evaluations")
+
+        self.max_time = max_time
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0
+        self.start = time.perf_counter()
+        self.deadline = None if max_time is None else self.start + max_time
+
+    def spend(self, evaluations: int = 1) -> None:
+        """Register fitness evaluations against the budget.
+
+        Args:
+            evaluations (int, optional): The number of fitness
+            evaluations performed. Defaults to 1.
+        """
+        self.evaluations += evaluations
+
+    def restore(self, evaluations: int, elapsed: float) -> None:
+        """Carry over the evaluations and time spent by an interrupted
+        run, e.g. one resumed from a checkpoint.
+
+        Args:
+            evaluations (int): The fitness evaluations already
+            performed.
+            elapsed (float): The seconds already spent.
+        """
+        self.evaluations = evaluations
+        self.start -= elapsed
+        if self.deadline is not None:
+            self.deadline -= elapsed
+
+    @property
+    def remaining_evaluations(self) -> Optional[int]:
+        """Optional[int]: The fitness evaluations left, or None when
+        they are unlimited.
+        """
+        if self.max_evaluations is None:
+            return None
+        return max(0, self.max_evaluations - self.evaluations)
+
+    @property
+    def exhausted(self) -> bool:
+        """bool: Whether the time or the evaluations budget ran out."""
+        if (self.max_evaluations is not None
+                and self.evaluations >= self.max_evaluations):
+            return True
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return True
+        return False
+
+    @property
+    def elapsed(self) -> float:
+        """float: Seconds elapsed since the budget was created."""
+        return time.perf_counter() - self.start
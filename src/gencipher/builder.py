@@ -0,0 +1,231 @@
+"""Build n-gram score tables from raw text corpora.
+
+The corpus files are streamed in chunks, n-grams of every order are
+counted across a process pool and the merged counts are written as the
+.npz entries files loaded by Ngram.
+
+    python -m gencipher.builder corpus.txt --output-folder scores/
+"""
+import os
+import re
+import math
+import argparse
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+from gencipher.options import NgramType
+from gencipher.tables import save_entries
+
+
+ORDERS = (1, 2, 3, 4, 5)
+CHUNK_SIZE = 1 << 22
+
+
+class OrdersError(ValueError):
+    """Inappropriate n-gram orders."""
+    def __init__(self) -> None:
+        super().__init__("Invalid orders. Each order must be an integer "
+                         f"between one (1) and {len(NgramType.values())}.")
+
+
+def iter_chunks(
+    file_path: Union[str, Path],
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = 0
+) -> Iterator[tuple[bytes, int]]:
+    """Stream the letters of a text file in chunks, ignoring
+    non-alphabetical characters. Each chunk starts with the last
+    overlap letters of the previous one, so n-grams crossing chunk
+    boundaries are not lost.
+
+    Args:
+        file_path (Union[str, Path]): The path to the corpus text file.
+        chunk_size (int, optional): The number of characters read at a
+        time. Defaults to CHUNK_SIZE.
+        overlap (int, optional): The number of letters carried over
+        from one chunk to the next. Defaults to 0.
+
+    Yields:
+        tuple[bytes, int]: The alphabet positions (0-25) of the letters
+        of the chunk, and the number of leading letters carried over
+        from the previous chunk.
+    """
+    carry = b""
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
+        while True:
+            text = file.read(chunk_size)
+            if not text:
+                break
+            letters = re.sub(r"[^A-Z]", "", text.upper()).encode("ascii")
+            if not letters:
+                continue
+            codes = np.frombuffer(letters, dtype=np.uint8) - 65
+            yield carry + codes.tobytes(), len(carry)
+            carry = (carry + codes.tobytes())[-overlap:] if overlap else b""
+
+
+def count_chunk(
+    codes: bytes,
+    carried: int,
+    orders: Sequence[int]
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Count the n-grams of a chunk yielded by iter_chunks, skipping
+    those made only of carried over letters, which were counted with
+    the previous chunk.
+
+    Args:
+        codes (bytes): The alphabet positions of the chunk letters.
+        carried (int): The number of leading letters carried over.
+        orders (Sequence[int]): The n-gram lengths to count.
+
+    Returns:
+        list[tuple[np.ndarray, np.ndarray]]: For every order, the
+        base-26 indices of the n-grams found and their counts.
+    """
+    letters = np.frombuffer(codes, dtype=np.uint8).astype(np.intp)
+    counts = []
+    for order in orders:
+        start = max(carried - order + 1, 0)
+        n_ngrams = len(letters) - order + 1 - start
+        if n_ngrams <= 0:
+            counts.append((np.empty(0, dtype=np.intp),
+                           np.empty(0, dtype=np.int64)))
+            continue
+
+        indices = letters[start:start + n_ngrams]
+        for offset in range(1, order):
+            indices = indices * 26 + letters[start + offset:
+                                             start + offset + n_ngrams]
+        if 26 ** order <= n_ngrams:
+            dense = np.bincount(indices, minlength=26 ** order)
+            found = np.flatnonzero(dense)
+            counts.append((found, dense[found]))
+        else:
+            found, found_counts = np.unique(indices, return_counts=True)
+            counts.append((found, found_counts.astype(np.int64)))
+    return counts
+
+
+def count_corpus(
+    file_paths: Sequence[Union[str, Path]],
+    orders: Sequence[int] = ORDERS,
+    n_workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> dict[int, np.ndarray]:
+    """Count the n-grams of several corpus files, streaming them in
+    chunks counted across a process pool.
+
+    Args:
+        file_paths (Sequence[Union[str, Path]]): The corpus text files.
+        orders (Sequence[int], optional): The n-gram lengths to count.
+        Defaults to ORDERS.
+        n_workers (int, optional): The number of worker processes, or
+        zero (0) to count in the calling process. Defaults to None (one
+        per CPU).
+        chunk_size (int, optional): The number of characters read at a
+        time. Defaults to CHUNK_SIZE.
+
+    Raises:
+        OrdersError: Raised if an order is not a valid n-gram length.
+
+    Returns:
+        dict[int, np.ndarray]: For every order, the count of every
+        possible n-gram indexed by its base-26 index.
+    """
+    if not orders or any(order not in range(1, len(NgramType.values()) + 1)
+                         for order in orders):
+        raise OrdersError()
+
+    totals = {order: np.zeros(26 ** order, dtype=np.int64)
+              for order in orders}
+
+    def merge(chunk_counts: list[tuple[np.ndarray, np.ndarray]]) -> None:
+        for order, (indices, counts) in zip(orders, chunk_counts):
+            totals[order][indices] += counts
+
+    executor: Optional[Executor] = None
+    if n_workers != 0:
+        executor = ProcessPoolExecutor(n_workers)
+    max_pending = 2 * (n_workers or os.cpu_count() or 1)
+
+    try:
+        pending: deque[Future[list[tuple[np.ndarray, np.ndarray]]]] = deque()
+        for file_path in file_paths:
+            for codes, carried in iter_chunks(file_path, chunk_size,
+                                              max(orders) - 1):
+                if executor is None:
+                    merge(count_chunk(codes, carried, orders))
+                    continue
+                # Bound the chunks in flight, so memory does not grow
+                # with the corpus size
+                pending.append(executor.submit(count_chunk, codes, carried,
+                                               orders))
+                if len(pending) >= max_pending:
+                    merge(pending.popleft().result())
+        while pending:
+            merge(pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return totals
+
+
+def write_scores(
+    counts: dict[int, np.ndarray],
+    output_folder: Union[str, Path]
+) -> list[str]:
+    """Convert n-gram counts into log probabilities and save them as
+    the .npz entries files loaded by Ngram.
+
+    Args:
+        counts (dict[int, np.ndarray]): The counts returned by
+        count_corpus.
+        output_folder (Union[str, Path]): The folder where the files
+        are written.
+
+    Returns:
+        list[str]: The paths of the written files.
+    """
+    ngram_types = NgramType.values()
+    written = []
+    for order, order_counts in counts.items():
+        total = int(order_counts.sum())
+        if total == 0:
+            continue
+
+        indices = np.flatnonzero(order_counts)
+        frequencies = order_counts[indices]
+        values = np.log10(frequencies / total)
+        fitness = float((values * frequencies).sum() / total)
+        floor = math.log10(0.01 / total)
+
+        file_path = os.path.join(output_folder,
+                                 f"english_{ngram_types[order - 1]}s.npz")
+        save_entries(file_path, indices, values, floor, fitness)
+        written.append(file_path)
+    return written
+
+
+def main(argv=None):  # pragma: no cover
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="+", help="Corpus text files.")
+    parser.add_argument("--output-folder", required=True)
+    parser.add_argument("--orders", type=int, nargs="+", default=ORDERS)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes, 0 to count in-process.")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    counts = count_corpus(args.corpus, args.orders, args.workers,
+                          args.chunk_size)
+    for file_path in write_scores(counts, args.output_folder):
+        print(file_path)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,176 @@
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+from gencipher.cipherkey import CipherKey
+
+
+class MaxEntriesError(ValueError):
+    """Inappropriate max_entries value."""
+    def __init__(self) -> None:
+        super().__init__("Invalid max_entries value. Must be an integer "
+                         "greater than zero (0).")
+
+
+class ResultCache:
+    """Persistent store of solved cipher keys, backed by SQLite.
+
+    Entries are keyed by a hash of the cipher text letters, uppercased
+    and without spaces or punctuation, and of the solver configuration
+    that changes the answer (n-gram type and cribs). When the store is
+    full, the least recently used entries are evicted.
+    """
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        max_entries: int = 10000,
+        min_confidence: float = 0.95
+    ) -> None:
+        """Create a ResultCache object.
+
+        Args:
+            path (Union[str, Path], optional): The SQLite database file,
+            created if missing. Defaults to ":memory:" (not persisted).
+            max_entries (int, optional): The maximum number of stored
+            results. Defaults to 10000.
+            min_confidence (float, optional): The fitness percentage
+            below which a stored result is ignored, so its cipher text
+            is solved again. Defaults to 0.95.
+
+        Raises:
+            MaxEntriesError: Raised if max_entries is not greater than
+            zero (0).
+        """
+        if max_entries <= 0:
+            raise MaxEntriesError()
+
+        self.max_entries = max_entries
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path),
+                                           check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "digest TEXT PRIMARY KEY, "
+                "key TEXT NOT NULL, "
+                "fitness REAL NOT NULL, "
+                "confidence REAL NOT NULL, "
+                "accessed INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed "
+                "ON results (accessed)"
+            )
+
+    @staticmethod
+    def digest(
+        cipher_text: str,
+        ngram_type: str,
+        mapping: Optional[dict[str, str]] = None
+    ) -> str:
+        """Compute the cache key of a cipher text and configuration.
+
+        Args:
+            cipher_text (str): The cipher text.
+            ngram_type (str): The type of n-gram used to score keys.
+            mapping (dict[str, str], optional): The letters pinned by
+            cribs. Defaults to None.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest.
+        """
+        letters = "".join(c for c in cipher_text.upper() if c.isalpha())
+        pins = ",".join(f"{c}{p}" for c, p in sorted((mapping or {}).items()))
+        return hashlib.sha256(
+            f"{ngram_type}|{pins}|{letters}".encode()
+        ).hexdigest()
+
+    def get(
+        self,
+        cipher_text: str,
+        ngram_type: str,
+        mapping: Optional[dict[str, str]] = None
+    ) -> Optional[tuple[CipherKey, float, float]]:
+        """Look up the stored result of a cipher text.
+
+        Args:
+            cipher_text (str): The cipher text.
+            ngram_type (str): The type of n-gram used to score keys.
+            mapping (dict[str, str], optional): The letters pinned by
+            cribs. Defaults to None.
+
+        Returns:
+            Optional[tuple[CipherKey, float, float]]: The cipher key,
+            its fitness and its fitness percentage, or None if there is
+            no result at least as confident as min_confidence.
+        """
+        digest = self.digest(cipher_text, ngram_type, mapping)
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT key, fitness, confidence FROM results "
+                "WHERE digest = ? AND confidence >= ?",
+                (digest, self.min_confidence)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE results SET accessed = ("
+                "SELECT MAX(accessed) + 1 FROM results) WHERE digest = ?",
+                (digest,)
+            )
+        return CipherKey(row[0]), row[1], row[2]
+
+    def put(
+        self,
+        cipher_text: str,
+        ngram_type: str,
+        key: CipherKey,
+        fitness: float,
+        confidence: float,
+        mapping: Optional[dict[str, str]] = None
+    ) -> None:
+        """Store the result of a cipher text, unless a more confident
+        one is already stored, and evict the least recently used results
+        beyond max_entries.
+
+        Args:
+            cipher_text (str): The cipher text.
+            ngram_type (str): The type of n-gram used to score keys.
+            key (CipherKey): The best cipher key found.
+            fitness (float): The fitness of the key.
+            confidence (float): The fitness percentage of the key.
+            mapping (dict[str, str], optional): The letters pinned by
+            cribs. Defaults to None.
+        """
+        digest = self.digest(cipher_text, ngram_type, mapping)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ("
+                "SELECT COALESCE(MAX(accessed), 0) + 1 FROM results)) "
+                "ON CONFLICT (digest) DO UPDATE SET "
+                "key = excluded.key, fitness = excluded.fitness, "
+                "confidence = excluded.confidence, "
+                "accessed = excluded.accessed "
+                "WHERE excluded.confidence > results.confidence",
+                (digest, str(key), fitness, confidence)
+            )
+            self._connection.execute(
+                "DELETE FROM results WHERE digest IN ("
+                "SELECT digest FROM results ORDER BY accessed DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
@@ -1,6 +1,10 @@
 import string
-import random
-from typing import TypeVar, Type
+from pathlib import Path
+from typing import Optional, TypeVar, Type, Union
+
+import numpy as np
+
+from gencipher.rng import get_rng
 
 
 class InvalidCipherKey(ValueError):
@@ -62,13 +66,35 @@ class CipherKey(str):
         return cipher_text.translate(self._decode_table)
 
 
-def random_cipher_key() -> CipherKey:
+def random_cipher_key(
+    rng: Optional[np.random.Generator] = None
+) -> CipherKey:
     """Generate a random substitution cipher key.
 
+    Args:
+        rng (np.random.Generator, optional): The random number
+        generator to be used. Defaults to None (module generator).
+
     Returns:
         CipherKey: A randomly shuffled CipherKey.
     """
-    cipher_key_list = list(string.ascii_uppercase)
-    random.shuffle(cipher_key_list)
+    permutation = get_rng(rng).permutation(len(string.ascii_uppercase))
+    cipher_key_list = [string.ascii_uppercase[idx] for idx in permutation]
     cipher_key_str = CipherKey("".join(cipher_key_list))
     return cipher_key_str
+
+
+def read_cipher_keys(file_path: Union[str, Path]) -> list[CipherKey]:
+    """Read cipher keys from a text file with one key per line. Blank
+    lines and lines starting with "#" are ignored.
+
+    Args:
+        file_path (Union[str, Path]): The path to the keys text file.
+
+    Returns:
+        list[CipherKey]: The cipher keys, in file order.
+    """
+    with open(file_path, "r") as file:
+        lines = [line.strip() for line in file]
+    return [CipherKey(line) for line in lines
+            if line and not line.startswith("#")]
@@ -0,0 +1,296 @@
+"""Decipher cryptograms in bulk from JSONL files.
+
+Every input line is a JSON object with a "cipher_text" and, optionally,
+an "id" echoed in the output and "cribs". One JSON result per line is
+written as soon as it is ready, so the output order may differ from the
+input order.
+
+    gencipher input.jsonl --workers 4 --output results.jsonl
+"""
+import sys
+import json
+import time
+import argparse
+from typing import TYPE_CHECKING, IO, Any, Iterator, Optional, Sequence
+
+# The solver, NumPy, sqlite3 and multiprocessing are imported where they
+# are used, so --help and argument errors do not load them
+from gencipher.options import (
+    CrossoverType, EngineType, MutationType, NgramType, SeedingType
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Future
+
+    from gencipher.model import GeneticDecipher
+
+
+_DECIPHER_PARAMS = ("max_iter", "tolerance", "n_population",
+                    "mutation_type", "crossover_type", "mutation_rate",
+                    "crossover_rate", "max_time", "max_evaluations",
+                    "seeding", "random_fraction", "engine", "niche_radius")
+
+# GeneticDecipher and options of the current worker process
+_worker: dict[str, Any] = {}
+
+
+def read_tasks(files: Sequence[IO[str]]) -> Iterator[dict[str, Any]]:
+    """Read the cipher texts of JSONL files lazily.
+
+    Args:
+        files (Sequence[IO[str]]): The open input files.
+
+    Yields:
+        dict[str, Any]: The task of every non-blank line, with its
+        "index" (line number across all files, from 0) and either the
+        parsed "line" object or a parsing "error".
+    """
+    index = 0
+    for file in files:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                task = {"index": index, "line": json.loads(line)}
+                if not isinstance(task["line"].get("cipher_text"), str):
+                    raise ValueError("missing \"cipher_text\" string")
+            except (ValueError, AttributeError) as error:
+                task = {"index": index, "error": f"Invalid line: {error}"}
+            yield task
+            index += 1
+
+
+def init_worker(config: dict[str, Any]) -> None:
+    """Create the GeneticDecipher of the current process.
+
+    Args:
+        config (dict[str, Any]): The parsed command-line options.
+    """
+    from gencipher.model import GeneticDecipher
+    from gencipher.ngram import Ngram
+
+    cache = None
+    if config["cache"] is not None:
+        from gencipher.cache import ResultCache
+
+        cache = ResultCache(config["cache"])
+    ngram = Ngram(config["ngram_type"], config["scores_folder"])
+    _worker["gencipher"] = GeneticDecipher(ngram,
+                                           cache=cache,
+                                           key_library=config["key_library"],
+                                           profile=config["profile"])
+    _worker["config"] = config
+
+
+def solve(task: dict[str, Any]) -> dict[str, Any]:
+    """Decipher the cipher text of a task with the process
+    GeneticDecipher created by init_worker.
+
+    Args:
+        task (dict[str, Any]): A task yielded by read_tasks.
+
+    Returns:
+        dict[str, Any]: The result, with the "id" of the input line,
+        the best "key", its "fitness" percentage, the "plaintext",
+        the number of "generations" and fitness "evaluations", and the
+        wall-clock "time" in seconds; or an "error" message.
+    """
+    gencipher: GeneticDecipher = _worker["gencipher"]
+    config = _worker["config"]
+    result: dict[str, Any] = {"index": task["index"]}
+    if "error" in task:
+        result["error"] = task["error"]
+        return result
+
+    line = task["line"]
+    if "id" in line:
+        result["id"] = line["id"]
+    if config["seed"] is not None:
+        import numpy as np
+
+        gencipher.rng = np.random.default_rng([config["seed"],
+                                               task["index"]])
+
+    params = {name: config[name] for name in _DECIPHER_PARAMS}
+    start = time.perf_counter()
+    try:
+        plaintext = gencipher.decipher(line["cipher_text"],
+                                       cribs=line.get("cribs"),
+                                       **params)
+    except (ValueError, TypeError, AttributeError) as error:
+        result["error"] = str(error)
+        return result
+    except Exception as error:
+        # Any other failure ends its line, not the whole batch
+        result["error"] = f"{type(error).__name__}: {error}"
+        return result
+
+    fitness = gencipher.history["fitness"]
+    result.update({"key": str(gencipher.best_key[0]),
+                   "fitness": float(fitness[-1]) if fitness else None,
+                   "plaintext": plaintext,
+                   "generations": len(fitness),
+                   "evaluations": gencipher.budget.evaluations,
+                   "time": time.perf_counter() - start})
+    return result
+
+
+def run(
+    tasks: Iterator[dict[str, Any]],
+    config: dict[str, Any],
+    output: IO[str]
+) -> int:
+    """Solve tasks across worker processes and stream the results as
+    JSONL. At most twice as many tasks as workers are in flight, so
+    memory does not grow with the input size.
+
+    Args:
+        tasks (Iterator[dict[str, Any]]): The tasks from read_tasks.
+        config (dict[str, Any]): The parsed command-line options.
+        output (IO[str]): The file the results are written to.
+
+    Returns:
+        int: The number of failed tasks.
+    """
+    failures = 0
+
+    def write(result: dict[str, Any]) -> None:
+        nonlocal failures
+        failures += "error" in result
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    if config["workers"] <= 1:
+        # main already built the GeneticDecipher of this process
+        if _worker.get("config") is not config:
+            init_worker(config)
+        for task in tasks:
+            write(solve(task))
+        return failures
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    with ProcessPoolExecutor(config["workers"], initializer=init_worker,
+                             initargs=(config,)) as executor:
+        pending: set[Future[dict[str, Any]]] = set()
+        for task in tasks:
+            pending.add(executor.submit(solve, task))
+            if len(pending) >= 2 * config["workers"]:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+        for future in wait(pending).done:
+            write(future.result())
+    return failures
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse the command-line options.
+
+    Args:
+        argv (Sequence[str], optional): The arguments. Defaults to None
+        (sys.argv).
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(
+        prog="gencipher",
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("input", nargs="*", default=["-"],
+                        help="JSONL input files, '-' for stdin.")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL output file, '-' for stdout.")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Worker processes.")
+    parser.add_argument("--ngram-type", default="quadgram",
+                        choices=NgramType.values())
+    parser.add_argument("--scores-folder", default=None,
+                        help="Folder of n-gram scores built by python -m "
+                             "gencipher.builder, e.g. for quintgrams. "
+                             "Defaults to the packaged scores.")
+    parser.add_argument("--max-iter", type=int, default=None,
+                        help="Defaults to the profile value, or 20.")
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    parser.add_argument("--n-population", type=int, default=None,
+                        help="Defaults to the profile value, or 100.")
+    parser.add_argument("--mutation-type", default=None,
+                        choices=MutationType.values(),
+                        help="Defaults to the profile value, or scramble.")
+    parser.add_argument("--crossover-type", default=None,
+                        choices=CrossoverType.values(),
+                        help="Defaults to the profile value, or full.")
+    parser.add_argument("--mutation-rate", type=float, default=None,
+                        help="Defaults to the profile value, or 0.01.")
+    parser.add_argument("--crossover-rate", type=float, default=None,
+                        help="Defaults to the profile value, or 0.6.")
+    parser.add_argument("--max-time", type=float, default=None,
+                        help="Seconds per cipher text.")
+    parser.add_argument("--max-evaluations", type=int, default=None,
+                        help="Fitness evaluations per cipher text.")
+    parser.add_argument("--seeding", default="random",
+                        choices=SeedingType.values())
+    parser.add_argument("--random-fraction", type=float, default=0.2)
+    parser.add_argument("--engine", default="generational",
+                        choices=EngineType.values())
+    parser.add_argument("--niche-radius", type=int, default=0,
+                        help="Hamming radius of fitness sharing, 0 to "
+                             "disable.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed of every cipher text, combined with its "
+                             "line index.")
+    parser.add_argument("--cache", default=None,
+                        help="SQLite result cache file.")
+    parser.add_argument("--key-library", default=None,
+                        help="Text file of known keys, one per line.")
+    parser.add_argument("--profile", default=None,
+                        help="Tuned parameters JSON file, written by "
+                             "python -m gencipher.tuning.")
+    args = parser.parse_args(argv)
+
+    from gencipher.ngram import ScoresNotFoundError, scores_file
+
+    try:
+        scores_file(args.ngram_type, args.scores_folder)
+    except ScoresNotFoundError as error:
+        parser.error(str(error))
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the gencipher command.
+
+    Args:
+        argv (Sequence[str], optional): The arguments. Defaults to None
+        (sys.argv).
+
+    Returns:
+        int: The exit status, one (1) if any cipher text failed, two
+        (2) if the options are invalid.
+    """
+    config = vars(parse_args(argv))
+    # Build the GeneticDecipher once here, so a bad key library, profile
+    # or cache fails at once with a message instead of breaking the
+    # worker pool
+    try:
+        init_worker(config)
+    except Exception as error:
+        print(f"gencipher: error: {error}", file=sys.stderr)
+        return 2
+    files = [sys.stdin if name == "-" else open(name, "r")
+             for name in config["input"]]
+    output = (sys.stdout if config["output"] == "-"
+              else open(config["output"], "w"))
+    try:
+        failures = run(read_tasks(files), config, output)
+    finally:
+        for file in files + [output]:
+            if file not in (sys.stdin, sys.stdout):
+                file.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import string
+from typing import Callable, Sequence
+
+from gencipher.cipherkey import CipherKey
+
+
+class CribError(ValueError):
+    """Inappropriate cribs value."""
+    def __init__(self) -> None:
+        super().__init__("Invalid cribs. Each cipher fragment must have as "
+                         "many letters as its plain fragment, and every "
+                         "cipher letter must map to a single plain letter "
+                         "and vice versa.")
+
+
+def crib_mapping(cribs: dict[str, str]) -> dict[str, str]:
+    """Convert known plain text fragments into a letter mapping.
+
+    Args:
+        cribs (dict[str, str]): A dictionary where keys are cipher text
+        fragments and values are the plain text fragments they are
+        known to decipher to, e.g. {"Rbo": "The"}. Non-letters are
+        ignored and single letters are allowed.
+
+    Raises:
+        CribError: Raised if the fragments have different letter counts
+        or the letters do not map one-to-one.
+
+    Returns:
+        dict[str, str]: The mapping of uppercase cipher letters to
+        uppercase plain letters.
+    """
+    mapping: dict[str, str] = {}
+    for cipher_fragment, plain_fragment in cribs.items():
+        cipher_letters = [c for c in cipher_fragment.upper() if c.isalpha()]
+        plain_letters = [p for p in plain_fragment.upper() if p.isalpha()]
+        if len(cipher_letters) != len(plain_letters):
+            raise CribError()
+        for cipher_letter, plain_letter in zip(cipher_letters,
+                                               plain_letters):
+            if mapping.setdefault(cipher_letter, plain_letter) != plain_letter:
+                raise CribError()
+
+    if len(set(mapping.values())) != len(mapping):
+        raise CribError()
+    return mapping
+
+
+def free_positions(mapping: dict[str, str]) -> list[int]:
+    """Get the cipher key positions left free by a letter mapping.
+
+    Position p of a cipher key holds the cipher letter of the plain
+    letter string.ascii_uppercase[p], so the mapping pins the positions
+    of its plain letters.
+
+    Args:
+        mapping (dict[str, str]): The mapping of uppercase cipher
+        letters to uppercase plain letters.
+
+    Returns:
+        list[int]: The positions of the unpinned plain letters.
+    """
+    pinned = set(mapping.values())
+    return [idx for idx, letter in enumerate(string.ascii_uppercase)
+            if letter not in pinned]
+
+
+def on_free_positions(
+    operator: Callable[..., list[str]],
+    positions: Sequence[int]
+) -> Callable[..., CipherKey]:
+    """Restrict a genetic operator to some positions of the cipher keys.
+
+    The operator is applied to the letters of the parents at the given
+    positions only, and the other letters of the first parent are kept
+    in place.
+
+    Args:
+        operator (Callable[..., list[str]]): A crossover or mutation
+        operating on letter sequences, taking the parents as positional
+        arguments.
+        positions (Sequence[int]): The positions the operator may
+        permute.
+
+    Returns:
+        Callable[..., CipherKey]: The restricted operator, taking and
+        returning cipher keys. It raises ParentsLengthError if the
+        parents have different lengths.
+    """
+    def restricted(*parents: CipherKey, **kwargs) -> CipherKey:
+        if any(len(parent) != len(parents[0]) for parent in parents[1:]):
+            # Imported here, as the crossover module imports this one
+            from gencipher.crossover import ParentsLengthError
+            raise ParentsLengthError()
+        offspring = list(parents[0])
+        if len(positions) > 1:
+            letters = [[parent[idx] for idx in positions]
+                       for parent in parents]
+            for idx, letter in zip(positions, operator(*letters, **kwargs)):
+                offspring[idx] = letter
+        return CipherKey("".join(offspring))
+
+    return restricted
@@ -1,9 +1,13 @@
-import random
-from typing import Optional
+from functools import partial
+from typing import Callable, Optional, Sequence
 from abc import ABC, abstractmethod
 
-from gencipher.utils import InvalidInputError, InputType
+import numpy as np
+
+from gencipher.rng import get_rng
+from gencipher.options import CrossoverType, InvalidInputError
 from gencipher.cipherkey import CipherKey
+from gencipher.cribs import on_free_positions
 
 
 class ParentsLengthError(ValueError):
@@ -12,20 +16,20 @@ class ParentsLengthError(ValueError):
         super().__init__("Parents must have equal lengths.")
 
 
-class CrossoverType(InputType):
-    """Collection of available methods for genetic crossover."""
-    OX1 = "order-one"
-    PMX = "partially-mapped"
-    CX = "cycle"
-    FX = "full"
-
-
 class Crossover(ABC):
     """Abstract base class for crossover methods used in genetic
     algorithms.
     """
+    rng: Optional[np.random.Generator] = None
+    free_positions: Optional[list[int]] = None
+    crossover: Callable[[CipherKey, CipherKey], CipherKey]
+
     @staticmethod
-    def OX1(parent1: CipherKey, parent2: CipherKey) -> CipherKey:
+    def OX1(
+        parent1: CipherKey,
+        parent2: CipherKey,
+        rng: Optional[np.random.Generator] = None
+    ) -> CipherKey:
         """Perform order-one crossover (OX1) on two parent strings to
         generate an offspring string.
 
@@ -34,6 +38,8 @@ class Crossover(ABC):
             crossover.
             parent2 (CipherKey): The second parent CipherKey used for
             crossover.
+            rng (np.random.Generator, optional): The random number
+            generator to be used. Defaults to None (module generator).
 
         Raises:
             ParentsLengthError: Raised if the lengths of parent1 and
@@ -46,9 +52,18 @@ class Crossover(ABC):
         if len(parent1) != len(parent2):
             raise ParentsLengthError()
 
+        return CipherKey("".join(Crossover._ox1(parent1, parent2, rng)))
+
+    @staticmethod
+    def _ox1(
+        parent1: Sequence[str],
+        parent2: Sequence[str],
+        rng: Optional[np.random.Generator] = None
+    ) -> list[str]:
+        rng = get_rng(rng)
         length = len(parent1)
-        start = random.randint(0, length)
-        end = random.randint(start, length)
+        start = int(rng.integers(0, length, endpoint=True))
+        end = int(rng.integers(start, length, endpoint=True))
 
         offspring = list(parent1[start:end])
         offspring_length = len(offspring)
@@ -64,14 +79,15 @@ class Crossover(ABC):
                 offspring_count += 1
             offspring_length = len(offspring)
 
-        return CipherKey("".join(offspring))
+        return offspring
 
     @staticmethod
     def PMX(
         parent1: CipherKey,
         parent2: CipherKey,
         start: Optional[int] = None,
-        end: Optional[int] = None
+        end: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None
     ) -> CipherKey:
         """Perform partially mapped crossover (PMX) on two parent
         CipherKeys to generate an offspring CipherKey.
@@ -85,6 +101,8 @@ class Crossover(ABC):
             provided, will be chosen randomly. Defaults to None.
             end (int, optional): Second crossover point, if not
             provided, will be chosen randomly. Defaults to None.
+            rng (np.random.Generator, optional): The random number
+            generator to be used. Defaults to None (module generator).
 
         Raises:
             ParentsLengthError: Raised if the lengths of parent1 and
@@ -97,11 +115,23 @@ class Crossover(ABC):
         if len(parent1) != len(parent2):
             raise ParentsLengthError()
 
+        return CipherKey("".join(Crossover._pmx(parent1, parent2, start, end,
+                                                rng)))
+
+    @staticmethod
+    def _pmx(
+        parent1: Sequence[str],
+        parent2: Sequence[str],
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> list[str]:
+        rng = get_rng(rng)
         length = len(parent1)
         if start is None:
-            start = random.randint(0, length)
+            start = int(rng.integers(0, length, endpoint=True))
         if end is None:
-            end = random.randint(start, length)
+            end = int(rng.integers(start, length, endpoint=True))
 
         offspring = [""] * length
         mapping = {}
@@ -117,11 +147,9 @@ class Crossover(ABC):
                 parent2_idx = parent2.index(k)
             offspring[parent2_idx] = i
 
-        offspring = list(map(lambda x, y: y if x == "" else x,
-                             offspring,
-                             parent2))
-
-        return CipherKey("".join(offspring))
+        return list(map(lambda x, y: y if x == "" else x,
+                        offspring,
+                        parent2))
 
     @staticmethod
     def CX(parent1: CipherKey, parent2: CipherKey) -> CipherKey:
@@ -144,6 +172,10 @@ class Crossover(ABC):
         if len(parent1) != len(parent2):
             raise ParentsLengthError()
 
+        return CipherKey("".join(Crossover._cx(parent1, parent2)))
+
+    @staticmethod
+    def _cx(parent1: Sequence[str], parent2: Sequence[str]) -> list[str]:
         length = len(parent1)
         offspring = [""] * length
 
@@ -158,7 +190,7 @@ class Crossover(ABC):
 
             p1, p2 = p2, p1
 
-        return CipherKey("".join(offspring))
+        return offspring
 
     @abstractmethod
     def FX(
@@ -172,14 +204,37 @@ class Crossover(ABC):
         """
         pass
 
+    @abstractmethod
+    def BFX(
+        self,
+        parent1: CipherKey,
+        parent2: CipherKey
+    ) -> CipherKey:   # pragma: no cover
+        """This method should implement a full crossover scoring its
+        candidate keys in batches.
+        """
+        pass
+
     def _set_crossover(self, crossover_type):
+        # Pinned letters sit at the same position in both parents, so FX
+        # and BFX never move them; the other operators only get the free ones.
         if crossover_type == CrossoverType.CX.value:
             self.crossover = self.CX
+            operator = self._cx
         elif crossover_type == CrossoverType.OX1.value:
-            self.crossover = self.OX1
+            self.crossover = partial(self.OX1, rng=self.rng)
+            operator = partial(self._ox1, rng=self.rng)
         elif crossover_type == CrossoverType.PMX.value:
-            self.crossover = self.PMX
+            self.crossover = partial(self.PMX, rng=self.rng)
+            operator = partial(self._pmx, rng=self.rng)
         elif crossover_type == CrossoverType.FX.value:
             self.crossover = self.FX
+            return
+        elif crossover_type == CrossoverType.BFX.value:
+            self.crossover = self.BFX
+            return
         else:
             raise InvalidInputError("crossover", crossover_type, CrossoverType)
+
+        if self.free_positions is not None:
+            self.crossover = on_free_positions(operator, self.free_positions)
@@ -0,0 +1,404 @@
+"""Evolve islands of a genetic algorithm on several nodes.
+
+A coordinator runs one island per node. Each epoch, it sends every node
+the best keys of its ring neighbour, the node runs a few generations
+and replies with its own best keys. Only compact messages cross the
+transport: the encoded cipher text, with its word boundaries, and the
+n-gram type once, then batches of migrant keys as bytes. Every node
+loads its own n-gram tables.
+
+Nodes are reached through a Transport. LoopbackTransport keeps them in
+the calling process, so the whole protocol runs on one machine;
+ManagerTransport reaches node servers started on other hosts with
+
+    python -m gencipher.distributed --port 50000 --authkey secret
+"""
+import re
+import string
+import argparse
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.managers import BaseManager
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+from gencipher.cipherkey import CipherKey
+from gencipher.model import GeneticDecipher
+from gencipher.ngram import Ngram
+
+_KEY_LEN = len(string.ascii_uppercase)
+# Code of a word separator in an encoded cipher text
+_SEPARATOR = 26
+
+# N-gram tables loaded by this process, shared by all its nodes
+_ngrams: dict[str, Ngram] = {}
+_ngrams_lock = threading.Lock()
+
+
+class NodeError(ValueError):
+    """A node failed to run its island."""
+    def __init__(self, node: int, error: str) -> None:
+        super().__init__(f"Node {node} failed: {error}")
+
+
+class N_Nodes_Error(ValueError):
+    """Inappropriate number of nodes."""
+    def __init__(self) -> None:
+        super().__init__("Invalid number of nodes. Must be an integer "
+                         "greater than zero (0).")
+
+
+def pack_keys(population: dict[CipherKey, float]) -> tuple[bytes, bytes]:
+    """Encode keys and their fitness compactly, as 26 bytes per key and
+    a float64 per fitness.
+
+    Args:
+        population (dict[CipherKey, float]): The keys and their fitness.
+
+    Returns:
+        tuple[bytes, bytes]: The encoded keys and fitness.
+    """
+    codes = Ngram.encode_text("".join(population))
+    fitness = np.array(list(population.values()), dtype=np.float64)
+    return codes.tobytes(), fitness.tobytes()
+
+
+def _letters(codes: bytes) -> str:
+    # Inverse of Ngram.encode_text
+    return (np.frombuffer(codes, dtype=np.uint8) + 65).tobytes().decode()
+
+
+def _encode_text(text: str) -> bytes:
+    # Like Ngram.encode_text, but every run of non-alphabetical
+    # characters becomes one separator, so the nodes keep the word
+    # boundaries that word-pattern seeding relies on
+    letters = re.sub(r"[^A-Z]+", chr(65 + _SEPARATOR), text.upper())
+    codes = np.frombuffer(letters.encode("ascii"), dtype=np.uint8) - 65
+    return codes.tobytes()
+
+
+def _decode_text(codes: bytes) -> str:
+    # Inverse of _encode_text, with a space for every separator
+    return _letters(codes).replace(chr(65 + _SEPARATOR), " ")
+
+
+def unpack_keys(keys: bytes, fitness: bytes) -> dict[CipherKey, float]:
+    """Decode keys and fitness encoded by pack_keys.
+
+    Args:
+        keys (bytes): The encoded keys.
+        fitness (bytes): The encoded fitness.
+
+    Returns:
+        dict[CipherKey, float]: The keys and their fitness.
+    """
+    letters = _letters(keys)
+    return {CipherKey(letters[idx:idx + _KEY_LEN]): value
+            for idx, value in zip(range(0, len(letters), _KEY_LEN),
+                                  np.frombuffer(fitness).tolist())}
+
+
+def _shared_ngram(ngram_type: str) -> Ngram:
+    with _ngrams_lock:
+        if ngram_type not in _ngrams:
+            ngram = Ngram(ngram_type)
+            ngram.ngram_table  # build the table before the nodes share it
+            _ngrams[ngram_type] = ngram
+        return _ngrams[ngram_type]
+
+
+class IslandNode:
+    """Runs the island of a node, answering the coordinator messages."""
+    def __init__(self) -> None:
+        self._gencipher: dict[str, GeneticDecipher] = {}
+        self._island: Optional[GeneticDecipher] = None
+        self._generator: Optional[Iterator[tuple[str, float, str]]] = None
+
+    def handle(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Answer a coordinator message.
+
+        Args:
+            message (dict[str, Any]): A "start", "epoch" or "stop"
+            message.
+
+        Returns:
+            dict[str, Any]: The reply, with an "error" message if the
+            island failed, as exceptions may not survive the transport.
+        """
+        try:
+            if message["type"] == "start":
+                return self._start(message)
+            if message["type"] == "epoch":
+                return self._epoch(message)
+            self._island = self._generator = None
+            return {}
+        except (ValueError, TypeError, AttributeError, KeyError) as error:
+            return {"error": str(error)}
+
+    def _start(self, message: dict[str, Any]) -> dict[str, Any]:
+        ngram_type = message["ngram_type"]
+        # Keep one GeneticDecipher per n-gram type, scoring with the
+        # tables of the process, so they are loaded once
+        if ngram_type not in self._gencipher:
+            self._gencipher[ngram_type] = GeneticDecipher(
+                _shared_ngram(ngram_type)
+            )
+        island = self._gencipher[ngram_type]
+        island.rng = np.random.default_rng(message["seed"])
+        cipher_text = _decode_text(message["text"])
+        self._generator = island.decipher_generator(cipher_text,
+                                                    **message["params"])
+        self._island = island
+        return {}
+
+    def _epoch(self, message: dict[str, Any]) -> dict[str, Any]:
+        island, generator = self._island, self._generator
+        if island is None or generator is None:
+            raise KeyError("no island started")
+        migrants = unpack_keys(*message["migrants"])
+        if migrants:
+            island.immigrate(migrants)
+
+        done = False
+        for _ in range(message["generations"]):
+            try:
+                next(generator)
+            except StopIteration:
+                done = True
+                break
+        best = sorted(island.population.items(), key=lambda x: x[1],
+                      reverse=True)[:message["n_migrants"]]
+        # The fitness percentage of the best key of the last generation,
+        # or -inf when the island ended before running any
+        fitness = island.history["fitness"] or [-np.inf]
+        return {"migrants": pack_keys(dict(best)),
+                "key": str(island.best_key[0]),
+                "fitness": float(fitness[-1]),
+                "evaluations": island.budget.evaluations,
+                "done": done}
+
+
+class Transport(ABC):
+    """Delivers coordinator messages to the nodes and returns their
+    replies. Messages hold only built-in types and bytes.
+    """
+    @property
+    @abstractmethod
+    def n_nodes(self) -> int:  # pragma: no cover
+        """int: The number of nodes."""
+        pass
+
+    @abstractmethod
+    def call(
+        self,
+        node: int,
+        message: dict[str, Any]
+    ) -> dict[str, Any]:  # pragma: no cover
+        """Send a message to a node and wait for its reply. Calls to
+        different nodes may run concurrently.
+
+        Args:
+            node (int): The index of the node.
+            message (dict[str, Any]): The message.
+
+        Returns:
+            dict[str, Any]: The reply.
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the connections to the nodes."""
+
+
+class LoopbackTransport(Transport):
+    """Nodes living in the calling process, for tests and for running
+    the protocol on one machine.
+    """
+    def __init__(self, n_nodes: int) -> None:
+        if n_nodes <= 0:
+            raise N_Nodes_Error()
+        self.nodes = [IslandNode() for _ in range(n_nodes)]
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    def call(self, node: int, message: dict[str, Any]) -> dict[str, Any]:
+        return self.nodes[node].handle(message)
+
+
+class NodeManager(BaseManager):
+    """Serves IslandNodes on a host, or connects to them. Every call to
+    node() creates a node of its own on the server, so coordinators
+    sharing a host do not interfere.
+    """
+
+
+NodeManager.register("node", callable=IslandNode)
+
+
+class ManagerTransport(Transport):
+    """Nodes served by NodeManager servers, e.g. on other hosts."""
+    def __init__(
+        self,
+        addresses: Sequence[tuple[str, int]],
+        authkey: bytes
+    ) -> None:
+        """Create a ManagerTransport object connected to node servers.
+
+        Args:
+            addresses (Sequence[tuple[str, int]]): The host and port of
+            every node server.
+            authkey (bytes): The authentication key of the servers.
+
+        Raises:
+            N_Nodes_Error: Raised if there are no addresses.
+        """
+        if not addresses:
+            raise N_Nodes_Error()
+        self._managers = [NodeManager(address, authkey)
+                          for address in addresses]
+        for manager in self._managers:
+            manager.connect()
+        self._nodes = [manager.node()  # type: ignore[attr-defined]
+                       for manager in self._managers]
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self._nodes)
+
+    def call(self, node: int, message: dict[str, Any]) -> dict[str, Any]:
+        reply: dict[str, Any] = self._nodes[node].handle(message)
+        return reply
+
+    def close(self) -> None:
+        # Run the proxy finalizers now rather than on garbage
+        # collection: they release the nodes on their servers and close
+        # the connections of this thread
+        for node in self._nodes:
+            node._close()
+        self._nodes.clear()
+        self._managers.clear()
+
+
+class DistributedDecipher:
+    def __init__(
+        self,
+        transport: Transport,
+        ngram_type: str = "quadgram",
+        n_migrants: int = 5,
+        epoch_generations: int = 5
+    ) -> None:
+        """Create a DistributedDecipher object coordinating one island
+        per node of a transport.
+
+        Args:
+            transport (Transport): The transport reaching the nodes.
+            ngram_type (str, optional): The type of n-gram analysis of
+            every island. Defaults to "quadgram."
+            n_migrants (int, optional): The best keys of an island sent
+            to the next one after every epoch. Defaults to 5.
+            epoch_generations (int, optional): The generations between
+            migrations. Defaults to 5.
+        """
+        self.transport = transport
+        self.ngram_type = ngram_type
+        self.n_migrants = n_migrants
+        self.epoch_generations = epoch_generations
+        self.best_key = (CipherKey(string.ascii_uppercase), -np.inf)
+        self.evaluations = 0
+        self.history: list[float] = []
+
+    def decipher(
+        self,
+        cipher_text: str,
+        n_epochs: int = 4,
+        tolerance: float = 0.02,
+        seed: Optional[int] = None,
+        **params: Any
+    ) -> str:
+        """Decipher a cryptogram with islands evolving on every node,
+        stopping after n_epochs or once an island is within tolerance.
+
+        Args:
+            cipher_text (str): The cryptogram to be deciphered.
+            n_epochs (int, optional): The maximum number of epochs.
+            Defaults to 4.
+            tolerance (float, optional): The algorithm stops when the
+            fitness is within this tolerance. Defaults to 0.02.
+            seed (int, optional): The seed of the islands, each combined
+            with its node index. Defaults to None (fresh entropy).
+            **params: Other keyword arguments of
+            GeneticDecipher.decipher, except max_iter, which is set by
+            n_epochs.
+
+        Raises:
+            NodeError: Raised if a node fails, e.g. with an invalid
+            parameter value.
+
+        Returns:
+            str: The text deciphered with the best key of all islands.
+        """
+        n_nodes = self.transport.n_nodes
+        self.best_key = (CipherKey(string.ascii_uppercase), -np.inf)
+        self.history = []
+        text = _encode_text(cipher_text)
+        params = {**params, "tolerance": tolerance,
+                  "max_iter": n_epochs * self.epoch_generations}
+        self._broadcast([{"type": "start", "ngram_type": self.ngram_type,
+                          "text": text, "params": params,
+                          "seed": None if seed is None else [seed, node]}
+                         for node in range(n_nodes)])
+
+        migrants = [pack_keys({})] * n_nodes
+        try:
+            for _ in range(n_epochs):
+                replies = self._broadcast([
+                    {"type": "epoch", "migrants": migrants[node - 1],
+                     "generations": self.epoch_generations,
+                     "n_migrants": self.n_migrants}
+                    for node in range(n_nodes)
+                ])
+                migrants = [reply["migrants"] for reply in replies]
+                self.evaluations = sum(reply["evaluations"]
+                                       for reply in replies)
+                best = max(replies, key=lambda reply: reply["fitness"])
+                if best["fitness"] > self.best_key[1]:
+                    self.best_key = (CipherKey(best["key"]),
+                                     best["fitness"])
+                self.history.append(self.best_key[1])
+                if (self.best_key[1] >= 1 - tolerance
+                        or all(reply["done"] for reply in replies)):
+                    break
+        finally:
+            self._broadcast([{"type": "stop"}] * n_nodes)
+
+        return self.best_key[0].decode_cipher(cipher_text)
+
+    def _broadcast(
+        self,
+        messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        with ThreadPoolExecutor(len(messages)) as executor:
+            replies = list(executor.map(self.transport.call,
+                                        range(len(messages)), messages))
+        for node, reply in enumerate(replies):
+            if "error" in reply:
+                raise NodeError(node, reply["error"])
+        return replies
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="")
+    parser.add_argument("--port", type=int, default=50000)
+    parser.add_argument("--authkey", required=True)
+    args = parser.parse_args(argv)
+    manager = NodeManager((args.host, args.port), args.authkey.encode())
+    manager.get_server().serve_forever()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,176 @@
+import string
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from gencipher.cipherkey import CipherKey
+from gencipher.ngram import Ngram
+
+_KEY_LEN = len(string.ascii_uppercase)
+# Largest population fitness sharing is allowed on, as every generation
+# compares every pair of keys
+MAX_NICHE_POPULATION = 5000
+# Pairwise distances computed at once, bounding the working memory of
+# the pairwise statistics to a few tens of MB whatever the population
+_BLOCK_ELEMENTS = 1 << 22
+
+
+class NicheRadiusError(ValueError):
+    """Inappropriate niche_radius value."""
+    def __init__(self) -> None:
+        super().__init__("Invalid niche_radius value. Must be an integer "
+                         f"between zero (0) and {_KEY_LEN}, and zero (0) "
+                         "for populations larger than "
+                         f"{MAX_NICHE_POPULATION}.")
+
+
+@dataclass
+class PopulationDiversity:
+    """How spread out the keys of a population are."""
+    entropy: float
+    mean_distance: float
+    min_distance: float
+
+
+def key_matrix(keys: Sequence[str]) -> np.ndarray:
+    """Stack cipher keys as rows of alphabet positions.
+
+    Args:
+        keys (Sequence[str]): The cipher keys.
+
+    Returns:
+        np.ndarray: A matrix with one key per row.
+    """
+    return Ngram.encode_text("".join(keys)).reshape(len(keys), _KEY_LEN)
+
+
+def _one_hot(codes: np.ndarray) -> np.ndarray:
+    # Row k has a one for every (position, letter) pair of key k
+    one_hot = np.zeros((len(codes), _KEY_LEN * _KEY_LEN), dtype=np.float32)
+    one_hot[np.arange(len(codes))[:, np.newaxis],
+            np.arange(_KEY_LEN) * _KEY_LEN + codes] = 1
+    return one_hot
+
+
+def position_entropy(codes: np.ndarray) -> np.ndarray:
+    """Compute the entropy of the letters found at every key position.
+
+    Args:
+        codes (np.ndarray): The keys, as rows of alphabet positions.
+
+    Returns:
+        np.ndarray: The entropy of every position, from zero (0) when
+        every key agrees to one (1) when the letters are uniform.
+    """
+    counts = _one_hot(codes).sum(axis=0).reshape(_KEY_LEN, _KEY_LEN)
+    frequencies = counts / max(len(codes), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(counts > 0, frequencies * np.log(frequencies), 0)
+    entropy: np.ndarray = -terms.sum(axis=1) / np.log(_KEY_LEN)
+    return entropy
+
+
+def hamming_distances(codes: np.ndarray) -> np.ndarray:
+    """Compute the number of positions where every pair of keys
+    differs, with a single matrix product rather than a loop over the
+    pairs.
+
+    Args:
+        codes (np.ndarray): The keys, as rows of alphabet positions.
+
+    Returns:
+        np.ndarray: A symmetric matrix of Hamming distances.
+    """
+    one_hot = _one_hot(codes)
+    distances: np.ndarray = (_KEY_LEN - one_hot @ one_hot.T).astype(np.intp)
+    return distances
+
+
+def _distance_blocks(
+    codes: np.ndarray
+) -> Iterator[tuple[int, np.ndarray]]:
+    # Rows of the Hamming distance matrix, a block at a time
+    one_hot = _one_hot(codes)
+    block_size = max(1, _BLOCK_ELEMENTS // max(len(codes), 1))
+    for start in range(0, len(codes), block_size):
+        block = one_hot[start:start + block_size]
+        yield start, (_KEY_LEN - block @ one_hot.T).astype(np.intp)
+
+
+def measure(keys: Sequence[str]) -> PopulationDiversity:
+    """Measure the diversity of a population.
+
+    Args:
+        keys (Sequence[str]): The keys of the population.
+
+    Returns:
+        PopulationDiversity: The mean position entropy and the mean and
+        minimum pairwise Hamming distances, zero (0) for fewer than two
+        keys.
+    """
+    codes = key_matrix(keys)
+    n_keys = len(codes)
+    if n_keys < 2:
+        return PopulationDiversity(0.0, 0.0, 0.0)
+    total = 0
+    minimum = _KEY_LEN
+    for start, distances in _distance_blocks(codes):
+        # The pairs of every row with the keys after it
+        rows = np.arange(start, start + len(distances))[:, np.newaxis]
+        pairs = distances[np.arange(n_keys) > rows]
+        if len(pairs):
+            total += int(pairs.sum())
+            minimum = min(minimum, int(pairs.min()))
+    n_pairs = n_keys * (n_keys - 1) // 2
+    return PopulationDiversity(float(position_entropy(codes).mean()),
+                               total / n_pairs, float(minimum))
+
+
+def niche_counts(codes: np.ndarray, radius: int) -> np.ndarray:
+    """Count how crowded the niche of every key is, with the triangular
+    sharing function of fitness sharing: every key within radius
+    positions contributes one (1) minus its distance over radius. The
+    distances are computed a block of rows at a time, so the working
+    memory stays bounded.
+
+    Args:
+        codes (np.ndarray): The keys, as rows of alphabet positions.
+        radius (int): The Hamming distance below which keys share a
+        niche.
+
+    Returns:
+        np.ndarray: The niche count of every key, at least one (1) as
+        each key shares its own niche.
+    """
+    counts = np.empty(len(codes))
+    for start, distances in _distance_blocks(codes):
+        sharing = np.clip(1 - distances / radius, 0, None)
+        counts[start:start + len(distances)] = sharing.sum(axis=1)
+    return counts
+
+
+def shared_fitness(
+    population: dict[CipherKey, float],
+    radius: int
+) -> dict[CipherKey, float]:
+    """Penalize the fitness of keys in crowded niches, so selection
+    favours keys in distinct regions of the key space.
+
+    A key alone in its niche keeps its fitness; otherwise the magnitude
+    of its (negative log probability) fitness grows with its niche
+    count.
+
+    Args:
+        population (dict[CipherKey, float]): The keys and their fitness.
+        radius (int): The Hamming distance below which keys share a
+        niche.
+
+    Returns:
+        dict[CipherKey, float]: The keys and their shared fitness.
+    """
+    fitness = np.fromiter(population.values(), dtype=float,
+                          count=len(population))
+    counts = niche_counts(key_matrix(list(population)), radius)
+    shared = fitness - np.abs(fitness) * (counts - 1)
+    return dict(zip(population, shared.tolist()))
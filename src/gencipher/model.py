@@ -1,14 +1,40 @@
+import os
 import re
+import pickle
 import string
-import random
+import contextlib
 import numpy as np
-from typing import Iterator, Union
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING, Any, Callable, ContextManager, Iterator, MutableSequence,
+    Optional, Sequence, Union
+)
 
-from gencipher.cipherkey import CipherKey
+from gencipher.budget import Budget
+from gencipher.cipherkey import (
+    CipherKey, random_cipher_key, read_cipher_keys
+)
+from gencipher.cribs import crib_mapping, free_positions
+from gencipher.diversity import (
+    MAX_NICHE_POPULATION, NicheRadiusError, measure, shared_fitness
+)
 from gencipher.mutation import Mutation
 from gencipher.crossover import Crossover, ParentsLengthError
-from gencipher.ngram import Ngram, NgramType
-from gencipher.utils import select_parent
+from gencipher.ngram import Ngram
+from gencipher.options import (
+    EngineType, InvalidInputError, NgramType, SeedingType
+)
+from gencipher.population import BufferedPopulation, SteadyStatePopulation
+from gencipher.profiles import DEFAULT_PARAMS, TUNABLE_PARAMS, TuningProfile
+from gencipher.seeding import apply_mapping, frequency_key, seed_keys
+from gencipher.stats import DecipherStats, GenerationStats, Recorder
+from gencipher.utils import select_parents
+from gencipher.words import WordPatternIndex
+
+if TYPE_CHECKING:  # pragma: no cover
+    from gencipher.cache import ResultCache
 
 
 class CipherTextLengthError(ValueError):
@@ -25,157 +51,686 @@ class N_Population_Error(ValueError):
                          "greater than zero (0).")
 
 
+class CheckpointIntervalError(ValueError):
+    """Inappropriate checkpoint_interval value."""
+    def __init__(self):
+        super().__init__("Invalid checkpoint_interval value. Must be an "
+                         "integer greater than zero (0).")
+
+
+class CheckpointError(ValueError):
+    """Checkpoint saved by an incompatible GeneticDecipher."""
+    def __init__(self):
+        super().__init__("Invalid checkpoint. It was saved with a different "
+                         "ngram_type.")
+
+
+_NO_PHASE = contextlib.nullcontext()
+_BATCH_SIZE = 256
+# Keys measured per generation for the diversity stats, whose pairwise
+# distances grow with the square of their number
+_DIVERSITY_SAMPLE = 1000
+_LIBRARY_FRACTION = 0.1
+
+
+def _codes_key(codes: np.ndarray) -> CipherKey:
+    # Inverse of Ngram.encode_text for the 26 letters of a key
+    return CipherKey((codes + 65).astype(np.uint8).tobytes().decode())
+
+
+class N_Threads_Error(ValueError):
+    """Inappropriate n_threads value."""
+    def __init__(self):
+        super().__init__("Invalid n_threads value. Must be None or an "
+                         "integer greater than zero (0).")
+
+
 class GeneticDecipher(Crossover, Mutation):
+    rng: np.random.Generator
+    population: Union[dict[CipherKey, float], BufferedPopulation]
+
     def __init__(
         self,
-        ngram_type: str = "quadgram"
+        ngram_type: Union[str, Ngram] = "quadgram",
+        seed: Union[None, int, np.random.SeedSequence,
+                    np.random.Generator] = None,
+        instrument: bool = False,
+        stats_callback: Optional[Callable[[GenerationStats], None]] = None,
+        n_threads: Optional[int] = None,
+        cache: Optional["ResultCache"] = None,
+        key_library: Union[None, str, Path, Sequence[str]] = None,
+        profile: Union[None, str, Path, TuningProfile] = None,
+        history_size: Optional[int] = None
     ) -> None:
         """Create a GeneticDecipher object.
 
         Args:
-            ngram_type (str, optional): The type of n-gram analysis to
-            be used. Defaults to "quadgram."
+            ngram_type (Union[str, Ngram], optional): The type of n-gram
+            analysis to be used, or a loaded Ngram object, so several
+            instances share its tables. Defaults to "quadgram."
+            seed (Union[None, int, SeedSequence, Generator], optional):
+            The seed of the random number generator used by every
+            operator of the genetic algorithm, or the generator itself.
+            Defaults to None (fresh entropy).
+            instrument (bool, optional): Whether to record per
+            generation phase timings, fitness evaluations and population
+            diversity in the stats attribute. Defaults to False.
+            stats_callback (Callable[[GenerationStats], None], optional):
+            A function called with the stats of every generation, e.g.
+            to export them to a metrics system. Providing it enables
+            instrumentation. Defaults to None.
+            n_threads (int, optional): The number of threads scoring
+            each batch of candidate keys. NumPy releases the GIL while
+            scoring, so the threads run in parallel; their time is
+            recorded as fitness, not decoding. Defaults to None (score
+            in the calling thread).
+            cache (ResultCache, optional): A store of solved cipher
+            texts. Cipher texts found in it with enough confidence are
+            answered without running the genetic algorithm, and new
+            results are added to it. Defaults to None.
+            key_library (Union[None, str, Path, Sequence[str]],
+            optional): Previously recovered cipher keys, or a text file
+            with one key per line. They are scored before each run: a
+            key within tolerance is returned at once, otherwise the best
+            ones join the initial population. Keys solving a run within
+            tolerance are added to the library. Defaults to None.
+            profile (Union[None, str, Path, TuningProfile], optional):
+            Tuned decipher parameters per cipher text length, or a JSON
+            file saved by TuningProfile.save. They replace the defaults
+            of the parameters decipher is not given. Defaults to None.
+            history_size (int, optional): The number of generations kept
+            in the history attribute, and in stats when instrumented, as
+            ring buffers dropping the oldest, so long runs do not keep
+            every deciphered text. Defaults to None (keep every
+            generation).
         """
-        self.ngram = Ngram(ngram_type)
+        self.ngram = (ngram_type if isinstance(ngram_type, Ngram)
+                      else Ngram(ngram_type))
+        self.rng = np.random.default_rng(seed)
+        self.word_index: Optional[WordPatternIndex] = None
+        self.mapping: dict[str, str] = {}
+        self.cache = cache
+        self.profile = (TuningProfile.load(profile)
+                        if isinstance(profile, (str, Path)) else profile)
+        self.history_size = history_size
+        self.history = self._new_history()
+        self.key_library: Optional[list[CipherKey]] = None
+        if isinstance(key_library, (str, Path)):
+            self.key_library = read_cipher_keys(key_library)
+        elif key_library is not None:
+            self.key_library = [CipherKey(str(key)) for key in key_library]
+        self.instrument = instrument or stats_callback is not None
+        self.stats_callback = stats_callback
+        self.stats: Optional[DecipherStats] = None
+        self._recorder: Optional[Recorder] = None
+        self._steady: Optional[SteadyStatePopulation] = None
+        self.budget = Budget()
+        self.best_key = (CipherKey(string.ascii_uppercase), -np.inf)
+
+        if n_threads is not None and n_threads <= 0:
+            raise N_Threads_Error
+        self.n_threads = n_threads or 1
+        self._executor = (ThreadPoolExecutor(self.n_threads)
+                          if self.n_threads > 1 else None)
 
     def decipher(
         self,
         cipher_text: str,
-        max_iter: int = 20,
+        max_iter: Optional[int] = None,
         tolerance: float = 0.02,
-        n_population: int = 100,
-        mutation_type: str = "scramble",
-        crossover_type: str = "full",
-        mutation_rate: float = 0.01,
-        crossover_rate: float = 0.6
+        n_population: Optional[int] = None,
+        mutation_type: Optional[str] = None,
+        crossover_type: Optional[str] = None,
+        mutation_rate: Optional[float] = None,
+        crossover_rate: Optional[float] = None,
+        max_time: Optional[float] = None,
+        max_evaluations: Optional[int] = None,
+        seeding: str = "random",
+        random_fraction: float = 0.2,
+        cribs: Optional[dict[str, str]] = None,
+        checkpoint_path: Union[None, str, Path] = None,
+        checkpoint_interval: int = 1,
+        engine: str = "generational",
+        niche_radius: int = 0
     ) -> str:
         """Decipher a cryptogram using a genetic algorithm.
 
         Args:
             cipher_text (str): The cryptogram to be deciphered.
             max_iter (int, optional): The maximum number of iterations
-            for the genetic algorithm. Defaults to 20.
+            for the genetic algorithm. Defaults to None (the profile
+            value, or 20).
             tolerance (float, optional): The algorithm stops when the
             fitness is within this tolerance. Defaults to 0.02
             n_population (int, optional): The size of the candidate
-            population for each iteration. Defaults to 100.
+            population for each iteration. Defaults to None (the profile
+            value, or 100).
             mutation_type (str, optional): The type of mutation to be
-            applied in the genetic algorithm. Defaults to "scramble."
+            applied in the genetic algorithm. Defaults to None (the
+            profile value, or "scramble").
             crossover_type (str, optional): The type of crossover to be
-            applied in the genetic algorithm. Defaults to "full."
+            applied in the genetic algorithm. Defaults to None (the
+            profile value, or "full").
             mutation_rate (float, optional): The mutation rate,
             affecting the likelihood of applying mutation. Defaults to
-            0.01.
+            None (the profile value, or 0.01).
             crossover_rate (float, optional): The crossover rate,
             affecting the likelihood of applying crossover. Defaults to
-            0.6.
+            None (the profile value, or 0.6).
+            max_time (float, optional): The wall-clock budget in
+            seconds. When it runs out, the best key found so far is
+            used. Defaults to None (unlimited).
+            max_evaluations (int, optional): The maximum number of
+            fitness evaluations, including the initial population.
+            When it runs out, the best key found so far is used.
+            Defaults to None (unlimited).
+            seeding (str, optional): How the initial population is
+            built. "random" uses random keys; "frequency" builds it
+            around a key found by letter and bigram frequency analysis
+            of the cipher text; "word-pattern" also fixes the letters
+            of cipher words matched to English words with the same
+            letter pattern, for texts that keep word boundaries.
+            Defaults to "random".
+            random_fraction (float, optional): The fraction of random
+            keys kept in a seeded initial population. Defaults to 0.2.
+            cribs (dict[str, str], optional): Known plain text, as a
+            dictionary of cipher text fragments and the plain text
+            fragments they decipher to, e.g. {"Rbo": "The"}. The
+            letters they map are pinned in every key, and crossover and
+            mutation only permute the free ones. Defaults to None.
+            checkpoint_path (Union[None, str, Path], optional): The file
+            where the state of the run is saved, so it can be continued
+            with resume. Defaults to None (no checkpoints).
+            checkpoint_interval (int, optional): The number of
+            generations between checkpoints. Defaults to 1.
+            engine (str, optional): How the population evolves.
+            "generational" replaces it with a new generation of
+            children; "steady-state" breeds the children one at a time,
+            each replacing the worst member at once if it is fitter, so
+            it can be selected by the next child. A generation is then
+            n_population children. "buffered" breeds generations like
+            "generational", into two preallocated key and fitness arrays
+            reused across generations, so memory stays flat for huge
+            populations. Defaults to "generational".
+            niche_radius (int, optional): When positive, the
+            generational tournaments compare fitness shared among the
+            keys differing in fewer than niche_radius positions, so
+            near-duplicate keys lose to distinct ones. Every generation
+            compares every pair of keys, so it is limited to populations
+            of at most MAX_NICHE_POPULATION keys. Defaults to 0 (no
+            niching).
 
         Returns:
             str: The deciphered plaintext obtained through the genetic
             algorithm.
         """
-        self.cipher_text = cipher_text
-        self.n_population = n_population
-        self._set_mutation(mutation_type)
-        self._set_crossover(crossover_type)
-        self.mutation_rate = mutation_rate
-        self.crossover_rate = crossover_rate
-
-        self.population = self.ngram.generate_population(self.cipher_text,
-                                                         self.n_population)
-        self.history: dict[str, list[Union[str, float]]] = {"key": [],
-                                                            "fitness": [],
-                                                            "text": []}
-        best_key = (CipherKey(string.ascii_uppercase), -np.inf)
-
         deciphered_text = cipher_text
-        for _ in range(max_iter):
-            self.population = self.evolve_population(self.population)
-            best_idx_key = max(self.population.items(), key=lambda x: x[1])
-
-            if best_idx_key[1] > best_key[1]:
-                best_key = best_idx_key
-            deciphered_text = best_key[0].decode_cipher(self.cipher_text)
-
-            ngram_count = self.ngram.ngram_count(deciphered_text)
-            fitness_percentage = self.ngram.fitness_percentage(
-                (best_key[1] / ngram_count)
-            )
-
-            self.history["key"].append(best_key[0])
-            self.history["fitness"].append(fitness_percentage)
-            self.history["text"].append(deciphered_text)
-
-            if fitness_percentage >= 1 - tolerance:
-                break
+        for _, _, deciphered_text in (
+            self.decipher_generator(cipher_text,
+                                    max_iter=max_iter,
+                                    tolerance=tolerance,
+                                    n_population=n_population,
+                                    mutation_type=mutation_type,
+                                    crossover_type=crossover_type,
+                                    mutation_rate=mutation_rate,
+                                    crossover_rate=crossover_rate,
+                                    max_time=max_time,
+                                    max_evaluations=max_evaluations,
+                                    seeding=seeding,
+                                    random_fraction=random_fraction,
+                                    cribs=cribs,
+                                    checkpoint_path=checkpoint_path,
+                                    checkpoint_interval=checkpoint_interval,
+                                    engine=engine,
+                                    niche_radius=niche_radius)
+        ):
+            pass
 
         return deciphered_text
 
     def decipher_generator(
         self,
         cipher_text: str,
-        max_iter: int = 20,
+        max_iter: Optional[int] = None,
         tolerance: float = 0.02,
-        n_population: int = 100,
-        mutation_type: str = "scramble",
-        crossover_type: str = "full",
-        mutation_rate: float = 0.01,
-        crossover_rate: float = 0.6
+        n_population: Optional[int] = None,
+        mutation_type: Optional[str] = None,
+        crossover_type: Optional[str] = None,
+        mutation_rate: Optional[float] = None,
+        crossover_rate: Optional[float] = None,
+        max_time: Optional[float] = None,
+        max_evaluations: Optional[int] = None,
+        seeding: str = "random",
+        random_fraction: float = 0.2,
+        cribs: Optional[dict[str, str]] = None,
+        checkpoint_path: Union[None, str, Path] = None,
+        checkpoint_interval: int = 1,
+        engine: str = "generational",
+        niche_radius: int = 0
     ) -> Iterator[tuple[str, float, str]]:
         """Decipher a cryptogram using a genetic algorithm.
 
         Args:
             cipher_text (str): The cryptogram to be deciphered.
             max_iter (int, optional): The maximum number of iterations
-            for the genetic algorithm. Defaults to 20.
+            for the genetic algorithm. Defaults to None (the profile
+            value, or 20).
             tolerance (float, optional): The algorithm stops when the
             fitness is within this tolerance. Defaults to 0.02
             n_population (int, optional): The size of the candidate
-            population for each iteration. Defaults to 100.
+            population for each iteration. Defaults to None (the profile
+            value, or 100).
             mutation_type (str, optional): The type of mutation to be
-            applied in the genetic algorithm. Defaults to "scramble."
+            applied in the genetic algorithm. Defaults to None (the
+            profile value, or "scramble").
             crossover_type (str, optional): The type of crossover to be
-            applied in the genetic algorithm. Defaults to "full."
+            applied in the genetic algorithm. Defaults to None (the
+            profile value, or "full").
             mutation_rate (float, optional): The mutation rate,
             affecting the likelihood of applying mutation. Defaults to
-            0.01.
+            None (the profile value, or 0.01).
             crossover_rate (float, optional): The crossover rate,
             affecting the likelihood of applying crossover. Defaults to
-            0.6.
+            None (the profile value, or 0.6).
+            max_time (float, optional): The wall-clock budget in
+            seconds. When it runs out, the best key found so far is
+            used. Defaults to None (unlimited).
+            max_evaluations (int, optional): The maximum number of
+            fitness evaluations, including the initial population.
+            When it runs out, the best key found so far is used.
+            Defaults to None (unlimited).
+            seeding (str, optional): How the initial population is
+            built. "random" uses random keys; "frequency" builds it
+            around a key found by letter and bigram frequency analysis
+            of the cipher text; "word-pattern" also fixes the letters
+            of cipher words matched to English words with the same
+            letter pattern, for texts that keep word boundaries.
+            Defaults to "random".
+            random_fraction (float, optional): The fraction of random
+            keys kept in a seeded initial population. Defaults to 0.2.
+            cribs (dict[str, str], optional): Known plain text, as a
+            dictionary of cipher text fragments and the plain text
+            fragments they decipher to, e.g. {"Rbo": "The"}. The
+            letters they map are pinned in every key, and crossover and
+            mutation only permute the free ones. Defaults to None.
+            checkpoint_path (Union[None, str, Path], optional): The file
+            where the state of the run is saved, so it can be continued
+            with resume. Defaults to None (no checkpoints).
+            checkpoint_interval (int, optional): The number of
+            generations between checkpoints. Defaults to 1.
+            engine (str, optional): How the population evolves.
+            "generational" replaces it with a new generation of
+            children; "steady-state" breeds the children one at a time,
+            each replacing the worst member at once if it is fitter, so
+            it can be selected by the next child. A generation is then
+            n_population children. "buffered" breeds generations like
+            "generational", into two preallocated key and fitness arrays
+            reused across generations, so memory stays flat for huge
+            populations. Defaults to "generational".
+            niche_radius (int, optional): When positive, the
+            generational tournaments compare fitness shared among the
+            keys differing in fewer than niche_radius positions, so
+            near-duplicate keys lose to distinct ones. Every generation
+            compares every pair of keys, so it is limited to populations
+            of at most MAX_NICHE_POPULATION keys. Defaults to 0 (no
+            niching).
 
         Yields:
             tuple[str, float, str]: A tuple containing the best
             deciphered key, its fitness as a percentage, and the
             corresponding deciphered text.
         """
-        self.cipher_text = cipher_text
-        self.n_population = n_population
-        self._set_mutation(mutation_type)
-        self._set_crossover(crossover_type)
-        self.mutation_rate = mutation_rate
-        self.crossover_rate = crossover_rate
+        self._configure({"cipher_text": cipher_text,
+                         "max_iter": max_iter,
+                         "tolerance": tolerance,
+                         "n_population": n_population,
+                         "mutation_type": mutation_type,
+                         "crossover_type": crossover_type,
+                         "mutation_rate": mutation_rate,
+                         "crossover_rate": crossover_rate,
+                         "max_time": max_time,
+                         "max_evaluations": max_evaluations,
+                         "seeding": seeding,
+                         "random_fraction": random_fraction,
+                         "cribs": cribs,
+                         "checkpoint_path": checkpoint_path,
+                         "checkpoint_interval": checkpoint_interval,
+                         "engine": engine,
+                         "niche_radius": niche_radius})
 
-        self.population = self.ngram.generate_population(self.cipher_text,
-                                                         self.n_population)
-        best_key = (CipherKey(string.ascii_uppercase), -np.inf)
+        if self.cache is not None:
+            cached = self.cache.get(self.cipher_text, self.ngram.ngram_type,
+                                    self.mapping)
+            if cached is not None:
+                key, fitness, fitness_percentage = cached
+                self.population = {key: fitness}
+                self.best_key = (key, fitness)
+                yield self._record(fitness_percentage)
+                return
 
-        deciphered_text = cipher_text
-        iteration = 0
-        fitness_percentage = 0.0
-        while iteration < max_iter and fitness_percentage < 1 - tolerance:
-            self.population = self.evolve_population(self.population)
-            best_idx_key = max(self.population.items(), key=lambda x: x[1])
+        if seeding not in SeedingType.values():
+            raise InvalidInputError("seeding", seeding, SeedingType)
+        library_keys: list[CipherKey] = []
+        if self.key_library:
+            library_keys = self._library_keys(self.key_library)
+            if self.best_key[1] != -np.inf:
+                fitness_percentage = self._fitness_percentage(
+                    self.best_key[1]
+                )
+                if fitness_percentage >= 1 - tolerance:
+                    key, fitness = self.best_key
+                    self.population = {key: fitness}
+                    yield self._record(fitness_percentage)
+                    self._store_result(fitness_percentage, tolerance)
+                    return
+
+        # Seeded keys are only built once the library missed
+        initial_keys = self._initial_keys(seeding, random_fraction)
+        if self.key_library:
+            initial_keys = library_keys + (initial_keys or [])
+
+        self.population = self.ngram.generate_population(
+            self.cipher_text,
+            self.n_population,
+            self.rng,
+            self._executor,
+            self.n_threads,
+            self._pinned_keys(initial_keys)
+        )
+        self.budget.spend(self.n_population)
+        self.best_key = max(self.population.items(), key=lambda x: x[1])
+
+        yield from self._generations(0, 0.0)
+
+    def resume(self, checkpoint_path: Union[str, Path]) -> str:
+        """Continue a decipher run from a checkpoint file. When the run
+        was seeded, it continues exactly as if it was never stopped.
+
+        Args:
+            checkpoint_path (Union[str, Path]): The checkpoint file
+            saved by a run with checkpoint_path set. Later checkpoints
+            are saved to the same file.
+
+        Raises:
+            CheckpointError: Raised if the checkpoint was saved with a
+            different n-gram type.
+
+        Returns:
+            str: The deciphered plaintext obtained through the genetic
+            algorithm.
+        """
+        deciphered_text = ""
+        for _, _, deciphered_text in self.resume_generator(checkpoint_path):
+            pass
+        # A finished run yields no generations, and the history may be
+        # empty or bounded
+        return (deciphered_text
+                or self.best_key[0].decode_cipher(self.cipher_text))
+
+    def resume_generator(
+        self,
+        checkpoint_path: Union[str, Path]
+    ) -> Iterator[tuple[str, float, str]]:
+        """Continue a decipher run from a checkpoint file, yielding the
+        best result of each remaining generation as decipher_generator.
+
+        Args:
+            checkpoint_path (Union[str, Path]): The checkpoint file
+            saved by a run with checkpoint_path set. Later checkpoints
+            are saved to the same file.
 
-            if best_idx_key[1] > best_key[1]:
-                best_key = best_idx_key
-            deciphered_text = best_key[0].decode_cipher(self.cipher_text)
+        Raises:
+            CheckpointError: Raised if the checkpoint was saved with a
+            different n-gram type.
+
+        Yields:
+            tuple[str, float, str]: A tuple containing the best
+            deciphered key, its fitness as a percentage, and the
+            corresponding deciphered text.
+        """
+        with open(checkpoint_path, "rb") as file_in:
+            state = pickle.load(file_in)
+        if state["ngram_type"] != self.ngram.ngram_type:
+            raise CheckpointError()
+
+        self._configure({**state["params"],
+                         "checkpoint_path": checkpoint_path})
+        self.budget.restore(state["evaluations"], state["elapsed"])
+        self.rng.bit_generator.state = state["rng_state"]
+        members = [(CipherKey(key), fitness)
+                   for key, fitness in state["population"]]
+        self.population = dict(members)
+        self.best_key = (CipherKey(state["best_key"][0]),
+                         state["best_key"][1])
+        self.history = self._new_history(
+            [CipherKey(key) for key in state["history"]["key"]],
+            state["history"]["fitness"],
+            state["history"]["text"]
+        )
+
+        yield from self._generations(state["iteration"],
+                                     state["fitness_percentage"],
+                                     members)
+
+    def _new_history(
+        self,
+        keys: Sequence[CipherKey] = (),
+        fitness: Sequence[float] = (),
+        texts: Sequence[str] = ()
+    ) -> dict[str, MutableSequence[Any]]:
+        if self.history_size is None:
+            return {"key": list(keys), "fitness": list(fitness),
+                    "text": list(texts)}
+        return {"key": deque(keys, self.history_size),
+                "fitness": deque(fitness, self.history_size),
+                "text": deque(texts, self.history_size)}
 
-            ngram_count = self.ngram.ngram_count(deciphered_text)
-            fitness_percentage = self.ngram.fitness_percentage(
-                (best_key[1] / ngram_count)
-            )
+    def _configure(self, params: dict[str, Any]) -> None:
+        defaults = (DEFAULT_PARAMS if self.profile is None
+                    else self.profile.params(len(params["cipher_text"])))
+        params = {**params, **{name: defaults[name]
+                               for name in TUNABLE_PARAMS
+                               if params[name] is None}}
+        self._params = params
+        self.history = self._new_history()
+        self.cipher_text = params["cipher_text"]
+        self.n_population = params["n_population"]
+        self.mapping = (crib_mapping(params["cribs"]) if params["cribs"]
+                        else {})
+        self.free_positions = (free_positions(self.mapping)
+                               if self.mapping else None)
+        self._set_mutation(params["mutation_type"])
+        self._set_crossover(params["crossover_type"])
+        self.mutation_rate = params["mutation_rate"]
+        self.crossover_rate = params["crossover_rate"]
+        if params["checkpoint_interval"] <= 0:
+            raise CheckpointIntervalError()
+        if params["engine"] not in EngineType.values():
+            raise InvalidInputError("engine", params["engine"], EngineType)
+        if (not 0 <= params["niche_radius"] <= len(string.ascii_uppercase)
+                or (params["niche_radius"]
+                    and self.n_population > MAX_NICHE_POPULATION)):
+            raise NicheRadiusError()
+        self.niche_radius = params["niche_radius"]
+        self.budget = Budget(params["max_time"], params["max_evaluations"])
+        if self.instrument:
+            self._recorder = Recorder(self.stats_callback,
+                                      self.history_size)
+            self.stats = self._recorder.stats
+
+    def _generations(
+        self,
+        iteration: int,
+        fitness_percentage: float,
+        members: Optional[list[tuple[CipherKey, float]]] = None
+    ) -> Iterator[tuple[str, float, str]]:
+        max_iter = self._params["max_iter"]
+        tolerance = self._params["tolerance"]
+        checkpoint_path = self._params["checkpoint_path"]
+        checkpoint_interval = self._params["checkpoint_interval"]
+        # The members of a checkpoint, in heap order or with duplicate
+        # rows, rebuild the population exactly
+        members = members or list(self.population.items())
+        self._steady = None
+        if self._params["engine"] == EngineType.STEADY_STATE.value:
+            self.population = dict(members)
+            self._steady = SteadyStatePopulation(self.population)
+        elif self._params["engine"] == EngineType.BUFFERED.value:
+            self.population = BufferedPopulation(members, self.n_population)
+
+        while iteration < max_iter and fitness_percentage < 1 - tolerance:
+            evaluations = self.budget.evaluations
+            if not self.budget.exhausted:
+                if self._steady is not None:
+                    self.evolve_steady_state(self._steady)
+                elif isinstance(self.population, BufferedPopulation):
+                    self.evolve_buffered(self.population)
+                else:
+                    self.population = self.evolve_population(
+                        self.population
+                    )
+
+            if self._recorder is not None:
+                self._recorder.end_generation(
+                    self.budget.evaluations - evaluations,
+                    len(self.population) / self.n_population,
+                    self.best_key[1],
+                    measure(self._diversity_sample())
+                )
+            fitness_percentage = self._fitness_percentage(self.best_key[1])
             iteration += 1
-            yield best_key[0], fitness_percentage, deciphered_text
+            yield self._record(fitness_percentage)
+
+            if self.budget.exhausted:
+                break
+            if (checkpoint_path is not None
+                    and iteration % checkpoint_interval == 0):
+                self._save_checkpoint(checkpoint_path, iteration,
+                                      fitness_percentage)
+
+        if iteration > 0:
+            self._store_result(fitness_percentage, tolerance)
+
+    def _diversity_sample(self) -> list[CipherKey]:
+        keys = list(self.population)
+        stride = -(-len(keys) // _DIVERSITY_SAMPLE)
+        return keys[::stride]
+
+    def _record(self, fitness_percentage: float) -> tuple[str, float, str]:
+        key = self.best_key[0]
+        deciphered_text = key.decode_cipher(self.cipher_text)
+        self.history["key"].append(key)
+        self.history["fitness"].append(fitness_percentage)
+        self.history["text"].append(deciphered_text)
+        return key, fitness_percentage, deciphered_text
+
+    def _save_checkpoint(
+        self,
+        checkpoint_path: Union[str, Path],
+        iteration: int,
+        fitness_percentage: float
+    ) -> None:
+        params = {name: value for name, value in self._params.items()
+                  if name != "checkpoint_path"}
+        # A steady-state population is saved in heap order, and a
+        # buffered one row by row, so they are rebuilt with their
+        # members in the same places
+        if self._steady is not None:
+            members: Any = self._steady.items()
+        elif isinstance(self.population, BufferedPopulation):
+            members = self.population.rows()
+        else:
+            members = self.population.items()
+        state = {"ngram_type": self.ngram.ngram_type,
+                 "params": params,
+                 "iteration": iteration,
+                 "fitness_percentage": float(fitness_percentage),
+                 "population": [(str(key), fitness)
+                                for key, fitness in members],
+                 "best_key": (str(self.best_key[0]), self.best_key[1]),
+                 "rng_state": self.rng.bit_generator.state,
+                 "evaluations": self.budget.evaluations,
+                 "elapsed": self.budget.elapsed,
+                 "history": {"key": [str(key)
+                                     for key in self.history["key"]],
+                             "fitness": [float(fitness) for fitness
+                                         in self.history["fitness"]],
+                             "text": list(self.history["text"])}}
+
+        # Write to a temporary file first, so a run killed while saving
+        # leaves the previous checkpoint intact.
+        temp_path = f"{checkpoint_path}.tmp"
+        with open(temp_path, "wb") as file_out:
+            pickle.dump(state, file_out, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, checkpoint_path)
+
+    def _library_keys(self, key_library: list[CipherKey]) -> list[CipherKey]:
+        # Score the library keys that agree with the cribs, and keep the
+        # best ones to seed the initial population.
+        pins = "".join(self.mapping)
+        plain = "".join(self.mapping.values())
+        keys = [key for key in key_library
+                if key.decode_cipher(pins) == plain]
+
+        self.best_key = (CipherKey(string.ascii_uppercase), -np.inf)
+        fitness = self.evaluate_batch(keys)
+        ranked = sorted(zip(fitness, keys), key=lambda x: x[0],
+                        reverse=True)
+        n_keys = max(1, round(self.n_population * _LIBRARY_FRACTION))
+        return [key for _, key in ranked[:n_keys]]
+
+    def _fitness_percentage(self, fitness: float) -> float:
+        ngram_count = self.ngram.ngram_count(self.cipher_text)
+        return self.ngram.fitness_percentage(fitness / ngram_count)
+
+    def _store_result(self, fitness_percentage: float, tolerance: float):
+        key, fitness = self.best_key
+        if self.cache is not None:
+            self.cache.put(self.cipher_text, self.ngram.ngram_type, key,
+                           fitness, fitness_percentage, self.mapping)
+        if (self.key_library is not None
+                and fitness_percentage >= 1 - tolerance
+                and key not in self.key_library):
+            self.key_library.append(key)
+
+    def _initial_keys(
+        self,
+        seeding: str,
+        random_fraction: float
+    ) -> Optional[list[CipherKey]]:
+        if seeding == SeedingType.RANDOM.value:
+            return None
+        elif seeding == SeedingType.FREQUENCY.value:
+            return seed_keys(frequency_key(self.cipher_text),
+                             self.n_population,
+                             random_fraction,
+                             self.rng)
+        else:
+            if self.word_index is None:
+                self.word_index = WordPatternIndex()
+            mapping = {cipher_letter: plain_letter
+                       for cipher_letter, plain_letter
+                       in self.word_index.constraints(self.cipher_text).items()
+                       if cipher_letter not in self.mapping
+                       and plain_letter not in self.mapping.values()}
+            mapping.update(self.mapping)
+            baseline = apply_mapping(frequency_key(self.cipher_text), mapping)
+            return seed_keys(baseline,
+                             self.n_population,
+                             random_fraction,
+                             self.rng,
+                             mapping)
+
+    def _pinned_keys(
+        self,
+        keys: Optional[list[CipherKey]]
+    ) -> Optional[list[CipherKey]]:
+        if not self.mapping:
+            return keys
+        if keys is None:
+            keys = [random_cipher_key(self.rng)
+                    for _ in range(self.n_population)]
+        return [apply_mapping(key, self.mapping) for key in keys]
 
     def FX(self, winner: CipherKey, loser: CipherKey) -> CipherKey:
         """Perform a full crossover (FX) operation on two parent
@@ -205,20 +760,104 @@ class GeneticDecipher(Crossover, Mutation):
         source_key = list(loser)
 
         for idx in range(len(target_key)):
+            if self.budget.exhausted:
+                break
             if source_key[idx] != target_key[idx]:
                 new_key = target_key[:]
                 temp_idx = new_key.index(source_key[idx])
                 new_key[idx], new_key[temp_idx] = source_key[idx], new_key[idx]
                 new_cipher_key = CipherKey("".join(new_key))
 
-                new_text = new_cipher_key.decode_cipher(self.cipher_text)
-                new_fitness = self.ngram.compute_fitness(new_text)
+                new_fitness = self.evaluate(new_cipher_key)
                 if new_fitness > target_fitness:
                     target_key = new_key
                     target_fitness = new_fitness
 
         return CipherKey("".join(target_key))
 
+    def BFX(self, winner: CipherKey, loser: CipherKey) -> CipherKey:
+        """Perform a full crossover (FX) scoring its candidate keys in
+        batches.
+
+        Every position where the parents differ gives a candidate: the
+        winner with the letter of the loser swapped into that position.
+        The candidates are scored together, and the improving ones that
+        touch different positions are applied at once, fittest first.
+        Improving candidates left out are tried again on the new key in
+        the next round, until none is left.
+
+        Args:
+            winner (CipherKey): The parent with a higher fitness in
+            solving the cryptogram, used as the first parent for
+            crossover.
+            loser (CipherKey): The parent with a lower fitness in
+            solving the cryptogram, used as the second parent for
+            crossover.
+
+        Raises:
+            ParentsLengthError: Raised if the lengths of winner and
+            loser CipherKeys are not equal.
+
+        Returns:
+            CipherKey: The offspring CipherKey generated through the
+            full crossover operation.
+        """
+        if len(winner) != len(loser):
+            raise ParentsLengthError()
+
+        target_fitness = self.population[winner]
+        target = Ngram.encode_text(winner)
+        source = Ngram.encode_text(loser)
+        pending = np.flatnonzero(source != target)
+
+        while len(pending) and not self.budget.exhausted:
+            positions = np.empty(len(target), dtype=np.intp)
+            positions[target] = np.arange(len(target))
+            partners = positions[source[pending]]
+            candidates = np.tile(target, (len(pending), 1))
+            rows = np.arange(len(pending))
+            candidates[rows, pending] = source[pending]
+            candidates[rows, partners] = target[pending]
+
+            keys = [_codes_key(row) for row in candidates]
+            scores = np.array(self.evaluate_batch(keys))
+            improving = np.flatnonzero(scores > target_fitness)
+            if len(improving) == 0:
+                break
+
+            # Apply the improving swaps that do not share a position
+            improving = improving[np.argsort(-scores[improving],
+                                             kind="stable")]
+            touched: set[int] = set()
+            accepted = []
+            for row in improving:
+                swap = {int(pending[row]), int(partners[row])}
+                if touched.isdisjoint(swap):
+                    touched |= swap
+                    accepted.append(row)
+
+            best_row = accepted[0]
+            new_target = target.copy()
+            for row in accepted:
+                new_target[pending[row]] = source[pending[row]]
+                new_target[partners[row]] = target[pending[row]]
+            new_fitness = scores[best_row]
+            if len(accepted) > 1:
+                combined = self.evaluate_batch([_codes_key(new_target)])
+                if combined and combined[0] > new_fitness:
+                    new_fitness = combined[0]
+                else:
+                    new_target = candidates[best_row]
+                    accepted = [best_row]
+
+            target = new_target
+            target_fitness = new_fitness
+            left_out = improving[~np.isin(improving, accepted)]
+            pending = pending[left_out]
+            pending = pending[source[pending] != target[pending]]
+
+        return _codes_key(target)
+
     def evolve_population(
         self,
         population: dict[CipherKey, float]
@@ -237,31 +876,285 @@ class GeneticDecipher(Crossover, Mutation):
             are CipherKeys, and values are their updated fitness scores
             (float).
         """
-        new_population = {}
+        n_children = self.n_population
+        with self._phase("selection"):
+            parents = select_parents(population, 2 * n_children, self.rng)
+            ranking = (shared_fitness(population, self.niche_radius)
+                       if self.niche_radius else population)
+
+        winners = []
+        losers = []
+        for key1, key2 in zip(parents[::2], parents[1::2]):
+            if ranking[key1] > ranking[key2]:
+                winners.append(key1)
+                losers.append(key2)
+            else:
+                winners.append(key2)
+                losers.append(key1)
+        crossover_draws = self.rng.random(n_children) < self.crossover_rate
+        mutation_draws = self.rng.random(n_children) < self.mutation_rate
+
+        new_keys = winners[:]
+        new_fitness = [population[winner] for winner in winners]
+
+        crossed = []
+        for idx in np.flatnonzero(crossover_draws):
+            if self.budget.exhausted:
+                break
+            with self._phase("crossover"):
+                offspring = self.crossover(winners[idx], losers[idx])
+            if offspring != winners[idx]:
+                new_keys[idx] = offspring
+                crossed.append(idx)
+        # Offspring falling short of their winner are discarded, so their
+        # scoring can stop as soon as they cannot catch up
+        scores = self.evaluate_batch([new_keys[idx] for idx in crossed],
+                                     [new_fitness[idx] for idx in crossed])
+        for n_scored, idx in enumerate(crossed):
+            if n_scored < len(scores) and scores[n_scored] >= new_fitness[idx]:
+                new_fitness[idx] = scores[n_scored]
+            else:
+                new_keys[idx] = winners[idx]
+
+        mutated = []
+        with self._phase("mutation"):
+            for idx in np.flatnonzero(mutation_draws):
+                mutated.append((idx, new_keys[idx]))
+                new_keys[idx] = self.mutation(new_keys[idx])
+        scores = self.evaluate_batch([new_keys[idx] for idx, _ in mutated])
+        for n_scored, (idx, previous_key) in enumerate(mutated):
+            if n_scored < len(scores):
+                new_fitness[idx] = scores[n_scored]
+            else:
+                new_keys[idx] = previous_key
+
+        return dict(zip(new_keys, new_fitness))
+
+    def evolve_steady_state(self, population: SteadyStatePopulation) -> None:
+        """Breed n_population children one at a time. The parents of
+        each child are two random members, the fitter one being the
+        winner of the crossover, and a child fitter than the worst
+        member replaces it at once.
+
+        Args:
+            population (SteadyStatePopulation): The population, updated
+            in place.
+        """
         for _ in range(self.n_population):
-            key1 = select_parent(population)
-            key2 = select_parent(population)
-            if population[key1] > population[key2]:
+            if self.budget.exhausted:
+                break
+            with self._phase("selection"):
+                key1 = population.sample(self.rng)
+                key2 = population.sample(self.rng)
+            if population.fitness[key1] > population.fitness[key2]:
                 winner, loser = key1, key2
             else:
                 winner, loser = key2, key1
-            new_key = winner
-            new_fitness = fitness_target = population[winner]
-
-            if random.random() < self.crossover_rate:
-                new_key = self.crossover(winner, loser)
-                new_text = new_key.decode_cipher(self.cipher_text)
-                new_fitness = self.ngram.compute_fitness(new_text)
-                if new_fitness < fitness_target:
-                    new_key = winner
-                    new_fitness = fitness_target
-            if random.random() < self.mutation_rate:
-                new_key = self.mutation(new_key)
-                new_text = new_key.decode_cipher(self.cipher_text)
-                new_fitness = self.ngram.compute_fitness(new_text)
-            new_population[new_key] = new_fitness
-
-        return new_population
+
+            offspring = winner
+            if self.rng.random() < self.crossover_rate:
+                with self._phase("crossover"):
+                    offspring = self.crossover(winner, loser)
+            if self.rng.random() < self.mutation_rate:
+                with self._phase("mutation"):
+                    offspring = self.mutation(offspring)
+            if offspring in population.fitness:
+                continue
+
+            scores = self.evaluate_batch([offspring])
+            if scores:
+                population.offer(offspring, scores[0])
+
+    def evolve_buffered(self, population: BufferedPopulation) -> None:
+        """Evolve the population as evolve_population does, writing the
+        children into its spare buffers and making them current. Only a
+        batch of children at a time exists as CipherKeys, so memory does
+        not grow with n_population beyond the buffers. Fitness sharing
+        (niche_radius) is not applied.
+
+        Args:
+            population (BufferedPopulation): The population, updated in
+            place.
+        """
+        n_children = len(population.fitness)
+        fitness = population.fitness
+        new_codes = population.spare_codes
+        new_fitness = population.spare_fitness
+        with self._phase("selection"):
+            parents = self.rng.choice(n_children, size=2 * n_children,
+                                      p=fitness / np.sum(fitness))
+            first_wins = fitness[parents[::2]] > fitness[parents[1::2]]
+            winners = np.where(first_wins, parents[::2], parents[1::2])
+            losers = np.where(first_wins, parents[1::2], parents[::2])
+        crossover_draws = self.rng.random(n_children) < self.crossover_rate
+        mutation_draws = self.rng.random(n_children) < self.mutation_rate
+
+        new_codes[:] = population.codes[winners]
+        new_fitness[:] = fitness[winners]
+
+        for start in range(0, n_children, _BATCH_SIZE):
+            batch = np.arange(start, min(start + _BATCH_SIZE, n_children))
+
+            crossed = []
+            offspring_keys = []
+            for idx in batch[crossover_draws[batch]]:
+                if self.budget.exhausted:
+                    break
+                winner = population.key(winners[idx])
+                # FX and BFX look the winner up in self.population
+                population.remember(winner, float(fitness[winners[idx]]))
+                with self._phase("crossover"):
+                    offspring = self.crossover(winner,
+                                               population.key(losers[idx]))
+                if offspring != winner:
+                    crossed.append(idx)
+                    offspring_keys.append(offspring)
+            scores = self.evaluate_batch(offspring_keys,
+                                         new_fitness[crossed].tolist())
+            for idx, offspring, score in zip(crossed, offspring_keys,
+                                             scores):
+                if score >= new_fitness[idx]:
+                    new_codes[idx] = Ngram.encode_text(offspring)
+                    new_fitness[idx] = score
+
+            with self._phase("mutation"):
+                mutated = [(idx, self.mutation(_codes_key(new_codes[idx])))
+                           for idx in batch[mutation_draws[batch]]]
+            scores = self.evaluate_batch([key for _, key in mutated])
+            for (idx, key), score in zip(mutated, scores):
+                new_codes[idx] = Ngram.encode_text(key)
+                new_fitness[idx] = score
+
+        population.swap()
+
+    def immigrate(self, migrants: dict[CipherKey, float]) -> int:
+        """Replace the least fit members of the population of a running
+        decipher with fitter keys evolved elsewhere, e.g. by another
+        island. Call it between the generations of decipher_generator.
+
+        Args:
+            migrants (dict[CipherKey, float]): The keys and their
+            fitness on the same cipher text and n-gram type.
+
+        Returns:
+            int: The number of migrants that joined the population.
+        """
+        joined = 0
+        for key, fitness in sorted(migrants.items(), key=lambda x: x[1],
+                                   reverse=True):
+            if self._steady is not None:
+                joined += self._steady.offer(key, fitness)
+                continue
+            if isinstance(self.population, BufferedPopulation):
+                joined += self.population.offer(key, fitness)
+                continue
+            worst = min(self.population, key=self.population.__getitem__)
+            if key in self.population or fitness <= self.population[worst]:
+                continue
+            del self.population[worst]
+            self.population[key] = fitness
+            joined += 1
+
+        if migrants:
+            best = max(migrants.items(), key=lambda x: x[1])
+            if best[1] > self.best_key[1] and best[0] in self.population:
+                self.best_key = best
+        return joined
+
+    def evaluate(self, key: CipherKey) -> float:
+        """Compute the fitness of a cipher key on the current cipher
+        text, registering the evaluation against the budget and keeping
+        track of the best key found so far.
+
+        Args:
+            key (CipherKey): The cipher key to be evaluated.
+
+        Returns:
+            float: The fitness of the text deciphered with the key, or
+            -inf if the budget is exhausted.
+        """
+        scores = self.evaluate_batch([key])
+        return scores[0] if scores else -np.inf
+
+    def evaluate_batch(
+        self,
+        keys: Sequence[CipherKey],
+        thresholds: Optional[Sequence[float]] = None
+    ) -> list[float]:
+        """Compute the fitness of several cipher keys on the current
+        cipher text, registering the evaluations against the budget and
+        keeping track of the best key found so far.
+
+        Args:
+            keys (Sequence[CipherKey]): The cipher keys to be evaluated.
+            thresholds (Sequence[float], optional): The fitness each key
+            must reach to be of use. Scoring a key stops early once it
+            cannot, and its fitness is reported as -inf. Defaults to
+            None (score every key fully).
+
+        Returns:
+            list[float]: The fitness of the text deciphered with each
+            key. Keys left when the budget runs out are not evaluated,
+            so the list may be shorter than keys.
+        """
+        remaining_evaluations = self.budget.remaining_evaluations
+        if remaining_evaluations is not None:
+            keys = keys[:remaining_evaluations]
+
+        batch_size = _BATCH_SIZE * self.n_threads
+        scores: list[float] = []
+        for start in range(0, len(keys), batch_size):
+            if self.budget.exhausted:
+                break
+            batch = keys[start:start + batch_size]
+            if self._executor is None and thresholds is None:
+                with self._phase("decoding"):
+                    decoded = self.ngram.decode_keys(batch, self.encoded_text)
+                with self._phase("fitness"):
+                    batch_scores = self.ngram.score_decoded(decoded)
+            else:
+                batch_thresholds = (
+                    None if thresholds is None
+                    else np.asarray(thresholds[start:start + len(batch)],
+                                    dtype=float)
+                )
+                with self._phase("fitness"):
+                    batch_scores = self.ngram.score_keys(batch,
+                                                         self.encoded_text,
+                                                         self._executor,
+                                                         self.n_threads,
+                                                         batch_thresholds)
+            self.budget.spend(len(batch))
+
+            best_idx = int(np.argmax(batch_scores))
+            if batch_scores[best_idx] > self.best_key[1]:
+                self.best_key = (batch[best_idx], batch_scores[best_idx])
+            scores.extend(batch_scores.tolist())
+
+        return scores
+
+    def close(self) -> None:
+        """Shut down the threads used to score candidate keys."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def spawn(self, n_children: int) -> list[np.random.Generator]:
+        """Spawn independent random number generators from the one
+        owned by this object, e.g. to seed parallel workers.
+
+        Args:
+            n_children (int): The number of generators to spawn.
+
+        Returns:
+            list[np.random.Generator]: Statistically independent
+            generators, reproducible when this object was seeded.
+        """
+        return self.rng.spawn(n_children)
+
+    def _phase(self, name: str) -> ContextManager[None]:
+        if self._recorder is None:
+            return _NO_PHASE
+        return self._recorder.phase(name)
 
     @property
     def cipher_text(self):
@@ -274,6 +1167,7 @@ class GeneticDecipher(Crossover, Mutation):
 
         if len(only_text) > Ngram_list.index(self.ngram.ngram_type):
             self.__cipher_text = cipher_text
+            self.encoded_text = self.ngram.encode_text(cipher_text)
         else:
             raise CipherTextLengthError
 
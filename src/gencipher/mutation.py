@@ -1,107 +1,165 @@
-import random
-
-from gencipher.utils import InvalidInputError, InputType
-from gencipher.cipherkey import CipherKey
+from functools import partial
+from typing import Callable, Optional, Sequence
 
+import numpy as np
 
-class MutationType(InputType):
-    """Collection of available methods for genetic mutation."""
-    INSERT = "insert"
-    SWAP = "swap"
-    INVERSION = "inversion"
-    SCRAMBLE = "scramble"
+from gencipher.rng import get_rng
+from gencipher.options import InvalidInputError, MutationType
+from gencipher.cipherkey import CipherKey
+from gencipher.cribs import on_free_positions
 
 
 class Mutation:
     """Base class for mutation methods used in genetic algorithms."""
+    rng: Optional[np.random.Generator] = None
+    free_positions: Optional[list[int]] = None
+    mutation: Callable[[CipherKey], CipherKey]
+
     @staticmethod
-    def insert(parent: CipherKey) -> CipherKey:
+    def insert(
+        parent: CipherKey,
+        rng: Optional[np.random.Generator] = None
+    ) -> CipherKey:
         """Perform insert mutation on a parent CipherKey to generate a
         mutated CipherKey.
 
         Args:
             parent (CipherKey): The parent to undergo mutation.
+            rng (np.random.Generator, optional): The random number
+            generator to be used. Defaults to None (module generator).
 
         Returns:
             CipherKey: The mutated CipherKey.
         """
+        return CipherKey("".join(Mutation._insert(parent, rng)))
+
+    @staticmethod
+    def _insert(
+        parent: Sequence[str],
+        rng: Optional[np.random.Generator] = None
+    ) -> list[str]:
         parent_list = list(parent)
-        pos1, pos2 = random.sample(range(len(parent_list)), 2)
+        pos1, pos2 = get_rng(rng).choice(len(parent_list), 2, replace=False)
 
         element = parent_list.pop(pos2)
         parent_list.insert(pos1 + 1, element)
 
-        return CipherKey("".join(parent_list))
+        return parent_list
 
     @staticmethod
-    def swap(parent: CipherKey) -> CipherKey:
+    def swap(
+        parent: CipherKey,
+        rng: Optional[np.random.Generator] = None
+    ) -> CipherKey:
         """Perform swap mutation on a parent CipherKey to generate a
         mutated CipherKey.
 
         Args:
             parent (CipherKey): The parent to undergo mutation.
+            rng (np.random.Generator, optional): The random number
+            generator to be used. Defaults to None (module generator).
 
         Returns:
             CipherKey: The mutated CipherKey.
         """
+        return CipherKey("".join(Mutation._swap(parent, rng)))
+
+    @staticmethod
+    def _swap(
+        parent: Sequence[str],
+        rng: Optional[np.random.Generator] = None
+    ) -> list[str]:
         parent_list = list(parent)
-        pos1, pos2 = random.sample(range(len(parent_list)), 2)
+        pos1, pos2 = get_rng(rng).choice(len(parent_list), 2, replace=False)
 
         parent_list[pos1], parent_list[pos2] = (
             parent_list[pos2], parent_list[pos1]
         )
 
-        return CipherKey("".join(parent_list))
+        return parent_list
 
     @staticmethod
-    def inversion(parent: CipherKey) -> CipherKey:
+    def inversion(
+        parent: CipherKey,
+        rng: Optional[np.random.Generator] = None
+    ) -> CipherKey:
         """Perform inversion mutation on a parent CipherKey to generate
         a mutated CipherKey.
 
         Args:
             parent (CipherKey): The parent to undergo mutation.
+            rng (np.random.Generator, optional): The random number
+            generator to be used. Defaults to None (module generator).
 
         Returns:
             CipherKey: The mutated CipherKey.
         """
+        return CipherKey("".join(Mutation._inversion(parent, rng)))
+
+    @staticmethod
+    def _inversion(
+        parent: Sequence[str],
+        rng: Optional[np.random.Generator] = None
+    ) -> list[str]:
+        rng = get_rng(rng)
         length = len(parent)
-        start = random.randint(0, length)
-        end = random.randint(start, length)
+        start = rng.integers(0, length, endpoint=True)
+        end = rng.integers(start, length, endpoint=True)
 
         parent_list = list(parent)
         parent_list[start:end] = reversed(parent_list[start:end])
 
-        return CipherKey("".join(parent_list))
+        return parent_list
 
     @staticmethod
-    def scramble(parent: CipherKey) -> CipherKey:
+    def scramble(
+        parent: CipherKey,
+        rng: Optional[np.random.Generator] = None
+    ) -> CipherKey:
         """Perform scramble mutation on a parent CipherKey to generate
         a mutated CipherKey.
 
         Args:
             parent (CipherKey): The parent to undergo mutation.
+            rng (np.random.Generator, optional): The random number
+            generator to be used. Defaults to None (module generator).
 
         Returns:
             CipherKey: The mutated CipherKey.
         """
+        return CipherKey("".join(Mutation._scramble(parent, rng)))
+
+    @staticmethod
+    def _scramble(
+        parent: Sequence[str],
+        rng: Optional[np.random.Generator] = None
+    ) -> list[str]:
+        rng = get_rng(rng)
         length = len(parent)
-        start = random.randint(0, length)
-        end = random.randint(start, length)
+        start = rng.integers(0, length, endpoint=True)
+        end = rng.integers(start, length, endpoint=True)
         parent_list = list(parent)
         subList = parent_list[start:end]
-        random.shuffle(subList)
-        parent_list[start:end] = subList
+        parent_list[start:end] = [subList[idx]
+                                  for idx in rng.permutation(len(subList))]
 
-        return CipherKey("".join(parent_list))
+        return parent_list
 
     def _set_mutation(self, mutation_type) -> None:
         if mutation_type == MutationType.INSERT.value:
-            self.mutation = self.insert
+            self.mutation = partial(self.insert, rng=self.rng)
+            operator = partial(self._insert, rng=self.rng)
         elif mutation_type == MutationType.INVERSION.value:
-            self.mutation = self.inversion
+            self.mutation = partial(self.inversion, rng=self.rng)
+            operator = partial(self._inversion, rng=self.rng)
         elif mutation_type == MutationType.SWAP.value:
-            self.mutation = self.swap
+            self.mutation = partial(self.swap, rng=self.rng)
+            operator = partial(self._swap, rng=self.rng)
         elif mutation_type == MutationType.SCRAMBLE.value:
-            self.mutation = self.scramble
+            self.mutation = partial(self.scramble, rng=self.rng)
+            operator = partial(self._scramble, rng=self.rng)
         else:
             raise InvalidInputError("mutation", mutation_type, MutationType)
+
+        if self.free_positions is not None:
+            self.mutation = on_free_positions(operator, self.free_positions)
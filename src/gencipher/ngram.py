@@ -3,33 +3,82 @@ import re
 import glob
 import math
 import pickle
-from typing import Union
+import string
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Optional, Sequence, Union
 from pathlib import Path
-from importlib import resources
 
+import numpy as np
 
-from gencipher.utils import InvalidInputError, InputType
+from gencipher.options import InvalidInputError, NgramType
 from gencipher.cipherkey import CipherKey, random_cipher_key
+from gencipher.tables import (
+    DenseTable, NgramTable, TableFormat, build_table, load_entries,
+    save_entries
+)
 
 
-class NgramType(InputType):
-    """Collection of available types of n-grams for genetic
-    algorithms.
+HASHED_MIN_LEN = 5
+BOUNDED_BLOCK_SIZE = 128
+
+
+class ScoresNotFoundError(ValueError):
+    """Missing n-gram score files."""
+    def __init__(self, ngram_type: str) -> None:
+        super().__init__(f"No {ngram_type} scores found. Build them with "
+                         "python -m gencipher.builder and pass their folder "
+                         "as scores_folder.")
+
+
+@lru_cache(maxsize=None)
+def packaged_scores_folder() -> str:
+    """Locate the n-gram scores folder shipped with the package. It is
+    resolved on first use rather than on import, which keeps importing
+    gencipher cheap.
+
+    Returns:
+        str: The path to the packaged scores folder.
     """
-    MONOGRAM = "monogram"
-    BIGRAM = "bigram"
-    TRIGRAM = "trigram"
-    QUADGRAM = "quadgram"
-    QUINTGRAM = "quintgram"
+    from importlib import resources
 
+    return f"{resources.files('ngrams_scores')}"
 
-class Ngram:
-    _NGRAMS_SCORES = f"{resources.files('ngrams_scores')}"
 
+def scores_file(
+    ngram_type: str,
+    scores_folder: Union[None, str, Path] = None
+) -> str:
+    """Locate the score file of an n-gram type without loading it, e.g.
+    to check the scores exist before starting workers.
+
+    Args:
+        ngram_type (str): The type of n-gram.
+        scores_folder (Union[None, str, Path], optional): The folder of
+        the score files. Defaults to None (the packaged scores folder).
+
+    Raises:
+        ScoresNotFoundError: Raised if the folder has no scores of
+        ngram_type.
+
+    Returns:
+        str: The path to the pickled dictionary or .npz entries file.
+    """
+    if scores_folder is None:
+        scores_folder = packaged_scores_folder()
+    file = os.path.join(scores_folder, f"english_{ngram_type}s")
+    for extension in (".dict", ".npz"):
+        if os.path.exists(file + extension):
+            return file + extension
+    raise ScoresNotFoundError(ngram_type)
+
+
+class Ngram:
     def __init__(
         self,
         ngram_type: str,
-        scores_folder: Union[str, Path] = _NGRAMS_SCORES
+        scores_folder: Union[None, str, Path] = None,
+        table_format: Optional[str] = None
     ) -> None:
         """Create a Ngram object for a specified n-gram type.
 
@@ -37,17 +86,94 @@ class Ngram:
             ngram_type (str): The type of n-gram to initialize. It must
             be one of the following valid values: "monogram", "bigram,"
             "trigram", "quadgram", or "quintgram".
-            scores_folder (Union[str, Path]): The path to the
-            folder containing the precomputed n-gram score pickled
-            dictionaries. Defaults to "".
+            scores_folder (Union[None, str, Path], optional): The path
+            to the folder containing the precomputed n-gram score
+            pickled dictionaries, or .npz entries files for high orders.
+            Defaults to None (the packaged scores folder, which has no
+            quintgram scores).
+            table_format (str, optional): The memory layout of the
+            table used to score texts: "dense" (float64), "int16" or
+            "uint8" (quantized dense tables), or "hashed" (quantized
+            table of the observed n-grams only). Defaults to None
+            ("hashed" for quintgrams, "dense" otherwise).
+
+        Raises:
+            ScoresNotFoundError: Raised if the scores folder has no
+            scores of ngram_type.
+            InvalidInputError: Raised if table_format is not a valid
+            table format.
         """
         self.ngram_type = ngram_type
+        self.ngram_len: int = NgramType.values().index(self.ngram_type) + 1
+        self._table: Optional[np.ndarray] = None
+        self._max_score: Optional[float] = None
+        self._ngram_table: Optional[NgramTable] = None
+
+        file = scores_file(self.ngram_type, scores_folder)
+        if file.endswith(".dict"):
+            with open(file, "rb") as file_in:
+                self.scores = pickle.load(file_in)
+            self._entries = self._dictionary_entries(self.scores,
+                                                     self.ngram_len)
+        else:
+            indices, values, floor, fitness = load_entries(file)
+            self.scores = {"0": floor, "fitness": fitness}
+            self._entries = (indices, values)
+
+        if table_format is None:
+            table_format = (TableFormat.HASHED.value
+                            if self.ngram_len >= HASHED_MIN_LEN
+                            else TableFormat.DENSE.value)
+        if table_format not in TableFormat.values():
+            raise InvalidInputError("table_format", table_format, TableFormat)
+        self.table_format = table_format
+
+    @classmethod
+    def from_table(
+        cls,
+        ngram_type: str,
+        table: np.ndarray,
+        floor: float,
+        fitness: float
+    ) -> "Ngram":
+        """Create a Ngram object scoring with a dense table built
+        elsewhere, e.g. by another process in shared memory, without
+        reading the score files.
 
-        file = os.path.join(scores_folder, f"english_{self.ngram_type}s.dict")
-        with open(file, "rb") as file_in:
-            self.scores = pickle.load(file_in)
+        Args:
+            ngram_type (str): The type of n-gram of the table.
+            table (np.ndarray): The score of every possible n-gram, as
+            the table property. It is used as is, not copied.
+            floor (float): The score of the unseen n-grams.
+            fitness (float): The reference fitness of fitness_percentage.
 
-        self.ngram_len: int = NgramType.values().index(self.ngram_type) + 1
+        Returns:
+            Ngram: A Ngram object with a "dense" table format.
+        """
+        ngram = cls.__new__(cls)
+        ngram.ngram_type = ngram_type
+        ngram.ngram_len = NgramType.values().index(ngram_type) + 1
+        ngram.scores = {"0": floor, "fitness": fitness}
+        seen = np.flatnonzero(table != floor)
+        ngram._entries = (seen, table[seen])
+        ngram._table = table
+        ngram._max_score = None
+        ngram._ngram_table = None
+        ngram.table_format = TableFormat.DENSE.value
+        return ngram
+
+    @staticmethod
+    def _dictionary_entries(
+        scores: dict[str, float],
+        ngram_len: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        ngrams = [ngram for ngram in scores
+                  if len(ngram) == ngram_len and ngram.isalpha()]
+        codes = Ngram.encode_text("".join(ngrams)).astype(np.intp)
+        powers = 26 ** np.arange(ngram_len - 1, -1, -1)
+        indices = codes.reshape(-1, ngram_len) @ powers
+        values = np.array([scores[ngram] for ngram in ngrams], dtype=float)
+        return indices, values
 
     def compute_fitness(self, text: str) -> float:
         """Compute the fitness score of a given text based on n-gram
@@ -62,19 +188,243 @@ class Ngram:
             likelihood that the input text is an English text based
             on n-gram frequencies.
         """
-        uppercase_text = text.upper()
-        uppercase_only_text = re.sub(r'[^A-Z]', '', uppercase_text)
-
-        fitness = 0.0
-        for i in range(len(uppercase_only_text) - self.ngram_len + 1):
-            top = i + self.ngram_len
-            ngram = uppercase_only_text[i:top]
-            if ngram in self.scores:
-                fitness += self.scores[ngram]
+        encoded_text = self.encode_text(text).astype(np.intp)
+        return float(self.score_decoded(encoded_text[np.newaxis])[0])
+
+    @property
+    def table(self) -> np.ndarray:
+        """np.ndarray: The score of every possible n-gram, indexed by
+        the base-26 number formed by the alphabet positions of its
+        letters. Built on first use from the scores dictionary.
+        """
+        if self._table is None:
+            alphabet_len = len(string.ascii_uppercase)
+            table = np.full(alphabet_len ** self.ngram_len, self.scores["0"])
+            indices, values = self._entries
+            table[indices] = values
+            self._table = table
+        return self._table
+
+    @property
+    def max_score(self) -> float:
+        """float: The highest score of a single n-gram, bounding the
+        score any text can still gain.
+        """
+        if self._max_score is None:
+            _, values = self._entries
+            self._max_score = max(float(values.max(initial=-np.inf)),
+                                  self.scores["0"])
+        return self._max_score
+
+    @property
+    def ngram_table(self) -> NgramTable:
+        """NgramTable: The table used to score texts, in the memory
+        layout given by table_format. Built on first use.
+        """
+        if self._ngram_table is None:
+            if self.table_format == TableFormat.DENSE.value:
+                self._ngram_table = DenseTable(self.table, self.scores["0"])
             else:
-                fitness += self.scores["0"]
+                self._ngram_table = build_table(*self._entries,
+                                                self.scores["0"],
+                                                self.ngram_len,
+                                                self.table_format)
+        return self._ngram_table
+
+    @staticmethod
+    def encode_text(text: str) -> np.ndarray:
+        """Encode the letters of a text as their alphabet positions,
+        ignoring non-alphabetical characters.
+
+        Args:
+            text (str): The text to be encoded.
+
+        Returns:
+            np.ndarray: The alphabet position (0-25) of every letter of
+            the text.
+        """
+        letters = re.sub(r'[^A-Z]', '', text.upper())
+        return np.frombuffer(letters.encode("ascii"), dtype=np.uint8) - 65
 
-        return fitness
+    @staticmethod
+    def decode_keys(
+        keys: Sequence[str],
+        encoded_text: np.ndarray
+    ) -> np.ndarray:
+        """Decipher an encoded text with several cipher keys at once.
+
+        Args:
+            keys (Sequence[str]): The cipher keys.
+            encoded_text (np.ndarray): The cipher text encoded with
+            encode_text.
+
+        Returns:
+            np.ndarray: A matrix with one row per key holding the
+            alphabet positions of the deciphered letters.
+        """
+        return np.take(Ngram._inverse_keys(keys), encoded_text, axis=1)
+
+    @staticmethod
+    def _inverse_keys(keys: Sequence[str]) -> np.ndarray:
+        codes = Ngram.encode_text("".join(keys)).reshape(len(keys), -1)
+        return Ngram._inverse_codes(codes)
+
+    @staticmethod
+    def _inverse_codes(codes: np.ndarray) -> np.ndarray:
+        # Row k maps the alphabet position of each cipher letter to the
+        # position of the plain letter it stands for under key k
+        inverse = np.empty(codes.shape, dtype=np.intp)
+        rows = np.arange(len(codes))[:, np.newaxis]
+        inverse[rows, codes] = np.arange(codes.shape[1])
+        return inverse
+
+    def score_decoded(self, decoded: np.ndarray) -> np.ndarray:
+        """Compute the fitness of deciphered texts produced by
+        decode_keys.
+
+        Args:
+            decoded (np.ndarray): A matrix with one deciphered text per
+            row, as alphabet positions.
+
+        Returns:
+            np.ndarray: The fitness of every row, equal to
+            compute_fitness on the corresponding text.
+        """
+        n_ngrams = decoded.shape[1] - self.ngram_len + 1
+        if n_ngrams <= 0:
+            return np.zeros(decoded.shape[0])
+
+        indices = decoded[:, :n_ngrams]
+        for offset in range(1, self.ngram_len):
+            indices = indices * 26 + decoded[:, offset:offset + n_ngrams]
+        return self.ngram_table.score(indices)
+
+    def score_codes(
+        self,
+        codes: np.ndarray,
+        encoded_text: np.ndarray
+    ) -> np.ndarray:
+        """Compute the fitness of an encoded cipher text deciphered with
+        cipher keys given as alphabet positions, e.g. rows of a shared
+        key matrix, without building their strings.
+
+        Args:
+            codes (np.ndarray): A matrix with one cipher key per row, as
+            the alphabet positions of its letters.
+            encoded_text (np.ndarray): The cipher text encoded with
+            encode_text.
+
+        Returns:
+            np.ndarray: The fitness of every key, equal to score_keys on
+            the corresponding strings.
+        """
+        return self.score_decoded(np.take(self._inverse_codes(codes),
+                                          encoded_text, axis=1))
+
+    def score_bounded(
+        self,
+        keys: Sequence[str],
+        encoded_text: np.ndarray,
+        thresholds: Union[float, np.ndarray],
+        block_size: int = BOUNDED_BLOCK_SIZE
+    ) -> np.ndarray:
+        """Compute the fitness of an encoded cipher text deciphered with
+        several cipher keys, giving up on the keys that cannot reach a
+        threshold.
+
+        The text is decoded and scored in blocks of n-grams. After each
+        block, a key is dropped when its partial score plus max_score
+        for every n-gram left is below its threshold, so bad keys are
+        rejected after scoring only part of a long text.
+
+        Args:
+            keys (Sequence[str]): The cipher keys to be scored.
+            encoded_text (np.ndarray): The cipher text encoded with
+            encode_text.
+            thresholds (Union[float, np.ndarray]): The fitness each key
+            must reach, or one fitness for all of them.
+            block_size (int, optional): The number of n-grams scored
+            between checks. Defaults to BOUNDED_BLOCK_SIZE.
+
+        Returns:
+            np.ndarray: The fitness of every key, or -inf for the keys
+            found unable to reach their threshold. Keys below their
+            threshold may still get their exact fitness.
+        """
+        n_ngrams = len(encoded_text) - self.ngram_len + 1
+        if n_ngrams <= 0:
+            return np.zeros(len(keys))
+
+        inverse = self._inverse_keys(keys)
+        thresholds = np.broadcast_to(np.asarray(thresholds, dtype=float),
+                                     (len(keys),))
+        scores = np.zeros(len(keys))
+        live = np.arange(len(keys))
+        for start in range(0, n_ngrams, block_size):
+            end = min(start + block_size, n_ngrams)
+            decoded = np.take(inverse[live],
+                              encoded_text[start:end + self.ngram_len - 1],
+                              axis=1)
+            scores[live] += self.score_decoded(decoded)
+            if end == n_ngrams:
+                break
+
+            bounds = scores[live] + (n_ngrams - end) * self.max_score
+            hopeless = bounds < thresholds[live]
+            scores[live[hopeless]] = -np.inf
+            live = live[~hopeless]
+            if len(live) == 0:
+                break
+        return scores
+
+    def score_keys(
+        self,
+        keys: Sequence[str],
+        encoded_text: np.ndarray,
+        executor: Optional[Executor] = None,
+        n_chunks: int = 1,
+        thresholds: Union[None, float, np.ndarray] = None
+    ) -> np.ndarray:
+        """Compute the fitness of an encoded cipher text deciphered with
+        several cipher keys, optionally splitting the keys in chunks
+        scored concurrently. NumPy releases the GIL while gathering and
+        summing the scores, so a thread pool runs the chunks in
+        parallel.
+
+        Args:
+            keys (Sequence[str]): The cipher keys to be scored.
+            encoded_text (np.ndarray): The cipher text encoded with
+            encode_text.
+            executor (Executor, optional): The executor scoring the
+            chunks. Defaults to None (score in the calling thread).
+            n_chunks (int, optional): The number of chunks the keys are
+            split in when an executor is given. Defaults to 1.
+            thresholds (Union[None, float, np.ndarray], optional): The
+            fitness each key must reach, or one fitness for all of
+            them. When given, keys are scored with score_bounded.
+            Defaults to None (score every key fully).
+
+        Returns:
+            np.ndarray: The fitness of every key, or -inf for the keys
+            found unable to reach their threshold.
+        """
+        def score(start: int, end: int) -> np.ndarray:
+            if thresholds is None:
+                return self.score_decoded(
+                    self.decode_keys(keys[start:end], encoded_text)
+                )
+            chunk_thresholds = np.broadcast_to(
+                np.asarray(thresholds, dtype=float), (len(keys),)
+            )[start:end]
+            return self.score_bounded(keys[start:end], encoded_text,
+                                      chunk_thresholds)
+
+        if executor is None or n_chunks <= 1 or len(keys) < 2 * n_chunks:
+            return score(0, len(keys))
+
+        bounds = np.linspace(0, len(keys), n_chunks + 1).astype(int)
+        scores = executor.map(score, bounds[:-1], bounds[1:])
+        return np.concatenate(list(scores))
 
     @property
     def ngram_type(self):
@@ -89,7 +439,11 @@ class Ngram:
 
     def generate_population(
         self, cipher_text: str,
-        n_population: int
+        n_population: int,
+        rng: Optional[np.random.Generator] = None,
+        executor: Optional[Executor] = None,
+        n_chunks: int = 1,
+        initial_keys: Optional[Sequence[CipherKey]] = None
     ) -> dict[CipherKey, float]:
         """Generate a population of random cipher keys and computes
         their fitness scores.
@@ -99,18 +453,27 @@ class Ngram:
             generated cipher keys.
             n_population (int): The number of cipher keys to generate in
             the population.
+            rng (np.random.Generator, optional): The random number
+            generator to be used. Defaults to None (module generator).
+            executor (Executor, optional): The executor scoring the
+            population in chunks. Defaults to None.
+            n_chunks (int, optional): The number of chunks scored
+            concurrently by the executor. Defaults to 1.
+            initial_keys (Sequence[CipherKey], optional): Cipher keys
+            placed in the population before the random ones. Defaults
+            to None.
 
         Returns:
-            dict[str, float]: _description_
+            dict[CipherKey, float]: The generated cipher keys and their
+            fitness scores.
         """
-        population = [random_cipher_key() for _ in range(n_population)]
+        population = list(initial_keys or [])[:n_population]
+        population += [random_cipher_key(rng)
+                       for _ in range(n_population - len(population))]
+        fitness = self.score_keys(population, self.encode_text(cipher_text),
+                                  executor, n_chunks)
 
-        population_fitness = {}
-        for key in population:
-            decipher_text = key.decode_cipher(cipher_text)
-            population_fitness[key] = self.compute_fitness(decipher_text)
-
-        return population_fitness
+        return dict(zip(population, fitness.tolist()))
 
     def ngram_count(self, text: str) -> int:
         """Count the number of n-grams in the given text.
@@ -150,15 +513,11 @@ def _ngrams_file_to_dictionary(
         dict[ngram, frequency]: A Python dictionary where keys are
         n-gram strings, and values are their corresponding frequencies.
     """
-    with open(file_path, "r") as file:
-        content = file.read()
-
-    ngram_strings = content.splitlines()
-
     ngrams_dictionary = {}
-    for ngram in ngram_strings:
-        ngram_pair = ngram.split(sep=sep)
-        ngrams_dictionary[ngram_pair[0]] = int(ngram_pair[1])
+    with open(file_path, "r") as file:
+        for ngram in file:
+            ngram_pair = ngram.split(sep=sep)
+            ngrams_dictionary[ngram_pair[0]] = int(ngram_pair[1])
 
     return ngrams_dictionary
 
@@ -203,14 +562,25 @@ def _ngrams_folder_to_dictionary_folder(
         output_path (Union[str, Path]): The path to the output folder where
         n-gram dictionaries will be saved.
     """
-    files = glob.iglob(os.path.join(source_folder, "*.txt"))
+    files = glob.iglob(os.path.join(source_folder, "english_*grams.txt"))
 
     for file in files:
         file_name = os.path.basename(file).split(".")[0]
 
         ngrams_dictionary = _ngrams_file_to_dictionary(file)
         prob_dictionary = _frequency_to_log_probability(ngrams_dictionary)
-        print(prob_dictionary)
+        ngram_len = len(next(iter(ngrams_dictionary)))
+
+        # High orders are saved as compact .npz entries, scored with a
+        # hashed table instead of a dense one
+        if ngram_len >= HASHED_MIN_LEN:
+            indices, values = Ngram._dictionary_entries(prob_dictionary,
+                                                        ngram_len)
+            save_entries(os.path.join(output_folder, f"{file_name}.npz"),
+                         indices, values, prob_dictionary["0"],
+                         prob_dictionary["fitness"])
+            continue
+
         file = os.path.join(output_folder, f"{file_name}.dict")
 
         with open(file, "wb") as file_out:
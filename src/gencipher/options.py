@@ -0,0 +1,82 @@
+"""Names of the options of the genetic algorithm.
+
+They are kept apart from the operators, so the command line can list
+the valid choices without importing NumPy.
+"""
+import enum
+from typing import Union
+
+
+class InputType(enum.Enum):
+    """Create a custom collection of name/values pairs.
+    It provides a method to retrieve the available values as strings.
+    """
+    @classmethod
+    def values(cls):
+        """Retrieve the values of the InputType enum class.
+
+        Returns:
+            Iterable[str]: An iterable containing the values of the
+            InputType enum as strings.
+        """
+        return [member.value for member in cls]
+
+
+class InvalidInputError(ValueError):
+    """Input doesn't match any valid values from the InputType"""
+    def __init__(
+        self,
+        var_name: str,
+        var: Union[InputType, str],
+        var_class: type[InputType]
+    ) -> None:
+        super().__init__(
+            f"Invalid {var_name}: {var}. It should be one of ["
+            + ", ".join(value for value in var_class.values()) + "]."
+        )
+
+
+class CrossoverType(InputType):
+    """Collection of available methods for genetic crossover."""
+    OX1 = "order-one"
+    PMX = "partially-mapped"
+    CX = "cycle"
+    FX = "full"
+    BFX = "full-batch"
+
+
+class MutationType(InputType):
+    """Collection of available methods for genetic mutation."""
+    INSERT = "insert"
+    SWAP = "swap"
+    INVERSION = "inversion"
+    SCRAMBLE = "scramble"
+
+
+class SeedingType(InputType):
+    """Collection of available methods to build the initial population
+    of a genetic algorithm.
+    """
+    RANDOM = "random"
+    FREQUENCY = "frequency"
+    WORD_PATTERN = "word-pattern"
+
+
+class EngineType(InputType):
+    """Collection of available ways to evolve the population of a
+    genetic algorithm.
+    """
+    GENERATIONAL = "generational"
+    STEADY_STATE = "steady-state"
+    BUFFERED = "buffered"
+
+
+class NgramType(InputType):
+    """Collection of available types of n-grams for genetic
+    algorithms.
+    """
+    MONOGRAM = "monogram"
+    BIGRAM = "bigram"
+    TRIGRAM = "trigram"
+    QUADGRAM = "quadgram"
+    QUINTGRAM = "quintgram"
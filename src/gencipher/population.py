@@ -0,0 +1,227 @@
+import heapq
+import string
+from typing import Iterator, Mapping, Sequence
+
+import numpy as np
+
+from gencipher.cipherkey import CipherKey
+from gencipher.ngram import Ngram
+
+_KEY_LEN = len(string.ascii_uppercase)
+
+
+class SteadyStatePopulation:
+    """Population kept as a min-heap on fitness, so the worst member is
+    found in O(1) and replaced in O(log n).
+
+    The fitness dictionary is updated in place, so it can be shared
+    with the genetic operators reading the population.
+    """
+    def __init__(self, population: dict[CipherKey, float]) -> None:
+        """Create a SteadyStatePopulation object.
+
+        Args:
+            population (dict[CipherKey, float]): The initial members and
+            their fitness, updated in place as children replace them.
+        """
+        self.fitness = population
+        self._heap = [(fitness, key) for key, fitness in population.items()]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def items(self) -> Iterator[tuple[CipherKey, float]]:
+        """Iterate over the members in heap order, which together with
+        the random number generator state determines the next samples.
+
+        Yields:
+            tuple[CipherKey, float]: Every member and its fitness.
+        """
+        for fitness, key in self._heap:
+            yield key, fitness
+
+    @property
+    def worst(self) -> tuple[CipherKey, float]:
+        """tuple[CipherKey, float]: The least fit member and its
+        fitness.
+        """
+        fitness, key = self._heap[0]
+        return key, fitness
+
+    def sample(self, rng: np.random.Generator) -> CipherKey:
+        """Draw a member uniformly at random.
+
+        Args:
+            rng (np.random.Generator): The random number generator to be
+            used.
+
+        Returns:
+            CipherKey: The drawn member.
+        """
+        return self._heap[rng.integers(len(self._heap))][1]
+
+    def offer(self, key: CipherKey, fitness: float) -> bool:
+        """Replace the worst member with a child fitter than it, unless
+        the child is already a member.
+
+        Args:
+            key (CipherKey): The child.
+            fitness (float): Its fitness.
+
+        Returns:
+            bool: Whether the child joined the population.
+        """
+        if key in self.fitness or fitness <= self._heap[0][0]:
+            return False
+        _, worst_key = heapq.heapreplace(self._heap, (fitness, key))
+        del self.fitness[worst_key]
+        self.fitness[key] = fitness
+        return True
+
+
+class BufferedPopulation(Mapping[CipherKey, float]):
+    """Population kept in two preallocated pairs of key and fitness
+    arrays. A generation writes its children into the spare pair, which
+    then becomes current, so memory does not grow with the population
+    dictionaries of the generational engine, nor across generations.
+
+    Rows may repeat a key; as a mapping it holds the distinct keys with
+    their fitness. Lookups scan the rows, except for the last key given
+    to remember.
+    """
+    def __init__(
+        self,
+        members: Sequence[tuple[CipherKey, float]],
+        n_rows: int
+    ) -> None:
+        """Create a BufferedPopulation object.
+
+        Args:
+            members (Sequence[tuple[CipherKey, float]]): The initial keys
+            and their fitness, repeated to fill every row if there are
+            fewer.
+            n_rows (int): The number of rows of each buffer.
+        """
+        self._codes = np.empty((2, n_rows, _KEY_LEN), dtype=np.uint8)
+        self._fitness = np.empty((2, n_rows))
+        self._current = 0
+        self._recent: dict[CipherKey, float] = {}
+
+        rows = [members[idx % len(members)] for idx in range(n_rows)]
+        self.codes[:] = _key_codes([key for key, _ in rows])
+        self.fitness[:] = [fitness for _, fitness in rows]
+
+    @property
+    def codes(self) -> np.ndarray:
+        """np.ndarray: The current keys, one row of alphabet positions
+        per member.
+        """
+        codes: np.ndarray = self._codes[self._current]
+        return codes
+
+    @property
+    def fitness(self) -> np.ndarray:
+        """np.ndarray: The fitness of every current row."""
+        fitness: np.ndarray = self._fitness[self._current]
+        return fitness
+
+    @property
+    def spare_codes(self) -> np.ndarray:
+        """np.ndarray: The key buffer the next generation is written
+        to.
+        """
+        codes: np.ndarray = self._codes[1 - self._current]
+        return codes
+
+    @property
+    def spare_fitness(self) -> np.ndarray:
+        """np.ndarray: The fitness buffer of the next generation."""
+        fitness: np.ndarray = self._fitness[1 - self._current]
+        return fitness
+
+    def swap(self) -> None:
+        """Make the spare buffers current, once the next generation is
+        written to them.
+        """
+        self._current = 1 - self._current
+        self._recent.clear()
+
+    def key(self, row: int) -> CipherKey:
+        """Get the key of a current row.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            CipherKey: The key.
+        """
+        return CipherKey((self.codes[row] + 65).tobytes().decode())
+
+    def rows(self) -> list[tuple[CipherKey, float]]:
+        """Get the key and fitness of every current row, duplicates
+        included, e.g. to rebuild the population exactly.
+
+        Returns:
+            list[tuple[CipherKey, float]]: The rows in order.
+        """
+        return [(self.key(row), fitness)
+                for row, fitness in enumerate(self.fitness.tolist())]
+
+    def remember(self, key: CipherKey, fitness: float) -> None:
+        """Cache the fitness of a key until the next call or swap, so
+        looking it up does not scan the rows.
+
+        Args:
+            key (CipherKey): A current member.
+            fitness (float): Its fitness.
+        """
+        self._recent = {key: fitness}
+
+    def _rows(self, key: str) -> np.ndarray:
+        return np.flatnonzero((self.codes == _key_codes([key])).all(axis=1))
+
+    def __getitem__(self, key: CipherKey) -> float:
+        if key in self._recent:
+            return self._recent[key]
+        rows = self._rows(key)
+        if len(rows) == 0:
+            raise KeyError(key)
+        return float(self.fitness[rows[0]])
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and len(self._rows(key)) > 0
+
+    def _distinct(self) -> np.ndarray:
+        # The first row of every distinct key, in row order
+        _, rows = np.unique(self.codes, axis=0, return_index=True)
+        return np.sort(rows)
+
+    def __iter__(self) -> Iterator[CipherKey]:
+        for row in self._distinct():
+            yield self.key(row)
+
+    def __len__(self) -> int:
+        return len(self._distinct())
+
+    def offer(self, key: CipherKey, fitness: float) -> bool:
+        """Replace the worst row with a key fitter than it, unless the
+        key is already a member.
+
+        Args:
+            key (CipherKey): The key.
+            fitness (float): Its fitness.
+
+        Returns:
+            bool: Whether the key joined the population.
+        """
+        worst = int(np.argmin(self.fitness))
+        if fitness <= self.fitness[worst] or key in self:
+            return False
+        self.codes[worst] = _key_codes([key])[0]
+        self.fitness[worst] = fitness
+        return True
+
+
+def _key_codes(keys: Sequence[str]) -> np.ndarray:
+    return Ngram.encode_text("".join(keys)).reshape(len(keys), _KEY_LEN)
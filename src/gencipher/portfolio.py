@@ -0,0 +1,370 @@
+"""Race several solver configurations on one cipher text.
+
+The configurations run side by side, in worker processes or
+interleaved generation by generation in the calling process. Those
+falling behind the leader are stopped, and the race ends as soon as one
+of them deciphers the text within tolerance.
+"""
+import time
+import queue
+import multiprocessing
+import multiprocessing.queues
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+from gencipher.cipherkey import CipherKey
+from gencipher.model import GeneticDecipher
+from gencipher.options import InputType
+
+
+CONFIG_PARAMS = ("ngram_type", "max_iter", "n_population", "mutation_type",
+                 "crossover_type", "mutation_rate", "crossover_rate",
+                 "max_evaluations", "seeding", "random_fraction", "engine",
+                 "niche_radius")
+DEFAULT_PORTFOLIO = (
+    {"ngram_type": "quadgram", "crossover_type": "full"},
+    {"ngram_type": "quadgram", "crossover_type": "full-batch",
+     "engine": "steady-state"},
+    {"ngram_type": "trigram", "crossover_type": "full-batch",
+     "seeding": "frequency"},
+    {"ngram_type": "quadgram", "crossover_type": "partially-mapped",
+     "mutation_type": "swap", "n_population": 300, "mutation_rate": 0.2,
+     "max_iter": 200},
+)
+_POLL_INTERVAL = 0.05
+
+# Progress queue and stop flags of the current worker process
+_worker: dict[str, Any] = {}
+
+
+class ConfigurationsError(ValueError):
+    """Inappropriate portfolio configurations."""
+    def __init__(self) -> None:
+        super().__init__("Invalid configurations. Must be a non-empty "
+                         "sequence of dictionaries with keys among ["
+                         + ", ".join(CONFIG_PARAMS) + "].")
+
+
+class RaceError(ValueError):
+    """Every configuration of a race failed."""
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("Every configuration failed: "
+                         + "; ".join(errors))
+
+
+class RaceStatus(InputType):
+    """Collection of the states of a configuration in a race."""
+    PENDING = "pending"
+    RUNNING = "running"
+    SOLVED = "solved"
+    STOPPED = "stopped"
+    FINISHED = "finished"
+    FAILED = "failed"
+
+
+@dataclass
+class Entry:
+    """A configuration of a race and its progress."""
+    config: dict[str, Any]
+    status: str = RaceStatus.PENDING.value
+    generations: int = 0
+    key: Optional[CipherKey] = None
+    fitness: float = -np.inf
+    evaluations: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class PortfolioResult:
+    """The outcome of a race."""
+    key: CipherKey
+    fitness: float
+    text: str
+    winner: int
+    solved: bool
+    time: float
+    entries: list[Entry] = field(default_factory=list)
+
+
+class _Race:
+    """Bookkeeping of a race, shared by the in-process and the
+    multiprocess schedulers.
+    """
+    def __init__(
+        self,
+        configurations: Sequence[dict[str, Any]],
+        tolerance: float,
+        margin: float,
+        grace: int
+    ) -> None:
+        self.entries = [Entry(dict(config)) for config in configurations]
+        self.tolerance = tolerance
+        self.margin = margin
+        self.grace = grace
+        self.winner: Optional[int] = None
+
+    def update(
+        self,
+        index: int,
+        key: str,
+        fitness: float,
+        evaluations: int
+    ) -> list[int]:
+        """Record a generation of a configuration.
+
+        Returns:
+            list[int]: The running configurations to stop, all of them
+            once the text is solved.
+        """
+        entry = self.entries[index]
+        entry.generations += 1
+        entry.evaluations = evaluations
+        if fitness > entry.fitness:
+            entry.key = CipherKey(str(key))
+            entry.fitness = fitness
+        if fitness >= 1 - self.tolerance and self.winner is None:
+            self.winner = index
+            entry.status = RaceStatus.SOLVED.value
+            return self._running()
+
+        leader = max(other.fitness for other in self.entries)
+        behind = [idx for idx in self._running()
+                  if self.entries[idx].generations >= self.grace
+                  and self.entries[idx].fitness < leader - self.margin]
+        for idx in behind:
+            self.entries[idx].status = RaceStatus.STOPPED.value
+        return behind
+
+    def finish(self, index: int, error: Optional[str] = None) -> None:
+        entry = self.entries[index]
+        if error is not None:
+            entry.status = RaceStatus.FAILED.value
+            entry.error = error
+        elif entry.status == RaceStatus.RUNNING.value:
+            entry.status = RaceStatus.FINISHED.value
+
+    def _running(self) -> list[int]:
+        return [idx for idx, entry in enumerate(self.entries)
+                if entry.status == RaceStatus.RUNNING.value]
+
+
+def _init_worker(progress: Any, stop_flags: Any) -> None:
+    _worker["progress"] = progress
+    _worker["stop_flags"] = stop_flags
+    _worker["gencipher"] = {}
+
+
+def _solve(
+    index: int,
+    config: dict[str, Any],
+    cipher_text: str,
+    params: dict[str, Any],
+    seed: np.random.SeedSequence
+) -> Optional[str]:
+    """Run a configuration in a worker process, reporting each
+    generation until it ends or is told to stop.
+
+    Returns:
+        Optional[str]: The error message if the configuration failed.
+    """
+    ngram_type = config.get("ngram_type", "quadgram")
+    try:
+        # Keep one GeneticDecipher per n-gram type, so the tables of a
+        # process are loaded once
+        gencipher = _worker["gencipher"].get(ngram_type)
+        if gencipher is None:
+            gencipher = GeneticDecipher(ngram_type)
+            _worker["gencipher"][ngram_type] = gencipher
+        gencipher.rng = np.random.default_rng(seed)
+
+        for key, fitness, _ in _decipher(gencipher, config, cipher_text,
+                                         params):
+            _worker["progress"].put((index, str(key), fitness,
+                                     gencipher.budget.evaluations))
+            if _worker["stop_flags"][index]:
+                break
+    # Errors are returned as text, as they may not survive unpickling
+    except (ValueError, TypeError, AttributeError) as error:
+        return str(error)
+    return None
+
+
+def _decipher(
+    gencipher: GeneticDecipher,
+    config: dict[str, Any],
+    cipher_text: str,
+    params: dict[str, Any]
+) -> Iterator[tuple[str, float, str]]:
+    config_params = {name: value for name, value in config.items()
+                     if name != "ngram_type"}
+    return gencipher.decipher_generator(cipher_text, **params,
+                                        **config_params)
+
+
+def race(
+    cipher_text: str,
+    configurations: Sequence[dict[str, Any]] = DEFAULT_PORTFOLIO,
+    tolerance: float = 0.02,
+    n_workers: Optional[int] = None,
+    margin: float = 0.1,
+    grace: int = 3,
+    max_time: Optional[float] = None,
+    cribs: Optional[dict[str, str]] = None,
+    seed: Optional[int] = None
+) -> PortfolioResult:
+    """Decipher a cryptogram by racing several solver configurations.
+
+    Args:
+        cipher_text (str): The cryptogram to be deciphered.
+        configurations (Sequence[dict[str, Any]], optional): The
+        configurations to race, as keyword arguments of GeneticDecipher
+        ("ngram_type") and decipher, listed in CONFIG_PARAMS. Defaults
+        to DEFAULT_PORTFOLIO.
+        tolerance (float, optional): The race ends when a configuration
+        gets a fitness percentage within this tolerance. Defaults to
+        0.02.
+        n_workers (int, optional): The number of worker processes, or
+        zero (0) to interleave the configurations in the calling
+        process. Configurations beyond n_workers wait for a free worker.
+        Defaults to None (one per configuration).
+        margin (float, optional): A configuration is stopped when its
+        best fitness percentage is more than margin below the leader's.
+        Defaults to 0.1.
+        grace (int, optional): The generations a configuration runs
+        before it can be stopped. Defaults to 3.
+        max_time (float, optional): The wall-clock budget in seconds of
+        every configuration. Defaults to None (unlimited).
+        cribs (dict[str, str], optional): Known plain text, as in
+        decipher. Defaults to None.
+        seed (int, optional): The seed of the configurations random
+        number generators. Defaults to None (fresh entropy).
+
+    Raises:
+        ConfigurationsError: Raised if configurations is empty or has
+        unknown parameters.
+        RaceError: Raised if every configuration failed, e.g. with an
+        invalid parameter value.
+
+    Returns:
+        PortfolioResult: The best key found, its fitness percentage and
+        deciphered text, the index of the configuration that found it,
+        whether it is within tolerance, the elapsed time and the
+        progress of every configuration.
+    """
+    if not configurations or any(name not in CONFIG_PARAMS
+                                 for config in configurations
+                                 for name in config):
+        raise ConfigurationsError()
+
+    start = time.perf_counter()
+    state = _Race(configurations, tolerance, margin, grace)
+    params = {"tolerance": tolerance, "max_time": max_time, "cribs": cribs}
+    seeds = np.random.SeedSequence(seed).spawn(len(configurations))
+    if n_workers == 0:
+        _race_in_process(state, cipher_text, params, seeds)
+    else:
+        _race_in_processes(state, cipher_text, params, seeds,
+                           n_workers or len(configurations))
+
+    keys = {idx: entry.key for idx, entry in enumerate(state.entries)
+            if entry.key is not None}
+    if not keys:
+        raise RaceError([str(entry.error) for entry in state.entries])
+    winner = (state.winner if state.winner is not None
+              else max(keys, key=lambda idx: state.entries[idx].fitness))
+    return PortfolioResult(key=keys[winner],
+                           fitness=state.entries[winner].fitness,
+                           text=keys[winner].decode_cipher(cipher_text),
+                           winner=winner,
+                           solved=state.winner is not None,
+                           time=time.perf_counter() - start,
+                           entries=state.entries)
+
+
+def _race_in_process(
+    state: _Race,
+    cipher_text: str,
+    params: dict[str, Any],
+    seeds: list[np.random.SeedSequence]
+) -> None:
+    generators: dict[int, tuple[GeneticDecipher, Iterator[Any]]] = {}
+    for idx, entry in enumerate(state.entries):
+        try:
+            gencipher = GeneticDecipher(entry.config.get("ngram_type",
+                                                         "quadgram"),
+                                        seed=seeds[idx])
+        except (ValueError, TypeError, AttributeError) as error:
+            state.finish(idx, str(error))
+            continue
+        entry.status = RaceStatus.RUNNING.value
+        generators[idx] = (gencipher, _decipher(gencipher, entry.config,
+                                                cipher_text, params))
+
+    while generators:
+        for idx in list(generators):
+            gencipher, generator = generators[idx]
+            if state.entries[idx].status != RaceStatus.RUNNING.value:
+                del generators[idx]
+                continue
+            try:
+                key, fitness, _ = next(generator)
+            except StopIteration:
+                state.finish(idx)
+                del generators[idx]
+                continue
+            except (ValueError, TypeError, AttributeError) as error:
+                state.finish(idx, str(error))
+                del generators[idx]
+                continue
+            state.update(idx, key, fitness, gencipher.budget.evaluations)
+
+
+def _race_in_processes(
+    state: _Race,
+    cipher_text: str,
+    params: dict[str, Any],
+    seeds: list[np.random.SeedSequence],
+    n_workers: int
+) -> None:
+    progress: multiprocessing.queues.Queue[tuple[int, str, float, int]] = (
+        multiprocessing.Queue()
+    )
+    stop_flags = multiprocessing.Array("b", len(state.entries), lock=False)
+    pending = deque(range(len(state.entries)))
+    running: dict[Future[Optional[str]], int] = {}
+
+    def handle(message: tuple[int, str, float, int]) -> None:
+        for idx in state.update(*message):
+            stop_flags[idx] = 1
+
+    with ProcessPoolExecutor(n_workers, initializer=_init_worker,
+                             initargs=(progress, stop_flags)) as executor:
+        while pending or running:
+            while (pending and len(running) < n_workers
+                   and state.winner is None):
+                idx = pending.popleft()
+                state.entries[idx].status = RaceStatus.RUNNING.value
+                running[executor.submit(_solve, idx,
+                                        state.entries[idx].config,
+                                        cipher_text, params,
+                                        seeds[idx])] = idx
+            if state.winner is not None:
+                pending.clear()
+
+            try:
+                handle(progress.get(timeout=_POLL_INTERVAL))
+            except queue.Empty:
+                pass
+            for future in [future for future in running if future.done()]:
+                state.finish(running.pop(future), future.result())
+
+        # Read the reports sent before the workers ended
+        while True:
+            try:
+                handle(progress.get(timeout=_POLL_INTERVAL))
+            except queue.Empty:
+                break
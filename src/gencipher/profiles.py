@@ -0,0 +1,102 @@
+import json
+import math
+from pathlib import Path
+from dataclasses import asdict, dataclass
+from typing import Any, Sequence, Union
+
+
+TUNABLE_PARAMS = ("max_iter", "n_population", "mutation_type",
+                  "crossover_type", "mutation_rate", "crossover_rate")
+DEFAULT_PARAMS: dict[str, Any] = {"max_iter": 20,
+                                  "n_population": 100,
+                                  "mutation_type": "scramble",
+                                  "crossover_type": "full",
+                                  "mutation_rate": 0.01,
+                                  "crossover_rate": 0.6}
+
+
+class ProfileError(ValueError):
+    """Inappropriate tuning profile."""
+    def __init__(self) -> None:
+        super().__init__("Invalid tuning profile. Must have at least one "
+                         "bucket, with a length greater than zero (0) and "
+                         "parameters among [" + ", ".join(TUNABLE_PARAMS)
+                         + "].")
+
+
+@dataclass
+class Bucket:
+    """The recommended decipher parameters for cipher texts of about a
+    given length, and how they performed while tuning.
+    """
+    length: int
+    params: dict[str, Any]
+    time: float = math.inf
+    success_rate: float = 0.0
+
+
+class TuningProfile:
+    def __init__(self, buckets: Sequence[Bucket]) -> None:
+        """Create a TuningProfile object.
+
+        Args:
+            buckets (Sequence[Bucket]): The recommended parameters per
+            cipher text length.
+
+        Raises:
+            ProfileError: Raised if there are no buckets, a length is not
+            positive or a parameter is not tunable.
+        """
+        if not buckets or any(bucket.length <= 0
+                              or set(bucket.params) - set(TUNABLE_PARAMS)
+                              for bucket in buckets):
+            raise ProfileError()
+        self.buckets = sorted(buckets, key=lambda bucket: bucket.length)
+
+    def params(self, length: int) -> dict[str, Any]:
+        """Get the parameters for a cipher text, from the bucket whose
+        length is nearest to its length on a logarithmic scale.
+
+        Args:
+            length (int): The length of the cipher text.
+
+        Returns:
+            dict[str, Any]: Every tunable parameter, with the defaults
+            filling those the bucket does not set.
+        """
+        length = max(length, 1)
+        bucket = min(self.buckets,
+                     key=lambda bucket: abs(math.log(bucket.length / length)))
+        return {**DEFAULT_PARAMS, **bucket.params}
+
+    def save(self, file_path: Union[str, Path]) -> None:
+        """Write the profile to a JSON file.
+
+        Args:
+            file_path (Union[str, Path]): The profile file.
+        """
+        with open(file_path, "w") as file_out:
+            json.dump({"buckets": [asdict(bucket)
+                                   for bucket in self.buckets]},
+                      file_out, indent=2)
+
+    @classmethod
+    def load(cls, file_path: Union[str, Path]) -> "TuningProfile":
+        """Read a profile written by save.
+
+        Args:
+            file_path (Union[str, Path]): The profile file.
+
+        Raises:
+            ProfileError: Raised if the file is not a valid profile.
+
+        Returns:
+            TuningProfile: The profile.
+        """
+        with open(file_path, "r") as file_in:
+            data = json.load(file_in)
+        try:
+            buckets = [Bucket(**bucket) for bucket in data["buckets"]]
+        except (KeyError, TypeError):
+            raise ProfileError()
+        return cls(buckets)
@@ -0,0 +1,20 @@
+from typing import Optional
+
+import numpy as np
+
+
+_default_rng = np.random.default_rng()
+
+
+def get_rng(rng: Optional[np.random.Generator] = None) -> np.random.Generator:
+    """Get the random number generator to be used by an operator.
+
+    Args:
+        rng (np.random.Generator, optional): The generator owned by the
+        caller. Defaults to None.
+
+    Returns:
+        np.random.Generator: rng, or the unseeded module generator when
+        rng is None.
+    """
+    return _default_rng if rng is None else rng
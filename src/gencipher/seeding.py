@@ -0,0 +1,181 @@
+import string
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from gencipher.cipherkey import CipherKey, random_cipher_key
+from gencipher.ngram import Ngram
+from gencipher.rng import get_rng
+
+
+ALPHABET_LEN = len(string.ascii_uppercase)
+MAX_SWAPS = 10
+
+
+class RandomFractionError(ValueError):
+    """Inappropriate random_fraction value."""
+    def __init__(self) -> None:
+        super().__init__("Invalid random_fraction value. Must be a number "
+                         "between zero (0) and one (1).")
+
+
+@lru_cache(maxsize=None)
+def _english_frequencies() -> tuple[np.ndarray, np.ndarray]:
+    monograms = 10 ** Ngram("monogram").table
+    bigrams = 10 ** Ngram("bigram").table.reshape(ALPHABET_LEN, ALPHABET_LEN)
+    return monograms / monograms.sum(), bigrams / bigrams.sum()
+
+
+def _bigram_distance(
+    key: np.ndarray,
+    cipher_bigrams: np.ndarray,
+    english_bigrams: np.ndarray
+) -> float:
+    # Row/column p of the deciphered bigram matrix is the row/column of
+    # the cipher letter key[p] in the cipher bigram matrix.
+    deciphered_bigrams = cipher_bigrams[np.ix_(key, key)]
+    return float(np.abs(deciphered_bigrams - english_bigrams).sum())
+
+
+def frequency_key(cipher_text: str) -> CipherKey:
+    """Build a cipher key by matching the frequency ranking of the
+    cipher text letters with the English monogram ranking, refined by
+    swapping letters while the bigram frequencies of the deciphered
+    text get closer to English (Jakobsen's method).
+
+    Args:
+        cipher_text (str): The cipher text to be deciphered.
+
+    Returns:
+        CipherKey: The frequency analysis cipher key.
+    """
+    english_monograms, english_bigrams = _english_frequencies()
+    encoded_text = Ngram.encode_text(cipher_text).astype(np.intp)
+
+    cipher_monograms = np.bincount(encoded_text, minlength=ALPHABET_LEN)
+    cipher_bigrams = np.bincount(
+        encoded_text[:-1] * ALPHABET_LEN + encoded_text[1:],
+        minlength=ALPHABET_LEN ** 2
+    ).reshape(ALPHABET_LEN, ALPHABET_LEN) / max(len(encoded_text) - 1, 1)
+
+    # Stable sorts keep alphabetical order among equally frequent letters
+    plain_ranking = np.argsort(-english_monograms, kind="stable")
+    cipher_ranking = np.argsort(-cipher_monograms, kind="stable")
+    key = np.empty(ALPHABET_LEN, dtype=np.intp)
+    key[plain_ranking] = cipher_ranking
+
+    distance = _bigram_distance(key, cipher_bigrams, english_bigrams)
+    for rank_gap in range(1, ALPHABET_LEN):
+        for rank in range(ALPHABET_LEN - rank_gap):
+            pos1 = plain_ranking[rank]
+            pos2 = plain_ranking[rank + rank_gap]
+            key[pos1], key[pos2] = key[pos2], key[pos1]
+            new_distance = _bigram_distance(key, cipher_bigrams,
+                                            english_bigrams)
+            if new_distance < distance:
+                distance = new_distance
+            else:
+                key[pos1], key[pos2] = key[pos2], key[pos1]
+
+    return CipherKey("".join(string.ascii_uppercase[idx] for idx in key))
+
+
+def apply_mapping(key: CipherKey, mapping: dict[str, str]) -> CipherKey:
+    """Swap letters of a cipher key until it deciphers every cipher
+    letter of a partial mapping as the given plain letter.
+
+    Args:
+        key (CipherKey): The cipher key to be adjusted.
+        mapping (dict[str, str]): The mapping of uppercase cipher
+        letters to uppercase plain letters.
+
+    Returns:
+        CipherKey: The adjusted cipher key.
+    """
+    key_list = list(key.upper())
+    for cipher_letter, plain_letter in mapping.items():
+        pos1 = string.ascii_uppercase.index(plain_letter)
+        pos2 = key_list.index(cipher_letter)
+        key_list[pos1], key_list[pos2] = key_list[pos2], key_list[pos1]
+    return CipherKey("".join(key_list))
+
+
+def perturb_key(
+    key: CipherKey,
+    n_swaps: int,
+    max_rank_gap: int = 3,
+    rng: Optional[np.random.Generator] = None
+) -> CipherKey:
+    """Swap random pairs of letters of a cipher key whose plain letters
+    have a similar frequency in English, the usual mistakes of
+    frequency analysis.
+
+    Args:
+        key (CipherKey): The cipher key to be perturbed.
+        n_swaps (int): The number of swaps.
+        max_rank_gap (int, optional): The maximum distance between the
+        English frequency ranks of two swapped letters. Defaults to 3.
+        rng (np.random.Generator, optional): The random number
+        generator to be used. Defaults to None (module generator).
+
+    Returns:
+        CipherKey: The perturbed cipher key.
+    """
+    rng = get_rng(rng)
+    english_monograms, _ = _english_frequencies()
+    plain_ranking = np.argsort(-english_monograms, kind="stable")
+
+    key_list = list(key)
+    for _ in range(n_swaps):
+        rank1 = rng.integers(ALPHABET_LEN)
+        rank2 = np.clip(rank1 + rng.integers(-max_rank_gap, max_rank_gap + 1),
+                        0, ALPHABET_LEN - 1)
+        pos1, pos2 = plain_ranking[rank1], plain_ranking[rank2]
+        key_list[pos1], key_list[pos2] = key_list[pos2], key_list[pos1]
+    return CipherKey("".join(key_list))
+
+
+def seed_keys(
+    baseline: CipherKey,
+    n_keys: int,
+    random_fraction: float = 0.2,
+    rng: Optional[np.random.Generator] = None,
+    mapping: Optional[dict[str, str]] = None
+) -> list[CipherKey]:
+    """Build an initial population around a baseline cipher key.
+
+    The population holds the baseline itself, random keys for
+    random_fraction of it, and perturbations of the baseline with one
+    to MAX_SWAPS swaps for the rest. When a partial mapping is given,
+    the perturbations are adjusted to keep it.
+
+    Args:
+        baseline (CipherKey): The cipher key the population is built
+        around.
+        n_keys (int): The number of cipher keys to build.
+        random_fraction (float, optional): The fraction of fully random
+        cipher keys, kept for diversity. Defaults to 0.2.
+        rng (np.random.Generator, optional): The random number
+        generator to be used. Defaults to None (module generator).
+        mapping (dict[str, str], optional): A partial mapping of
+        uppercase cipher letters to uppercase plain letters kept by the
+        perturbed keys. Defaults to None.
+
+    Returns:
+        list[CipherKey]: The initial population.
+    """
+    if not 0 <= random_fraction <= 1:
+        raise RandomFractionError()
+
+    rng = get_rng(rng)
+    n_random = round(n_keys * random_fraction)
+    n_perturbed = max(n_keys - n_random - 1, 0)
+
+    keys = [baseline] if n_keys > n_random else []
+    for _ in range(n_perturbed):
+        n_swaps = int(rng.integers(1, MAX_SWAPS + 1))
+        key = perturb_key(baseline, n_swaps, rng=rng)
+        keys.append(apply_mapping(key, mapping) if mapping else key)
+    keys += [random_cipher_key(rng) for _ in range(n_random)]
+    return keys
@@ -0,0 +1,432 @@
+"""Serve GeneticDecipher over HTTP on the local machine.
+
+The n-gram tables are loaded once and shared by a fixed pool of worker
+threads, each with its own GeneticDecipher. Requests wait in a bounded
+queue; when it is full, new requests are rejected with 503 so clients
+back off instead of piling up.
+
+    python -m gencipher.service --port 8000 --workers 4
+
+Endpoints:
+    POST /decipher: A JSON object with a "cipher_text", optional
+    decipher parameters (e.g. "cribs", "max_iter") and an optional
+    "deadline" in seconds, counted from submission. Answers 202 with
+    the job, 400 if invalid or 503 if the queue is full.
+    GET /jobs/<id>: The job status and the best key, fitness and text
+    of its latest generation. With ?wait=<seconds>, answers once the
+    job finishes or the time runs out.
+    GET /health: The number of workers and queued jobs.
+"""
+import json
+import time
+import queue
+import uuid
+import argparse
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, Sequence, Union
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from gencipher.budget import BudgetValueError
+from gencipher.cache import ResultCache
+from gencipher.model import GeneticDecipher, N_Threads_Error
+from gencipher.ngram import Ngram, ScoresNotFoundError, scores_file
+from gencipher.options import InputType, NgramType
+
+
+DECIPHER_PARAMS = ("max_iter", "tolerance", "n_population", "mutation_type",
+                   "crossover_type", "mutation_rate", "crossover_rate",
+                   "max_time", "max_evaluations", "seeding",
+                   "random_fraction", "cribs", "engine", "niche_radius")
+MAX_BODY_SIZE = 1 << 20
+
+
+class QueueSizeError(ValueError):
+    """Inappropriate queue_size value."""
+    def __init__(self) -> None:
+        super().__init__("Invalid queue_size value. Must be an integer "
+                         "greater than zero (0).")
+
+
+class RequestParamError(ValueError):
+    """Unknown decipher request parameter."""
+    def __init__(self, name: str) -> None:
+        super().__init__(f"Invalid request parameter: {name}. It should be "
+                         "one of [cipher_text, deadline, "
+                         + ", ".join(DECIPHER_PARAMS) + "].")
+
+
+class JobStatus(InputType):
+    """Collection of the states of a decipher job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    EXPIRED = "expired"
+
+
+@dataclass
+class Job:
+    """A decipher request and the progress of its run."""
+    id: str
+    cipher_text: str
+    params: dict[str, Any]
+    deadline: Optional[float] = None
+    status: str = JobStatus.QUEUED.value
+    generation: int = 0
+    key: Optional[str] = None
+    fitness: Optional[float] = None
+    text: Optional[str] = None
+    evaluations: int = 0
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.perf_counter)
+    finished: threading.Event = field(default_factory=threading.Event)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Convert the job into the JSON object served by the API.
+
+        Returns:
+            dict[str, Any]: The job id, status, generation count, best
+            key, fitness percentage, deciphered text, evaluations and
+            error message.
+        """
+        return {"id": self.id, "status": self.status,
+                "generation": self.generation, "key": self.key,
+                "fitness": self.fitness, "text": self.text,
+                "evaluations": self.evaluations, "error": self.error}
+
+
+class DecipherService:
+    """Pool of worker threads solving queued decipher jobs.
+
+    The workers share one Ngram object, so its tables are loaded once
+    and stay warm between requests. NumPy releases the GIL while
+    scoring, which is most of the work of a run.
+    """
+    def __init__(
+        self,
+        ngram_type: str = "quadgram",
+        n_workers: int = 1,
+        queue_size: int = 16,
+        max_jobs: int = 1000,
+        seed: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+        key_library: Union[None, str, Path, Sequence[str]] = None,
+        scores_folder: Union[None, str, Path] = None
+    ) -> None:
+        """Create a DecipherService object. The workers are started by
+        start, or on entering the service as a context manager.
+
+        Args:
+            ngram_type (str, optional): The type of n-gram used to score
+            keys. Defaults to "quadgram".
+            n_workers (int, optional): The number of worker threads.
+            Defaults to 1.
+            queue_size (int, optional): The maximum number of jobs
+            waiting for a worker. Defaults to 16.
+            max_jobs (int, optional): The number of finished jobs kept
+            for clients to fetch; the oldest are forgotten first.
+            Defaults to 1000.
+            seed (int, optional): The seed of the worker random number
+            generators. Defaults to None (fresh entropy).
+            cache (ResultCache, optional): A store of solved cipher
+            texts shared by the workers. Defaults to None.
+            key_library (Union[None, str, Path, Sequence[str]],
+            optional): Previously recovered cipher keys, or a text file
+            with one key per line. Defaults to None.
+            scores_folder (Union[None, str, Path], optional): The folder
+            of the n-gram scores. Defaults to None (the packaged
+            scores).
+
+        Raises:
+            N_Threads_Error: Raised if n_workers is not greater than
+            zero (0).
+            QueueSizeError: Raised if queue_size is not greater than
+            zero (0).
+        """
+        if n_workers <= 0:
+            raise N_Threads_Error
+        if queue_size <= 0:
+            raise QueueSizeError()
+
+        ngram = Ngram(ngram_type, scores_folder)
+        ngram.ngram_table  # build the table before the workers share it
+        seeds = np.random.SeedSequence(seed).spawn(n_workers)
+        self.workers = [GeneticDecipher(ngram, seed=worker_seed,
+                                        cache=cache, key_library=key_library)
+                        for worker_seed in seeds]
+        self.max_jobs = max_jobs
+        self._queue: queue.Queue[Optional[Job]] = queue.Queue(queue_size)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        if self._threads:
+            return
+        self._threads = [threading.Thread(target=self._work, args=(gencipher,),
+                                          daemon=True)
+                         for gencipher in self.workers]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Let the workers finish the queued jobs, then stop them."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self) -> "DecipherService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def queued(self) -> int:
+        """int: The number of jobs waiting for a worker."""
+        return self._queue.qsize()
+
+    def submit(
+        self,
+        cipher_text: str,
+        deadline: Optional[float] = None,
+        **params: Any
+    ) -> Job:
+        """Queue a cipher text to be deciphered.
+
+        Args:
+            cipher_text (str): The cryptogram to be deciphered.
+            deadline (float, optional): The seconds, from now, after
+            which the run stops with the best key found so far. A job
+            still queued by then is not run. Defaults to None (no
+            deadline).
+            **params: The keyword arguments of
+            GeneticDecipher.decipher, listed in DECIPHER_PARAMS.
+
+        Raises:
+            RequestParamError: Raised if a parameter is not a decipher
+            parameter.
+            BudgetValueError: Raised if deadline is not greater than
+            zero (0).
+            queue.Full: Raised if the queue is full.
+
+        Returns:
+            Job: The queued job.
+        """
+        for name in params:
+            if name not in DECIPHER_PARAMS:
+                raise RequestParamError(name)
+        if deadline is not None and deadline <= 0:
+            raise BudgetValueError("deadline")
+
+        job = Job(uuid.uuid4().hex, cipher_text, params)
+        if deadline is not None:
+            job.deadline = job.submitted + deadline
+        with self._lock:
+            self._queue.put_nowait(job)
+            self._jobs[job.id] = job
+            self._forget_jobs()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job.
+
+        Args:
+            job_id (str): The job id.
+
+        Returns:
+            Optional[Job]: The job, or None if it is unknown or was
+            forgotten.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _forget_jobs(self) -> None:
+        excess = len(self._jobs) - self.max_jobs
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].finished.is_set():
+                del self._jobs[job_id]
+                excess -= 1
+
+    def _work(self, gencipher: GeneticDecipher) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            # Any failure ends the job, not the worker, and always
+            # releases the clients waiting for it
+            try:
+                self._run(gencipher, job)
+            except Exception as error:
+                job.error = f"{type(error).__name__}: {error}"
+                job.status = JobStatus.FAILED.value
+            finally:
+                job.finished.set()
+
+    def _run(self, gencipher: GeneticDecipher, job: Job) -> None:
+        params = dict(job.params)
+        if job.deadline is not None:
+            remaining = job.deadline - time.perf_counter()
+            if remaining <= 0:
+                job.status = JobStatus.EXPIRED.value
+                return
+            max_time = params.get("max_time")
+            params["max_time"] = (remaining if max_time is None
+                                  else min(max_time, remaining))
+
+        job.status = JobStatus.RUNNING.value
+        try:
+            for key, fitness, text in gencipher.decipher_generator(
+                job.cipher_text, **params
+            ):
+                with self._lock:
+                    job.generation += 1
+                    job.key = key
+                    job.fitness = float(fitness)
+                    job.text = text
+                    job.evaluations = gencipher.budget.evaluations
+        except (ValueError, TypeError, AttributeError) as error:
+            job.error = str(error)
+            job.status = JobStatus.FAILED.value
+            return
+        job.status = JobStatus.DONE.value
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "DecipherServer"
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path != "/decipher":
+            self._send(404, {"error": "Not found."})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_SIZE:
+            self._send(413, {"error": "Request body too large."})
+            return
+        try:
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request.get("cipher_text"), str):
+                raise ValueError("missing \"cipher_text\" string")
+            job = self.server.service.submit(**request)
+        except queue.Full:
+            self._send(503, {"error": "Queue full, retry later."},
+                       {"Retry-After": "1"})
+            return
+        except (ValueError, TypeError, AttributeError) as error:
+            self._send(400, {"error": f"Invalid request: {error}"})
+            return
+        self._send(202, job.as_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            service = self.server.service
+            self._send(200, {"workers": len(service.workers),
+                             "queued": service.queued})
+            return
+
+        job = None
+        if url.path.startswith("/jobs/"):
+            job = self.server.service.get(url.path[len("/jobs/"):])
+        if job is None:
+            self._send(404, {"error": "Not found."})
+            return
+        try:
+            wait = float(parse_qs(url.query).get("wait", ["0"])[0])
+        except ValueError:
+            self._send(400, {"error": "Invalid wait value."})
+            return
+        if wait > 0:
+            job.finished.wait(wait)
+        self._send(200, job.as_dict())
+
+    def _send(
+        self,
+        status: int,
+        body: dict[str, Any],
+        headers: Optional[dict[str, str]] = None
+    ) -> None:
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class DecipherServer(ThreadingHTTPServer):
+    """HTTP server of a DecipherService. Each connection is handled by
+    its own thread, so polling clients never wait for the workers.
+    """
+    daemon_threads = True
+
+    def __init__(
+        self,
+        service: DecipherService,
+        address: tuple[str, int] = ("127.0.0.1", 8000)
+    ) -> None:
+        """Create a DecipherServer object.
+
+        Args:
+            service (DecipherService): The service answering requests.
+            address (tuple[str, int], optional): The host and port to
+            listen on; port zero (0) picks a free port. Defaults to
+            ("127.0.0.1", 8000).
+        """
+        self.service = service
+        super().__init__(address, _Handler)
+
+
+def main(argv=None):  # pragma: no cover
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--ngram-type", default="quadgram",
+                        choices=NgramType.values())
+    parser.add_argument("--scores-folder", default=None,
+                        help="Folder of n-gram scores built by python -m "
+                             "gencipher.builder. Defaults to the packaged "
+                             "scores.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cache", default=None,
+                        help="SQLite result cache file.")
+    parser.add_argument("--key-library", default=None,
+                        help="Text file of known keys, one per line.")
+    args = parser.parse_args(argv)
+    try:
+        scores_file(args.ngram_type, args.scores_folder)
+    except ScoresNotFoundError as error:
+        parser.error(str(error))
+
+    cache = None if args.cache is None else ResultCache(args.cache)
+    service = DecipherService(args.ngram_type, args.workers, args.queue_size,
+                              seed=args.seed, cache=cache,
+                              key_library=args.key_library,
+                              scores_folder=args.scores_folder)
+    with service, DecipherServer(service, (args.host, args.port)) as server:
+        print(f"Serving on http://{args.host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,241 @@
+"""Exchange populations between processes through shared memory.
+
+A SharedPopulation lays out in one shared memory block the dense n-gram
+table, the encoded cipher text, and a matrix of cipher keys with their
+fitness. Worker processes attach to it by name through its small,
+picklable spec, so generations are read and written in place instead of
+pickling populations and n-gram tables for every exchange.
+
+It is a building block for process-parallel scoring: none of the
+GeneticDecipher engines use it, they score in the calling process. A
+caller that evolves its own population writes each generation, scores
+it with score_parallel and reads the fitness back.
+"""
+import string
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+from concurrent.futures import Executor
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+from gencipher.cipherkey import CipherKey
+from gencipher.ngram import Ngram
+
+_KEY_LEN = len(string.ascii_uppercase)
+
+# SharedPopulation attached by the current worker process, at most one
+_attached: dict[str, "SharedPopulation"] = {}
+
+
+class SlotsError(ValueError):
+    """Inappropriate population slots."""
+    def __init__(self) -> None:
+        super().__init__("Invalid slots. The keys must fit in the shared "
+                         "population, which has at least one (1) slot.")
+
+
+@dataclass(frozen=True)
+class SharedSpec:
+    """What a process needs to attach to a SharedPopulation."""
+    name: str
+    ngram_type: str
+    floor: float
+    fitness: float
+    table_size: int
+    text_size: int
+    n_slots: int
+
+
+def _layout(spec: SharedSpec) -> dict[str, tuple[int, Any, tuple[int, ...]]]:
+    # Offset, dtype and shape of every array, float64 arrays first so
+    # they stay aligned
+    shapes = {"table": (np.float64, (spec.table_size,)),
+              "fitness": (np.float64, (spec.n_slots,)),
+              "keys": (np.uint8, (spec.n_slots, _KEY_LEN)),
+              "text": (np.uint8, (spec.text_size,))}
+    layout = {}
+    offset = 0
+    for name, (dtype, shape) in shapes.items():
+        layout[name] = (offset, dtype, shape)
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return layout
+
+
+class SharedPopulation:
+    """Population of cipher keys, n-gram table and encoded cipher text
+    in shared memory.
+
+    The process that creates it owns the block and must unlink it; the
+    others only close it. Use create and attach rather than the
+    constructor.
+    """
+    def __init__(
+        self,
+        spec: SharedSpec,
+        memory: shared_memory.SharedMemory,
+        owner: bool
+    ) -> None:
+        self.spec = spec
+        self._memory = memory
+        self._owner = owner
+        arrays = {name: np.ndarray(shape, dtype, memory.buf, offset)
+                  for name, (offset, dtype, shape) in _layout(spec).items()}
+        self.table: np.ndarray = arrays["table"]
+        self.fitness: np.ndarray = arrays["fitness"]
+        self.keys: np.ndarray = arrays["keys"]
+        self.encoded_text: np.ndarray = arrays["text"]
+        self.ngram = Ngram.from_table(spec.ngram_type, self.table,
+                                      spec.floor, spec.fitness)
+
+    @classmethod
+    def create(
+        cls,
+        ngram: Ngram,
+        cipher_text: str,
+        n_slots: int
+    ) -> "SharedPopulation":
+        """Allocate a shared population and copy the n-gram table and
+        encoded cipher text into it.
+
+        Args:
+            ngram (Ngram): The n-gram scorer whose dense table is
+            shared.
+            cipher_text (str): The cipher text deciphered by the keys.
+            n_slots (int): The number of keys the population holds.
+
+        Raises:
+            SlotsError: Raised if n_slots is not positive.
+
+        Returns:
+            SharedPopulation: The population, with every fitness -inf
+            until keys are written.
+        """
+        if n_slots <= 0:
+            raise SlotsError()
+        encoded_text = ngram.encode_text(cipher_text)
+        spec = SharedSpec("", ngram.ngram_type, ngram.scores["0"],
+                          ngram.scores["fitness"], len(ngram.table),
+                          len(encoded_text), n_slots)
+        offset, _, _ = _layout(spec)["text"]
+        memory = shared_memory.SharedMemory(create=True,
+                                            size=offset + len(encoded_text))
+        spec = replace(spec, name=memory.name)
+
+        population = cls(spec, memory, owner=True)
+        population.table[:] = ngram.table
+        population.encoded_text[:] = encoded_text
+        population.fitness[:] = -np.inf
+        return population
+
+    @classmethod
+    def attach(cls, spec: SharedSpec) -> "SharedPopulation":
+        """Map a shared population created by another process.
+
+        Args:
+            spec (SharedSpec): The spec of the population.
+
+        Returns:
+            SharedPopulation: A view of the same memory.
+        """
+        return cls(spec, shared_memory.SharedMemory(spec.name), owner=False)
+
+    def __len__(self) -> int:
+        return self.spec.n_slots
+
+    def __enter__(self) -> "SharedPopulation":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the mapping, and free the block if this process
+        created it. The arrays must not be used afterwards.
+        """
+        del self.table, self.fitness, self.keys, self.encoded_text
+        del self.ngram
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def write(
+        self,
+        population: Mapping[CipherKey, float],
+        start: int = 0
+    ) -> None:
+        """Store keys and their fitness in consecutive slots.
+
+        Args:
+            population (Mapping[CipherKey, float]): The keys and their
+            fitness, e.g. -inf for keys still to be scored.
+            start (int, optional): The first slot. Defaults to 0.
+
+        Raises:
+            SlotsError: Raised if the keys do not fit from start.
+        """
+        stop = start + len(population)
+        if start < 0 or stop > self.spec.n_slots:
+            raise SlotsError()
+        if not population:
+            return
+        self.keys[start:stop] = Ngram.encode_text(
+            "".join(population)
+        ).reshape(-1, _KEY_LEN)
+        self.fitness[start:stop] = list(population.values())
+
+    def read(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> dict[CipherKey, float]:
+        """Get the keys and fitness of a range of slots.
+
+        Args:
+            start (int, optional): The first slot. Defaults to 0.
+            stop (int, optional): The slot after the last one. Defaults
+            to None (every slot from start).
+
+        Returns:
+            dict[CipherKey, float]: The keys and their fitness.
+        """
+        letters = (self.keys[start:stop] + 65).tobytes().decode()
+        return {CipherKey(letters[idx:idx + _KEY_LEN]): fitness
+                for idx, fitness in zip(range(0, len(letters), _KEY_LEN),
+                                        self.fitness[start:stop].tolist())}
+
+    def score(self, start: int = 0, stop: Optional[int] = None) -> None:
+        """Score the keys of a range of slots in place.
+
+        Args:
+            start (int, optional): The first slot. Defaults to 0.
+            stop (int, optional): The slot after the last one. Defaults
+            to None (every slot from start).
+        """
+        self.fitness[start:stop] = self.ngram.score_codes(
+            self.keys[start:stop], self.encoded_text
+        )
+
+    def score_parallel(self, executor: Executor, n_chunks: int) -> None:
+        """Score every slot in chunks, each by a worker of a process
+        pool attached to this population. Only the slot bounds cross
+        the process boundary.
+
+        Args:
+            executor (Executor): The pool scoring the chunks.
+            n_chunks (int): The number of chunks.
+        """
+        bounds = np.linspace(0, self.spec.n_slots, n_chunks + 1).astype(int)
+        list(executor.map(_score_slots, [self.spec] * n_chunks,
+                          bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _score_slots(spec: SharedSpec, start: int, stop: int) -> None:
+    # Workers attach once and keep the mapping for later calls, until
+    # they score another population
+    if spec.name not in _attached:
+        for population in _attached.values():
+            population.close()
+        _attached.clear()
+        _attached[spec.name] = SharedPopulation.attach(spec)
+    _attached[spec.name].score(start, stop)
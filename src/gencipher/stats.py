@@ -0,0 +1,190 @@
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, MutableSequence, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from gencipher.diversity import PopulationDiversity
+
+
+PHASES = ("selection", "crossover", "mutation", "decoding", "fitness")
+
+
+@dataclass
+class GenerationStats:
+    """Measurements of a single generation of the genetic algorithm.
+
+    Phase timings are exclusive: the time spent decoding and scoring
+    inside a full crossover (FX) is charged to the decoding and fitness
+    phases, not to crossover.
+    """
+    generation: int
+    selection: float = 0.0
+    crossover: float = 0.0
+    mutation: float = 0.0
+    decoding: float = 0.0
+    fitness: float = 0.0
+    evaluations: int = 0
+    diversity: float = 0.0
+    entropy: float = 0.0
+    mean_distance: float = 0.0
+    min_distance: float = 0.0
+    best_fitness: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Convert the generation stats into a plain dictionary.
+
+        Returns:
+            dict[str, Any]: The generation stats, keyed by field name.
+        """
+        return asdict(self)
+
+
+def _zero_totals() -> dict[str, float]:
+    return {**{phase: 0.0 for phase in PHASES}, "evaluations": 0}
+
+
+@dataclass
+class DecipherStats:
+    """Per-generation measurements of a decipher run.
+
+    The generations may be a bounded deque keeping only the latest
+    ones; the totals still cover every generation added.
+    """
+    generations: MutableSequence[GenerationStats] = field(
+        default_factory=list
+    )
+    _totals: dict[str, float] = field(default_factory=_zero_totals,
+                                      init=False, repr=False)
+
+    def add(self, generation: GenerationStats) -> None:
+        """Append the stats of a finished generation.
+
+        Args:
+            generation (GenerationStats): The stats of the generation.
+        """
+        self.generations.append(generation)
+        for phase in PHASES:
+            self._totals[phase] += getattr(generation, phase)
+        self._totals["evaluations"] += generation.evaluations
+
+    def totals(self) -> dict[str, float]:
+        """Aggregate the phase timings and evaluations of all
+        generations.
+
+        Returns:
+            dict[str, float]: The total seconds spent in each phase and
+            the total number of fitness evaluations.
+        """
+        return dict(self._totals)
+
+
+class _Phase:
+    """Reusable context manager timing one phase of a Recorder."""
+    __slots__ = ("recorder", "name")
+
+    def __init__(self, recorder: "Recorder", name: str) -> None:
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.recorder._push(self.name)
+
+    def __exit__(self, *exc: object) -> None:
+        self.recorder._pop()
+
+
+class Recorder:
+    """Collect exclusive phase timings of a decipher run.
+
+    Nested phases pause the enclosing one, so every second is charged
+    to exactly one phase.
+    """
+    def __init__(
+        self,
+        callback: Optional[Callable[[GenerationStats], None]] = None,
+        max_generations: Optional[int] = None
+    ) -> None:
+        """Create a Recorder object.
+
+        Args:
+            callback (Callable[[GenerationStats], None], optional): A
+            function called with the stats of every finished generation,
+            e.g. to export them to a metrics system. Defaults to None.
+            max_generations (int, optional): The number of latest
+            generations kept in the stats. Defaults to None (keep every
+            generation).
+        """
+        self.callback = callback
+        self.stats = DecipherStats(
+            [] if max_generations is None else deque(maxlen=max_generations)
+        )
+        self._phases = {name: _Phase(self, name) for name in PHASES}
+        self._stack: list[list[Any]] = []
+        self._current = GenerationStats(generation=1)
+
+    def phase(self, name: str) -> _Phase:
+        """Get the context manager timing a phase.
+
+        Args:
+            name (str): One of the names in PHASES.
+
+        Returns:
+            _Phase: A context manager adding its elapsed time to the
+            phase of the current generation.
+        """
+        return self._phases[name]
+
+    def _push(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1])
+        self._stack.append([name, now])
+
+    def _pop(self) -> None:
+        now = time.perf_counter()
+        name, start = self._stack.pop()
+        self._add(name, now - start)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _add(self, name: str, seconds: float) -> None:
+        setattr(self._current, name, getattr(self._current, name) + seconds)
+
+    def end_generation(
+        self,
+        evaluations: int,
+        diversity: float,
+        best_fitness: float,
+        population_diversity: Optional["PopulationDiversity"] = None
+    ) -> GenerationStats:
+        """Close the current generation and start the next one.
+
+        Args:
+            evaluations (int): The fitness evaluations performed during
+            the generation.
+            diversity (float): The fraction of distinct keys in the
+            population.
+            best_fitness (float): The best fitness found so far.
+            population_diversity (PopulationDiversity, optional): The
+            position entropy and Hamming distances of the population.
+            Defaults to None (recorded as zeros).
+
+        Returns:
+            GenerationStats: The stats of the finished generation.
+        """
+        finished = self._current
+        finished.evaluations = evaluations
+        finished.diversity = diversity
+        finished.best_fitness = best_fitness
+        if population_diversity is not None:
+            finished.entropy = population_diversity.entropy
+            finished.mean_distance = population_diversity.mean_distance
+            finished.min_distance = population_diversity.min_distance
+        self.stats.add(finished)
+        self._current = GenerationStats(generation=finished.generation + 1)
+
+        if self.callback is not None:
+            self.callback(finished)
+        return finished
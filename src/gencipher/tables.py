@@ -0,0 +1,270 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from gencipher.options import InputType, InvalidInputError
+
+
+_HASH_MULTIPLIER = np.uint64(0x9E3779B1)
+
+
+class TableFormat(InputType):
+    """Collection of available memory layouts of n-gram score tables."""
+    DENSE = "dense"
+    INT16 = "int16"
+    UINT8 = "uint8"
+    HASHED = "hashed"
+
+
+class NgramTable(ABC):
+    """Base class for n-gram score tables, mapping the base-26 index of
+    every n-gram to its log probability.
+    """
+    floor: float
+
+    @abstractmethod
+    def score(self, indices: np.ndarray) -> np.ndarray:  # pragma: no cover
+        """Sum the scores of the n-grams of several texts.
+
+        Args:
+            indices (np.ndarray): A matrix with one row per text holding
+            the base-26 indices of its n-grams.
+
+        Returns:
+            np.ndarray: The fitness of every text.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:  # pragma: no cover
+        """int: The memory used by the table arrays."""
+        pass
+
+
+class DenseTable(NgramTable):
+    """Float64 table with an entry for every possible n-gram."""
+    def __init__(self, values: np.ndarray, floor: float) -> None:
+        self.values = values
+        self.floor = floor
+
+    def score(self, indices: np.ndarray) -> np.ndarray:
+        fitness: np.ndarray = np.take(self.values, indices).sum(axis=1)
+        return fitness
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.values.nbytes)
+
+
+class _Quantizer:
+    """Affine mapping of log probabilities to integer codes, where the
+    smallest code is the floor score.
+    """
+    def __init__(self, values: np.ndarray, floor: float, dtype: type) -> None:
+        info = np.iinfo(dtype)
+        top = max(float(values.max(initial=floor)), floor)
+        self.dtype = dtype
+        self.scale = (top - floor) / (info.max - info.min) or 1.0
+        self.offset = floor - info.min * self.scale
+        self.floor_code = info.min
+
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        codes = np.rint((values - self.offset) / self.scale)
+        return codes.astype(self.dtype)
+
+    def decode_sums(self, sums: np.ndarray, count: int) -> np.ndarray:
+        return sums * self.scale + count * self.offset
+
+
+class QuantizedTable(NgramTable):
+    """Dense table of int16 or uint8 codes. A quadgram table takes 914 KB
+    as int16 and 457 KB as uint8, instead of 3.6 MB as float64.
+    """
+    def __init__(
+        self,
+        indices: np.ndarray,
+        values: np.ndarray,
+        floor: float,
+        size: int,
+        dtype: type
+    ) -> None:
+        self.floor = floor
+        self._quantizer = _Quantizer(values, floor, dtype)
+        self.codes: np.ndarray = np.full(size, self._quantizer.floor_code,
+                                         dtype=dtype)
+        self.codes[indices] = self._quantizer.encode(values)
+
+    def score(self, indices: np.ndarray) -> np.ndarray:
+        sums = np.take(self.codes, indices).sum(axis=1, dtype=np.int64)
+        return self._quantizer.decode_sums(sums, indices.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes)
+
+
+class HashedTable(NgramTable):
+    """Open addressing hash table of int16 codes holding only the
+    observed n-grams, for high orders whose dense table would not fit
+    in the CPU cache. The table is at most half full, so lookups probe
+    few slots.
+    """
+    def __init__(
+        self,
+        indices: np.ndarray,
+        values: np.ndarray,
+        floor: float
+    ) -> None:
+        self.floor = floor
+        self._quantizer = _Quantizer(values, floor, np.int16)
+        self._bits = max(int(2 * len(indices) - 1).bit_length(), 1)
+        self._mask = (1 << self._bits) - 1
+        self.keys = np.full(1 << self._bits, -1, dtype=np.int32)
+        self.codes = np.full(1 << self._bits, self._quantizer.floor_code,
+                             dtype=np.int16)
+        self.max_probes = 0
+
+        # Insert all entries at once, one probe step per round: the
+        # first entry claiming an empty slot gets it, the others move on
+        pending = np.arange(len(indices))
+        slots = self._hash(indices)
+        codes = self._quantizer.encode(values)
+        while len(pending):
+            self.max_probes += 1
+            empty = self.keys[slots] == -1
+            claimed, first = np.unique(slots[empty], return_index=True)
+            winners = pending[empty][first]
+            self.keys[claimed] = indices[winners]
+            self.codes[claimed] = codes[winners]
+
+            placed = np.zeros(len(pending), dtype=bool)
+            placed[np.flatnonzero(empty)[first]] = True
+            pending = pending[~placed]
+            slots = (slots[~placed] + 1) & self._mask
+
+    def _hash(self, indices: np.ndarray) -> np.ndarray:
+        hashed = (indices.astype(np.uint64) * _HASH_MULTIPLIER) & np.uint64(
+            0xFFFFFFFF
+        )
+        return (hashed >> np.uint64(32 - self._bits)).astype(np.intp)
+
+    def lookup(self, indices: np.ndarray) -> np.ndarray:
+        """Get the codes of a flat array of n-gram indices, with the
+        floor code for unobserved n-grams.
+
+        Args:
+            indices (np.ndarray): The base-26 indices of the n-grams.
+
+        Returns:
+            np.ndarray: The int16 code of every n-gram.
+        """
+        codes = np.full(len(indices), self._quantizer.floor_code,
+                        dtype=np.int16)
+        pending = np.arange(len(indices))
+        slots = self._hash(indices)
+        for _ in range(self.max_probes):
+            keys = self.keys[slots]
+            found = keys == indices[pending]
+            codes[pending[found]] = self.codes[slots[found]]
+            unresolved = ~found & (keys != -1)
+            pending = pending[unresolved]
+            slots = (slots[unresolved] + 1) & self._mask
+        return codes
+
+    def score(self, indices: np.ndarray) -> np.ndarray:
+        codes = self.lookup(indices.ravel()).reshape(indices.shape)
+        sums = codes.sum(axis=1, dtype=np.int64)
+        return self._quantizer.decode_sums(sums, indices.shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.keys.nbytes + self.codes.nbytes)
+
+
+def build_table(
+    indices: np.ndarray,
+    values: np.ndarray,
+    floor: float,
+    ngram_len: int,
+    table_format: str = "dense"
+) -> NgramTable:
+    """Build an n-gram score table from the observed n-grams.
+
+    Args:
+        indices (np.ndarray): The base-26 indices of the observed
+        n-grams.
+        values (np.ndarray): Their log probabilities.
+        floor (float): The score of unobserved n-grams.
+        ngram_len (int): The number of letters of the n-grams.
+        table_format (str, optional): The memory layout of the table,
+        one of "dense", "int16", "uint8" or "hashed". Defaults to
+        "dense".
+
+    Raises:
+        InvalidInputError: Raised if table_format is not valid.
+
+    Returns:
+        NgramTable: The n-gram score table.
+    """
+    size = 26 ** ngram_len
+    if table_format == TableFormat.DENSE.value:
+        dense = np.full(size, floor)
+        dense[indices] = values
+        return DenseTable(dense, floor)
+    elif table_format == TableFormat.INT16.value:
+        return QuantizedTable(indices, values, floor, size, np.int16)
+    elif table_format == TableFormat.UINT8.value:
+        return QuantizedTable(indices, values, floor, size, np.uint8)
+    elif table_format == TableFormat.HASHED.value:
+        return HashedTable(indices, values, floor)
+    else:
+        raise InvalidInputError("table_format", table_format, TableFormat)
+
+
+def save_entries(
+    file_path: Union[str, Path],
+    indices: np.ndarray,
+    values: np.ndarray,
+    floor: float,
+    fitness: float
+) -> None:
+    """Save the observed n-grams of a score table as a compressed .npz
+    file, far smaller than a pickled dictionary for high orders.
+
+    Args:
+        file_path (Union[str, Path]): The path to the output file.
+        indices (np.ndarray): The base-26 indices of the observed
+        n-grams.
+        values (np.ndarray): Their log probabilities.
+        floor (float): The score of unobserved n-grams.
+        fitness (float): The expected score of an English n-gram.
+    """
+    order = np.argsort(indices)
+    np.savez_compressed(file_path,
+                        indices=indices[order].astype(np.int32),
+                        values=values[order].astype(np.float32),
+                        floor=floor,
+                        fitness=fitness)
+
+
+def load_entries(
+    file_path: Union[str, Path]
+) -> tuple[np.ndarray, np.ndarray, float, float]:
+    """Load the observed n-grams saved by save_entries.
+
+    Args:
+        file_path (Union[str, Path]): The path to the .npz file.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, float, float]: The n-gram indices,
+        their log probabilities, the floor score and the expected score
+        of an English n-gram.
+    """
+    with np.load(file_path) as data:
+        return (data["indices"].astype(np.intp),
+                data["values"].astype(np.float64),
+                float(data["floor"]),
+                float(data["fitness"]))
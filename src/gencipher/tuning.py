@@ -0,0 +1,359 @@
+"""Tune the decipher parameters for time to solution.
+
+A benchmark corpus is generated by cutting plain text into samples of
+several lengths and encoding each with a random key. Every combination
+of a parameter grid deciphers the samples of each length bucket across
+worker processes, and the one with the shortest expected time to
+solution is recommended for the bucket. The recommendations are saved
+as a profile that GeneticDecipher loads with its profile argument.
+
+    python -m gencipher.tuning books.txt --workers 4 --output profile.json
+"""
+import sys
+import json
+import math
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from gencipher.cipherkey import CipherKey, random_cipher_key
+from gencipher.model import GeneticDecipher
+from gencipher.ngram import Ngram, ScoresNotFoundError, scores_file
+from gencipher.options import InvalidInputError, NgramType
+from gencipher.profiles import TUNABLE_PARAMS, Bucket, TuningProfile
+from gencipher.rng import get_rng
+
+
+LENGTH_BUCKETS = (100, 300, 1000)
+DEFAULT_GRID: dict[str, list[Any]] = {
+    "n_population": [50, 100, 200],
+    "mutation_rate": [0.01, 0.05, 0.2],
+    "crossover_rate": [0.6, 0.9],
+}
+
+# GeneticDecipher and run options of the current worker process
+_worker: dict[str, Any] = {}
+
+
+class CorpusError(ValueError):
+    """Inappropriate benchmark corpus source."""
+    def __init__(self) -> None:
+        super().__init__("Invalid corpus. The plain text must have words "
+                         "and the lengths must be greater than zero (0).")
+
+
+class GridError(ValueError):
+    """Inappropriate parameter grid."""
+    def __init__(self) -> None:
+        super().__init__("Invalid grid. Must map parameters among ["
+                         + ", ".join(TUNABLE_PARAMS) + "] to non-empty "
+                         "lists of values.")
+
+
+class TuningRunError(ValueError):
+    """A decipher run failed while tuning."""
+    def __init__(self, error: str) -> None:
+        super().__init__(f"A tuning run failed: {error}")
+
+
+@dataclass
+class Sample:
+    """A plain text of the benchmark corpus and its encoding."""
+    plain_text: str
+    key: CipherKey
+    cipher_text: str
+    length: int
+
+
+def make_corpus(
+    plain_text: str,
+    lengths: Sequence[int] = LENGTH_BUCKETS,
+    n_samples: int = 5,
+    rng: Optional[np.random.Generator] = None
+) -> list[Sample]:
+    """Generate cipher texts of known solution, cutting the plain text
+    into samples that start at random words and encoding each with a
+    random key.
+
+    Args:
+        plain_text (str): The source text, reused from the start when a
+        sample runs past its end.
+        lengths (Sequence[int], optional): The sample lengths in
+        characters, one bucket each. Defaults to LENGTH_BUCKETS.
+        n_samples (int, optional): The samples per length. Defaults to
+        5.
+        rng (np.random.Generator, optional): The random number
+        generator to be used. Defaults to None (module generator).
+
+    Raises:
+        CorpusError: Raised if the plain text has no words or a length
+        is not positive.
+
+    Returns:
+        list[Sample]: The samples, grouped by length.
+    """
+    words = plain_text.split()
+    if not words or any(length <= 0 for length in lengths):
+        raise CorpusError()
+    rng = get_rng(rng)
+
+    samples = []
+    for length in lengths:
+        for _ in range(n_samples):
+            start = int(rng.integers(len(words)))
+            text = ""
+            for word in itertools.islice(itertools.cycle(words), start,
+                                         None):
+                if len(text) >= length:
+                    break
+                text = f"{text} {word}" if text else word
+            text = text[:length]
+            key = random_cipher_key(rng)
+            samples.append(Sample(text, key, key.encode_cipher(text),
+                                  length))
+    return samples
+
+
+def letter_accuracy(plain_text: str, deciphered_text: str) -> float:
+    """Compute the fraction of letters deciphered correctly.
+
+    Args:
+        plain_text (str): The original plain text.
+        deciphered_text (str): The deciphered text.
+
+    Returns:
+        float: The fraction of matching letters, one (1) if there are
+        no letters.
+    """
+    pairs = [(plain, deciphered)
+             for plain, deciphered in zip(plain_text.upper(),
+                                          deciphered_text.upper())
+             if plain.isalpha()]
+    if not pairs:
+        return 1.0
+    return sum(plain == deciphered for plain, deciphered in pairs) / len(pairs)
+
+
+def _init_worker(config: dict[str, Any]) -> None:
+    _worker["gencipher"] = GeneticDecipher(Ngram(config["ngram_type"],
+                                                 config["scores_folder"]))
+    _worker["config"] = config
+
+
+def _run(
+    task: tuple[int, dict[str, Any], Sample, np.random.SeedSequence]
+) -> tuple[int, float, float, Optional[str]]:
+    """Decipher a sample with a parameter combination.
+
+    Returns:
+        tuple[int, float, float, Optional[str]]: The combination index,
+        the wall-clock time, the letter accuracy and the error message
+        if the run failed, as errors may not survive unpickling.
+    """
+    combination, params, sample, seed = task
+    gencipher: GeneticDecipher = _worker["gencipher"]
+    config = _worker["config"]
+    gencipher.rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    try:
+        deciphered_text = gencipher.decipher(sample.cipher_text,
+                                             tolerance=config["tolerance"],
+                                             max_time=config["max_time"],
+                                             **params)
+    except (ValueError, TypeError, AttributeError) as error:
+        return combination, 0.0, 0.0, str(error)
+    return (combination, time.perf_counter() - start,
+            letter_accuracy(sample.plain_text, deciphered_text), None)
+
+
+def tune(
+    corpus: Sequence[Sample],
+    grid: Optional[dict[str, list[Any]]] = None,
+    ngram_type: str = "quadgram",
+    tolerance: float = 0.02,
+    max_time: Optional[float] = None,
+    accuracy: float = 0.95,
+    n_workers: int = 1,
+    seed: Optional[int] = None,
+    scores_folder: Optional[str] = None
+) -> TuningProfile:
+    """Find the parameter combination of a grid with the shortest
+    expected time to solution for every length of a corpus.
+
+    The expected time to solution is the total time of the runs of a
+    combination divided by the runs that solved their sample, so a fast
+    combination that rarely solves is not preferred over a slower
+    reliable one.
+
+    Args:
+        corpus (Sequence[Sample]): The samples from make_corpus.
+        grid (dict[str, list[Any]], optional): The values of every
+        parameter to search, among TUNABLE_PARAMS. Defaults to None
+        (DEFAULT_GRID).
+        ngram_type (str, optional): The type of n-gram analysis to be
+        used. Defaults to "quadgram".
+        tolerance (float, optional): The fitness tolerance of every
+        run. Defaults to 0.02.
+        max_time (float, optional): The wall-clock budget in seconds of
+        every run. Defaults to None (unlimited).
+        accuracy (float, optional): The fraction of letters a run must
+        decipher correctly to count as solved. Defaults to 0.95.
+        n_workers (int, optional): The number of worker processes, one
+        (1) to run in the calling process. Defaults to 1.
+        seed (int, optional): The seed of the runs. Every combination
+        gets the same seed for a given sample, so they are compared on
+        equal terms. Defaults to None (fresh entropy).
+        scores_folder (str, optional): The folder of the n-gram scores.
+        Defaults to None (the packaged scores).
+
+    Raises:
+        GridError: Raised if the grid is empty or has parameters that
+        are not tunable.
+        InvalidInputError: Raised if ngram_type is not a valid n-gram
+        type.
+        ScoresNotFoundError: Raised if there are no scores of
+        ngram_type, checked before any worker starts.
+        TuningRunError: Raised if a run fails, e.g. with an invalid
+        parameter value.
+
+    Returns:
+        TuningProfile: The best combination of every length, with its
+        expected time to solution and success rate.
+    """
+    grid = DEFAULT_GRID if grid is None else grid
+    if (not grid or set(grid) - set(TUNABLE_PARAMS)
+            or not all(grid.values())):
+        raise GridError()
+    if ngram_type not in NgramType.values():
+        raise InvalidInputError("ngram_type", ngram_type, NgramType)
+    scores_file(ngram_type, scores_folder)
+
+    combinations = [dict(zip(grid, values))
+                    for values in itertools.product(*grid.values())]
+    seeds = np.random.SeedSequence(seed).spawn(len(corpus))
+    config = {"ngram_type": ngram_type, "scores_folder": scores_folder,
+              "tolerance": tolerance, "max_time": max_time}
+
+    profile_buckets = []
+    for length in sorted({sample.length for sample in corpus}):
+        tasks = [(idx, params, sample, seeds[sample_idx])
+                 for sample_idx, sample in enumerate(corpus)
+                 if sample.length == length
+                 for idx, params in enumerate(combinations)]
+        times = np.zeros(len(combinations))
+        solved = np.zeros(len(combinations))
+        for idx, elapsed, run_accuracy, error in _map(tasks, config,
+                                                      n_workers):
+            if error is not None:
+                raise TuningRunError(error)
+            times[idx] += elapsed
+            solved[idx] += run_accuracy >= accuracy
+
+        runs = len(tasks) // len(combinations)
+        expected = [times[idx] / solved[idx] if solved[idx] else math.inf
+                    for idx in range(len(combinations))]
+        best = int(np.argmin(expected))
+        profile_buckets.append(Bucket(length, combinations[best],
+                                      expected[best], solved[best] / runs))
+    return TuningProfile(profile_buckets)
+
+
+def _map(
+    tasks: list[tuple[int, dict[str, Any], Sample, np.random.SeedSequence]],
+    config: dict[str, Any],
+    n_workers: int
+) -> list[tuple[int, float, float, Optional[str]]]:
+    if n_workers <= 1:
+        _init_worker(config)
+        return [_run(task) for task in tasks]
+    with ProcessPoolExecutor(n_workers, initializer=_init_worker,
+                             initargs=(config,)) as executor:
+        return list(executor.map(_run, tasks))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse the command-line options.
+
+    Args:
+        argv (Sequence[str], optional): The arguments. Defaults to None
+        (sys.argv).
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m gencipher.tuning",
+        description=__doc__.splitlines()[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("input", nargs="+",
+                        help="Plain text files the corpus is cut from.")
+    parser.add_argument("-o", "--output", default="profile.json",
+                        help="Profile JSON file.")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Worker processes.")
+    parser.add_argument("--lengths", type=int, nargs="+",
+                        default=list(LENGTH_BUCKETS),
+                        help="Sample lengths, one bucket each.")
+    parser.add_argument("--samples", type=int, default=5,
+                        help="Samples per length.")
+    parser.add_argument("--grid", type=json.loads, default=DEFAULT_GRID,
+                        help="JSON object of parameter values to search.")
+    parser.add_argument("--ngram-type", default="quadgram",
+                        choices=NgramType.values())
+    parser.add_argument("--scores-folder", default=None,
+                        help="Folder of n-gram scores built by python -m "
+                             "gencipher.builder. Defaults to the packaged "
+                             "scores.")
+    parser.add_argument("--tolerance", type=float, default=0.02)
+    parser.add_argument("--max-time", type=float, default=None,
+                        help="Seconds per run.")
+    parser.add_argument("--accuracy", type=float, default=0.95,
+                        help="Fraction of letters of a solved run.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    try:
+        scores_file(args.ngram_type, args.scores_folder)
+    except ScoresNotFoundError as error:
+        parser.error(str(error))
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the tuning command, writing the profile and printing a
+    summary line per bucket.
+
+    Args:
+        argv (Sequence[str], optional): The arguments. Defaults to None
+        (sys.argv).
+
+    Returns:
+        int: The exit status.
+    """
+    config = vars(parse_args(argv))
+    plain_text = ""
+    for name in config["input"]:
+        with open(name, "r") as file_in:
+            plain_text += file_in.read() + "\n"
+
+    corpus = make_corpus(plain_text, config["lengths"], config["samples"],
+                         np.random.default_rng(config["seed"]))
+    profile = tune(corpus, config["grid"], config["ngram_type"],
+                   config["tolerance"], config["max_time"],
+                   config["accuracy"], config["workers"], config["seed"],
+                   config["scores_folder"])
+    profile.save(config["output"])
+    for bucket in profile.buckets:
+        print(json.dumps({"length": bucket.length, **bucket.params,
+                          "time": bucket.time,
+                          "success_rate": bucket.success_rate}))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
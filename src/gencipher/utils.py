@@ -1,47 +1,27 @@
-import enum
-import random
 import numpy as np
-from typing import Union
+from typing import Optional
 
+from gencipher.rng import get_rng
 from gencipher.cipherkey import CipherKey
+# Re-exported, as they moved to a module importable without NumPy
+from gencipher.options import InputType, InvalidInputError
 
+__all__ = ["InputType", "InvalidInputError", "select_parent",
+           "select_parents"]
 
-class InputType(enum.Enum):
-    """Create a custom collection of name/values pairs.
-    It provides a method to retrieve the available values as strings.
-    """
-    @classmethod
-    def values(cls):
-        """Retrieve the values of the InputType enum class.
-
-        Returns:
-            Iterable[str]: An iterable containing the values of the
-            InputType enum as strings.
-        """
-        return [member.value for member in cls]
-
-
-class InvalidInputError(ValueError):
-    """Input doesn't match any valid values from the InputType"""
-    def __init__(
-        self,
-        var_name: str,
-        var: Union[InputType, str],
-        var_class: type[InputType]
-    ) -> None:
-        super().__init__(
-            f"Invalid {var_name}: {var}. It should be one of ["
-            + ", ".join(value for value in var_class.values()) + "]."
-        )
-
-
-def select_parent(population_fitness: dict[CipherKey, float]) -> CipherKey:
+
+def select_parent(
+    population_fitness: dict[CipherKey, float],
+    rng: Optional[np.random.Generator] = None
+) -> CipherKey:
     """Select a parent from a population based on their fitness scores
     using a weighted random selection.
 
     Args:
         population_fitness (dict): A dictionary containing fitness
         scores for individuals in the population.
+        rng (np.random.Generator, optional): The random number
+        generator to be used. Defaults to None (module generator).
 
     Returns:
         CipherKey: The selected parent chosen based on fitness scores.
@@ -51,7 +31,34 @@ def select_parent(population_fitness: dict[CipherKey, float]) -> CipherKey:
     total_fitness = np.sum(values_arr)
     selection_probability = values_arr / total_fitness
 
-    parent = random.choices(list(population_fitness),
-                            weights=selection_probability,
-                            k=1)
-    return parent[0]
+    parent_idx = get_rng(rng).choice(len(values_arr),
+                                     p=selection_probability)
+    return list(population_fitness)[parent_idx]
+
+
+def select_parents(
+    population_fitness: dict[CipherKey, float],
+    n_parents: int,
+    rng: Optional[np.random.Generator] = None
+) -> list[CipherKey]:
+    """Select several parents at once from a population, with the same
+    weighted random selection as select_parent.
+
+    Args:
+        population_fitness (dict): A dictionary containing fitness
+        scores for individuals in the population.
+        n_parents (int): The number of parents to select.
+        rng (np.random.Generator, optional): The random number
+        generator to be used. Defaults to None (module generator).
+
+    Returns:
+        list[CipherKey]: The selected parents.
+    """
+    keys = list(population_fitness)
+    values_arr = np.fromiter(population_fitness.values(), dtype=float,
+                             count=len(keys))
+    selection_probability = values_arr / np.sum(values_arr)
+
+    parents_idx = get_rng(rng).choice(len(keys), size=n_parents,
+                                      p=selection_probability)
+    return [keys[idx] for idx in parents_idx]
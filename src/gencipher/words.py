@@ -0,0 +1,195 @@
+import os
+import re
+import pickle
+import string
+from typing import Any, Optional, Union
+from pathlib import Path
+
+from gencipher.ngram import packaged_scores_folder
+
+
+def word_pattern(word: str) -> str:
+    """Compute the letter pattern of a word, where each distinct letter
+    is replaced by the order of its first appearance ("LETTER" becomes
+    "ABCCBD").
+
+    Args:
+        word (str): The word whose pattern is computed.
+
+    Returns:
+        str: The letter pattern of the word.
+    """
+    first_seen: dict[str, str] = {}
+    for letter in word.upper():
+        if letter not in first_seen:
+            first_seen[letter] = string.ascii_uppercase[len(first_seen)]
+    return "".join(first_seen[letter] for letter in word.upper())
+
+
+class WordPatternIndex:
+    def __init__(
+        self,
+        scores_folder: Union[None, str, Path] = None
+    ) -> None:
+        """Create a WordPatternIndex object mapping letter patterns to
+        the English words that follow them.
+
+        Args:
+            scores_folder (Union[None, str, Path], optional): The path
+            to the folder containing the precomputed word pattern
+            pickled dictionary. Defaults to None (the packaged scores
+            folder).
+        """
+        if scores_folder is None:
+            scores_folder = packaged_scores_folder()
+        file = os.path.join(scores_folder, "english_words.dict")
+        with open(file, "rb") as file_in:
+            self.patterns: dict[str, list[str]] = pickle.load(file_in)
+
+    def candidates(self, cipher_word: str) -> list[str]:
+        """Get the English words with the same letter pattern as a
+        cipher word, most common first.
+
+        Args:
+            cipher_word (str): The cipher word.
+
+        Returns:
+            list[str]: The candidate plain words.
+        """
+        return self.patterns.get(word_pattern(cipher_word), [])
+
+    def constraints(
+        self,
+        cipher_text: str,
+        max_candidates: int = 50,
+        max_nodes: int = 20000
+    ) -> dict[str, str]:
+        """Derive a partial key from the words of a cipher text that
+        keeps word boundaries.
+
+        A depth-first search assigns candidate English words to the
+        cipher words, keeping the letter mapping one-to-one, and keeps
+        the consistent assignment covering the most cipher letters.
+        Words with more than max_candidates candidates are ignored.
+
+        Args:
+            cipher_text (str): The cipher text to be deciphered.
+            max_candidates (int, optional): The maximum number of
+            candidates of a cipher word taken into account. Defaults to
+            50.
+            max_nodes (int, optional): The maximum number of search
+            nodes visited. Defaults to 20000.
+
+        Returns:
+            dict[str, str]: The mapping of cipher letters to plain
+            letters, both uppercase.
+        """
+        counts: dict[str, int] = {}
+        for word in re.findall(r"[A-Za-z]+", cipher_text):
+            counts[word.upper()] = counts.get(word.upper(), 0) + 1
+
+        words = []
+        for word, count in counts.items():
+            word_candidates = self.candidates(word)
+            if 0 < len(word_candidates) <= max_candidates:
+                words.append((word, count * len(word), word_candidates))
+        words.sort(key=lambda x: (len(x[2]), -x[1]))
+
+        remaining_weight = [0] * (len(words) + 1)
+        for idx in range(len(words) - 1, -1, -1):
+            remaining_weight[idx] = remaining_weight[idx + 1] + words[idx][1]
+
+        best: list[Any] = [0, {}]
+        nodes = 0
+
+        def search(
+            idx: int,
+            weight: int,
+            mapping: dict[str, str],
+            used: set[str]
+        ) -> None:
+            nonlocal nodes
+            nodes += 1
+            if weight > best[0]:
+                best[0], best[1] = weight, dict(mapping)
+            if (idx == len(words) or nodes > max_nodes
+                    or weight + remaining_weight[idx] <= best[0]):
+                return
+
+            cipher_word, word_weight, word_candidates = words[idx]
+            for plain_word in word_candidates:
+                added = _extend_mapping(cipher_word, plain_word,
+                                        mapping, used)
+                if added is None:
+                    continue
+                search(idx + 1, weight + word_weight, mapping, used)
+                for cipher_letter in added:
+                    used.discard(mapping.pop(cipher_letter))
+            search(idx + 1, weight, mapping, used)
+
+        search(0, 0, {}, set())
+        constraints: dict[str, str] = best[1]
+        return constraints
+
+
+def _extend_mapping(
+    cipher_word: str,
+    plain_word: str,
+    mapping: dict[str, str],
+    used: set[str]
+) -> Optional[list[str]]:
+    added = []
+    for cipher_letter, plain_letter in zip(cipher_word, plain_word):
+        if cipher_letter in mapping:
+            if mapping[cipher_letter] != plain_letter:
+                break
+        elif plain_letter in used:
+            break
+        else:
+            mapping[cipher_letter] = plain_letter
+            used.add(plain_letter)
+            added.append(cipher_letter)
+    else:
+        return added
+
+    for cipher_letter in added:
+        used.discard(mapping.pop(cipher_letter))
+    return None
+
+
+def _words_file_to_pattern_dictionary(
+    file_path: Union[str, Path]
+) -> dict[str, list[str]]:  # pragma: no cover
+    """Reads a text file with one English word per line, most common
+    first, and groups the words by letter pattern.
+
+    Args:
+        file_path (Union[str, Path]): The path to the words text file.
+
+    Returns:
+        dict[pattern, list[word]]: A Python dictionary where keys are
+        letter patterns and values are the uppercase words following
+        them, in file order.
+    """
+    patterns: dict[str, list[str]] = {}
+    with open(file_path, "r") as file:
+        for line in file:
+            word = line.strip().upper()
+            if word.isalpha():
+                patterns.setdefault(word_pattern(word), []).append(word)
+    return patterns
+
+
+def main():  # pragma: no cover
+    parent_folder = os.path.join(os.path.dirname(__file__), "../..")
+    file_path = os.path.join(parent_folder, "data", "ngrams_files",
+                             "english_words.txt")
+    output_file = os.path.join(parent_folder, "data", "ngrams_scores",
+                               "english_words.dict")
+
+    with open(output_file, "wb") as file_out:
+        pickle.dump(_words_file_to_pattern_dictionary(file_path), file_out)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,292 @@
+"""Reproducible benchmark suite for gencipher.
+
+Times importing the package in a fresh interpreter, n-gram scoring,
+the crossover and mutation operators, parent selection and end-to-end
+deciphering on samples of several texts and lengths encoded with random
+keys. Every run is seeded, and the results are written as JSON so two
+builds can be compared; --compare reports timings that regressed.
+
+    python tests/gencipher_benchmark.py --output bench.json
+"""
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from typing import Any, Callable
+
+import numpy as np
+
+from gencipher.cipherkey import random_cipher_key
+from gencipher.model import GeneticDecipher
+from gencipher.ngram import Ngram
+from gencipher.tuning import letter_accuracy, make_corpus
+from gencipher.utils import select_parent
+
+
+PLAIN_TEXTS = (
+    "It was the best of times, it was the worst of times, it was the age "
+    "of wisdom, it was the age of foolishness, it was the epoch of belief, "
+    "it was the epoch of incredulity, it was the season of Light, it was "
+    "the season of Darkness, it was the spring of hope, it was the winter "
+    "of despair, we had everything before us, we had nothing before us.",
+    "It is a truth universally acknowledged, that a single man in "
+    "possession of a good fortune, must be in want of a wife. However "
+    "little known the feelings or views of such a man may be on his first "
+    "entering a neighbourhood, this truth is so well fixed in the minds of "
+    "the surrounding families, that he is considered the rightful "
+    "property of some one or other of their daughters.",
+    "Four score and seven years ago our fathers brought forth on this "
+    "continent, a new nation, conceived in Liberty, and dedicated to the "
+    "proposition that all men are created equal. Now we are engaged in a "
+    "great civil war, testing whether that nation, or any nation so "
+    "conceived and so dedicated, can long endure.",
+    "Call me Ishmael. Some years ago, never mind how long precisely, having "
+    "little or no money in my purse, and nothing particular to interest me "
+    "on shore, I thought I would sail about a little and see the watery "
+    "part of the world. It is a way I have of driving off the spleen and "
+    "regulating the circulation.",
+)
+
+TEXT_LENGTHS = (50, 200, 1000)
+POPULATION_SIZES = (10, 100, 1000)
+CROSSOVER_TYPES = ("order-one", "partially-mapped", "cycle", "full",
+                   "full-batch")
+MUTATION_TYPES = ("insert", "swap", "inversion", "scramble")
+IMPORT_MODULES = ("gencipher", "gencipher.model", "gencipher.cli")
+
+
+def _corpus_text(length: int) -> str:
+    text = " ".join(PLAIN_TEXTS)
+    while len(text) < length:
+        text = f"{text} {text}"
+    return text[:length]
+
+
+def _time(func: Callable[[], Any], number: int, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {"best": min(timings),
+            "mean": sum(timings) / len(timings),
+            "number": number,
+            "repeat": repeat}
+
+
+def bench_import(repeat: int) -> list[dict]:
+    results = []
+    for module in IMPORT_MODULES:
+        command = [sys.executable, "-c", f"import {module}"]
+        # Subtract the start-up time of a bare interpreter
+        baseline = _time(lambda: subprocess.run([sys.executable, "-c", ""],
+                                                check=True),
+                         number=1, repeat=repeat)
+        timing = _time(lambda: subprocess.run(command, check=True),
+                       number=1, repeat=repeat)
+        results.append({"benchmark": "import",
+                        "module": module,
+                        **timing,
+                        "best": timing["best"] - baseline["best"],
+                        "mean": timing["mean"] - baseline["mean"]})
+    return results
+
+
+def bench_fitness(ngram_type: str, seed: int, repeat: int) -> list[dict]:
+    ngram = Ngram(ngram_type)
+    results = []
+    for length in TEXT_LENGTHS:
+        rng = np.random.default_rng(seed)
+        text = random_cipher_key(rng).encode_cipher(_corpus_text(length))
+        timing = _time(lambda: ngram.compute_fitness(text),
+                       number=max(1, 20000 // length),
+                       repeat=repeat)
+        results.append({"benchmark": "compute_fitness",
+                        "ngram_type": ngram_type,
+                        "text_length": length,
+                        **timing})
+    return results
+
+
+def bench_operators(ngram_type: str, seed: int, repeat: int) -> list[dict]:
+    gencipher = GeneticDecipher(ngram_type)
+    cipher_text = random_cipher_key(np.random.default_rng(seed)).encode_cipher(
+        _corpus_text(200)
+    )
+
+    results = []
+    for crossover_type in CROSSOVER_TYPES:
+        gencipher.rng = rng = np.random.default_rng(seed)
+        gencipher.decipher(cipher_text,
+                           max_iter=0,
+                           n_population=20,
+                           crossover_type=crossover_type)
+        parents = list(gencipher.population)
+        timing = _time(lambda: gencipher.crossover(
+                           parents[rng.integers(len(parents))],
+                           parents[rng.integers(len(parents))]
+                       ),
+                       number=(20 if crossover_type.startswith("full")
+                               else 2000),
+                       repeat=repeat)
+        results.append({"benchmark": "crossover",
+                        "operator": crossover_type,
+                        **timing})
+
+    for mutation_type in MUTATION_TYPES:
+        gencipher.rng = rng = np.random.default_rng(seed)
+        gencipher.decipher(cipher_text,
+                           max_iter=0,
+                           n_population=20,
+                           mutation_type=mutation_type)
+        parents = list(gencipher.population)
+        timing = _time(lambda: gencipher.mutation(
+                           parents[rng.integers(len(parents))]
+                       ),
+                       number=2000,
+                       repeat=repeat)
+        results.append({"benchmark": "mutation",
+                        "operator": mutation_type,
+                        **timing})
+    return results
+
+
+def bench_selection(ngram_type: str, seed: int, repeat: int) -> list[dict]:
+    ngram = Ngram(ngram_type)
+    cipher_text = _corpus_text(200)
+
+    results = []
+    for n_population in POPULATION_SIZES:
+        rng = np.random.default_rng(seed)
+        population = ngram.generate_population(cipher_text, n_population, rng)
+        timing = _time(lambda: select_parent(population, rng),
+                       number=max(1, 100000 // n_population),
+                       repeat=repeat)
+        results.append({"benchmark": "select_parent",
+                        "n_population": n_population,
+                        **timing})
+    return results
+
+
+def bench_decipher(
+    ngram_type: str,
+    seed: int,
+    n_texts: int,
+    max_iter: int
+) -> list[dict]:
+    gencipher = GeneticDecipher(ngram_type)
+    # Every case is cut from a random word of the source texts, so the
+    # suite covers several texts rather than the difficulty of one
+    corpus = make_corpus(" ".join(PLAIN_TEXTS), TEXT_LENGTHS[:2], n_texts,
+                         np.random.default_rng(seed))
+
+    results = []
+    for length in TEXT_LENGTHS[:2]:
+        solved = 0
+        accuracies = []
+        times = []
+        samples = [sample for sample in corpus if sample.length == length]
+        for idx, sample in enumerate(samples):
+            gencipher.rng = np.random.default_rng([seed, length, idx])
+
+            start = time.perf_counter()
+            deciphered_text = gencipher.decipher(sample.cipher_text,
+                                                 max_iter=max_iter)
+            times.append(time.perf_counter() - start)
+
+            accuracies.append(letter_accuracy(sample.plain_text,
+                                              deciphered_text))
+            solved += deciphered_text == sample.plain_text
+
+        results.append({"benchmark": "decipher",
+                        "ngram_type": ngram_type,
+                        "text_length": length,
+                        "n_texts": n_texts,
+                        "max_iter": max_iter,
+                        "success_rate": solved / n_texts,
+                        "mean_accuracy": sum(accuracies) / n_texts,
+                        "mean_time": sum(times) / n_texts,
+                        "max_time": max(times)})
+    return results
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """List the timings of report slower than baseline by more than
+    threshold (relative).
+    """
+    def identity(result: dict) -> tuple:
+        return tuple(sorted((k, v) for k, v in result.items()
+                            if isinstance(v, str) or k in ("text_length",
+                                                           "n_population")))
+
+    baseline_results = {identity(r): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = baseline_results.get(identity(result))
+        if old is None:
+            continue
+        for metric in ("best", "mean_time"):
+            if metric in result and result[metric] > old[metric] * (
+                1 + threshold
+            ):
+                regressions.append(
+                    f"{dict(identity(result))} {metric}: "
+                    f"{old[metric]:.3g}s -> {result[metric]:.3g}s"
+                )
+    return regressions
+
+
+def run(args: argparse.Namespace) -> dict:
+    results = []
+    results += bench_import(args.repeat)
+    results += bench_fitness(args.ngram_type, args.seed, args.repeat)
+    results += bench_operators(args.ngram_type, args.seed, args.repeat)
+    results += bench_selection(args.ngram_type, args.seed, args.repeat)
+    results += bench_decipher(args.ngram_type, args.seed, args.n_texts,
+                              args.max_iter)
+    return {"metadata": {"seed": args.seed,
+                         "ngram_type": args.ngram_type,
+                         "python": platform.python_version(),
+                         "numpy": np.__version__,
+                         "platform": platform.platform(),
+                         "timestamp": time.time()},
+            "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ngram-type", default="quadgram")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--n-texts", type=int, default=5)
+    parser.add_argument("--max-iter", type=int, default=20)
+    parser.add_argument("--output", default="-",
+                        help="JSON output file, '-' for stdout.")
+    parser.add_argument("--compare", default=None,
+                        help="Baseline JSON report to check for "
+                             "regressions.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown reported as a regression.")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w") as file_out:
+            json.dump(report, file_out, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file_in:
+            baseline = json.load(file_in)
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
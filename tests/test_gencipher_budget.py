@@ -0,0 +1,47 @@
+import pytest
+
+from gencipher.budget import Budget, BudgetValueError
+
+
+def test_budget_evaluations():
+    budget = Budget(max_evaluations=3)
+    assert not budget.exhausted
+
+    budget.spend(2)
+    assert not budget.exhausted
+
+    budget.spend()
+    assert budget.exhausted
+    assert budget.evaluations == 3
+
+
+def test_budget_unlimited():
+    budget = Budget()
+    budget.spend(10 ** 6)
+    assert not budget.exhausted
+    assert budget.elapsed >= 0
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"max_time": 0},
+    {"max_time": -1.5},
+    {"max_evaluations": 0}
+])
+def test_budget_value_error(kwargs):
+    with pytest.raises(BudgetValueError):
+        Budget(**kwargs)
+
+
+def test_budget_restore():
+    budget = Budget(max_time=10, max_evaluations=5)
+    budget.restore(4, 1)
+    assert budget.evaluations == 4
+    assert budget.elapsed >= 1
+    assert not budget.exhausted
+
+    budget.restore(4, 9)
+    assert budget.exhausted
+
+    budget = Budget()
+    budget.restore(4, 1)
+    assert not budget.exhausted
@@ -0,0 +1,89 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from gencipher.builder import (
+    OrdersError,
+    count_corpus,
+    iter_chunks,
+    write_scores
+)
+from gencipher.ngram import Ngram
+
+
+CORPUS = (
+    "It was the best of times, it was the worst of times, it was the age "
+    "of wisdom, it was the age of foolishness, it was the epoch of belief, "
+    "it was the epoch of incredulity, it was the season of Light, it was "
+    "the season of Darkness, it was the spring of hope, it was the winter "
+    "of despair, we had everything before us, we had nothing before us.\n"
+)
+
+
+def _naive_counts(texts, order):
+    counts = Counter()
+    for text in texts:
+        letters = "".join(c for c in text.upper() if c.isalpha())
+        counts.update(letters[i:i + order]
+                      for i in range(len(letters) - order + 1))
+    return counts
+
+
+def _index(ngram):
+    index = 0
+    for letter in ngram:
+        index = index * 26 + ord(letter) - 65
+    return index
+
+
+def test_iter_chunks(tmp_path):
+    file_path = tmp_path / "corpus.txt"
+    file_path.write_text("ab, cd!\n  ef")
+
+    chunks = list(iter_chunks(file_path, chunk_size=3, overlap=2))
+    assert chunks[0] == (bytes([0, 1]), 0)
+    assert chunks[1] == (bytes([0, 1, 2, 3]), 2)
+    assert all(len(codes) > carried for codes, carried in chunks)
+
+
+@pytest.mark.parametrize("n_workers,chunk_size", [(0, 7), (0, 10 ** 6),
+                                                  (2, 50)])
+def test_count_corpus(tmp_path, n_workers, chunk_size):
+    file_paths = [tmp_path / "corpus1.txt", tmp_path / "corpus2.txt"]
+    file_paths[0].write_text(CORPUS * 3)
+    file_paths[1].write_text(CORPUS[::-1])
+
+    counts = count_corpus(file_paths, orders=(1, 2, 4),
+                          n_workers=n_workers, chunk_size=chunk_size)
+    for order in (1, 2, 4):
+        expected = _naive_counts([CORPUS * 3, CORPUS[::-1]], order)
+        assert counts[order].sum() == sum(expected.values())
+        for ngram, count in expected.items():
+            assert counts[order][_index(ngram)] == count
+
+    file_paths[1].write_text("ab")
+    counts = count_corpus(file_paths[1:], orders=(4,), n_workers=0)
+    assert counts[4].sum() == 0
+
+    with pytest.raises(OrdersError):
+        count_corpus(file_paths, orders=(0, 2))
+
+
+def test_write_scores(tmp_path):
+    file_path = tmp_path / "corpus.txt"
+    file_path.write_text(CORPUS)
+
+    counts = count_corpus([file_path], orders=(1, 3), n_workers=0)
+    counts[2] = np.zeros(26 ** 2, dtype=np.int64)
+    written = write_scores(counts, tmp_path)
+    assert [path.split("_")[-1] for path in written] == ["monograms.npz",
+                                                         "trigrams.npz"]
+
+    ngram = Ngram("trigram", scores_folder=tmp_path)
+    expected = _naive_counts([CORPUS], 3)
+    total = sum(expected.values())
+    assert ngram.compute_fitness("THE") == pytest.approx(
+        np.log10(expected["THE"] / total)
+    )
+    assert ngram.compute_fitness("QQQ") == ngram.scores["0"]
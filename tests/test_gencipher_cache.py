@@ -0,0 +1,50 @@
+import pytest
+
+from gencipher.cache import MaxEntriesError, ResultCache
+from gencipher.cipherkey import CipherKey
+
+
+KEY = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM")
+
+
+def test_digest():
+    assert (ResultCache.digest("Rbo rpktigo!", "quadgram")
+            == ResultCache.digest("RBORPKTIGO", "quadgram"))
+    assert (ResultCache.digest("Rbo", "quadgram")
+            != ResultCache.digest("Rbo", "trigram"))
+    assert (ResultCache.digest("Rbo", "quadgram")
+            != ResultCache.digest("Rbo", "quadgram", {"R": "T"}))
+
+
+def test_get_put(tmp_path):
+    path = tmp_path / "results.sqlite"
+    cache = ResultCache(path, min_confidence=0.9)
+    assert cache.get("Rbo", "quadgram") is None
+
+    cache.put("Rbo", "quadgram", KEY, -10.0, 0.5)
+    assert cache.get("Rbo", "quadgram") is None
+
+    cache.put("Rbo", "quadgram", KEY, -5.0, 0.95)
+    cache.put("Rbo", "quadgram", CipherKey("ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+              -20.0, 0.7)
+    assert cache.get("rbo.", "quadgram") == (KEY, -5.0, 0.95)
+    cache.close()
+
+    cache = ResultCache(path, min_confidence=0.9)
+    assert len(cache) == 1
+    assert cache.get("Rbo", "quadgram") == (KEY, -5.0, 0.95)
+
+
+def test_eviction():
+    cache = ResultCache(max_entries=2, min_confidence=0)
+    cache.put("A", "monogram", KEY, -1.0, 1.0)
+    cache.put("B", "monogram", KEY, -1.0, 1.0)
+    cache.get("A", "monogram")
+    cache.put("C", "monogram", KEY, -1.0, 1.0)
+
+    assert len(cache) == 2
+    assert cache.get("A", "monogram") is not None
+    assert cache.get("B", "monogram") is None
+
+    with pytest.raises(MaxEntriesError):
+        ResultCache(max_entries=0)
@@ -1,7 +1,12 @@
 import pytest
 import string
 
-from gencipher.cipherkey import CipherKey, InvalidCipherKey, random_cipher_key
+from gencipher.cipherkey import (
+    CipherKey,
+    InvalidCipherKey,
+    random_cipher_key,
+    read_cipher_keys
+)
 
 
 def test_cipher_key_exceptions():
@@ -68,3 +73,16 @@ def test_cipher_key_decode_cipher():
     text = "IFMMP xpsme!"
     encrypted_text = cipher_key.decode_cipher(text)
     assert encrypted_text == "HELLO world!"
+
+
+def test_read_cipher_keys(tmp_path):
+    file_path = tmp_path / "keys.txt"
+    file_path.write_text("# recovered keys\n"
+                         "QWERTYUIOPASDFGHJKLZXCVBNM\n"
+                         "\n"
+                         "bcdefghijklmnopqrstuvwxyza\n")
+
+    keys = read_cipher_keys(file_path)
+    assert keys == ["QWERTYUIOPASDFGHJKLZXCVBNM",
+                    "bcdefghijklmnopqrstuvwxyza"]
+    assert all(isinstance(key, CipherKey) for key in keys)
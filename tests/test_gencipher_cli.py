@@ -0,0 +1,137 @@
+import io
+import json
+
+import pytest
+
+from gencipher.builder import count_corpus, write_scores
+from gencipher.cli import main, parse_args, run
+from gencipher.profiles import Bucket, TuningProfile
+
+
+CIPHER_TEXT = (
+    "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+    "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+)
+OPTIONS = ["--ngram-type", "bigram", "--max-iter", "2",
+           "--n-population", "20", "--seed", "0"]
+
+
+def _write_input(file_path):
+    lines = [json.dumps({"id": "a", "cipher_text": CIPHER_TEXT}),
+             "",
+             json.dumps({"id": "b", "cipher_text": CIPHER_TEXT,
+                         "cribs": {"Rbo": "The"}}),
+             "not json",
+             json.dumps({"cipher_text": "a"}),
+             json.dumps({"id": "d"}),
+             json.dumps({"id": "c", "cipher_text": CIPHER_TEXT,
+                         "cribs": ["Rbo"]})]
+    file_path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli(tmp_path, workers):
+    input_path = tmp_path / "input.jsonl"
+    output_path = tmp_path / "output.jsonl"
+    _write_input(input_path)
+
+    status = main([str(input_path), "-o", str(output_path),
+                   "--workers", workers] + OPTIONS)
+    assert status == 1
+
+    results = {result["index"]: result for result in
+               map(json.loads, output_path.read_text().splitlines())}
+    assert sorted(results) == [0, 1, 2, 3, 4, 5]
+    assert results[0]["id"] == "a"
+    assert len(results[0]["plaintext"]) == len(CIPHER_TEXT)
+    assert results[0]["generations"] == 2
+    assert results[0]["evaluations"] > 20
+    assert results[1]["plaintext"].startswith("The")
+    assert "error" in results[2]
+    assert "error" in results[3]
+    assert "error" in results[4]
+    assert "error" in results[5] and results[5]["id"] == "c"
+
+
+def test_cli_profile(tmp_path, capsys):
+    profile_path = tmp_path / "profile.json"
+    TuningProfile([Bucket(100, {"max_iter": 1})]).save(profile_path)
+    input_path = tmp_path / "input.jsonl"
+    input_path.write_text(json.dumps({"cipher_text": CIPHER_TEXT}) + "\n")
+
+    assert main([str(input_path), "--profile", str(profile_path),
+                 "--ngram-type", "bigram", "--n-population", "20",
+                 "--cache", str(tmp_path / "cache.db")]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["generations"] == 1
+    assert (tmp_path / "cache.db").exists()
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli_scores_folder(tmp_path, monkeypatch, capsys, workers):
+    line = json.dumps({"cipher_text": CIPHER_TEXT})
+    monkeypatch.setattr("sys.stdin", io.StringIO(line))
+
+    # No quintgram scores are packaged: a clean usage error, not a
+    # traceback or a broken worker pool
+    with pytest.raises(SystemExit) as error:
+        main(["--ngram-type", "quintgram", "--workers", workers])
+    assert error.value.code == 2
+    assert "No quintgram scores found" in capsys.readouterr().err
+
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text("The rest of the world is not the same. " * 20)
+    write_scores(count_corpus([corpus_path], orders=(5,), n_workers=0),
+                 tmp_path)
+    assert main(["--ngram-type", "quintgram", "--workers", workers,
+                 "--scores-folder", str(tmp_path), "--max-iter", "1",
+                 "--n-population", "20"]) == 0
+    assert "plaintext" in json.loads(capsys.readouterr().out)
+
+
+def test_cli_config_errors(tmp_path, capsys):
+    input_path = tmp_path / "input.jsonl"
+    input_path.write_text(json.dumps({"cipher_text": CIPHER_TEXT}) + "\n")
+    missing = str(tmp_path / "missing.txt")
+
+    # Bad options fail before any worker starts
+    for option in ("--key-library", "--profile"):
+        assert main([str(input_path), "--workers", "2", option,
+                     missing] + OPTIONS) == 2
+        assert "missing.txt" in capsys.readouterr().err
+
+
+def test_cli_unexpected_error(tmp_path, monkeypatch, capsys):
+    def fail(*args, **kwargs):
+        raise KeyError("table")
+
+    monkeypatch.setattr("gencipher.model.GeneticDecipher.decipher", fail)
+    input_path = tmp_path / "input.jsonl"
+    input_path.write_text(json.dumps({"cipher_text": CIPHER_TEXT}) + "\n"
+                          + json.dumps({"cipher_text": CIPHER_TEXT}) + "\n")
+
+    assert main([str(input_path)] + OPTIONS) == 1
+    results = [json.loads(line) for line in
+               capsys.readouterr().out.splitlines()]
+    assert [result["error"] for result in results] == ["KeyError: 'table'"] * 2
+
+
+def test_cli_run():
+    config = vars(parse_args(["-"] + OPTIONS))
+    output = io.StringIO()
+
+    # run builds its own GeneticDecipher when main has not
+    task = {"index": 0, "line": {"cipher_text": CIPHER_TEXT}}
+    assert run([task], config, output) == 0
+    assert json.loads(output.getvalue())["index"] == 0
+
+
+def test_cli_stdin(monkeypatch, capsys):
+    line = json.dumps({"cipher_text": CIPHER_TEXT})
+    monkeypatch.setattr("sys.stdin", io.StringIO(line + "\n" + line))
+
+    assert main(OPTIONS) == 0
+    results = [json.loads(line) for line in
+               capsys.readouterr().out.splitlines()]
+    assert len(results) == 2
+    assert all(result["fitness"] > 0 for result in results)
@@ -0,0 +1,52 @@
+import pytest
+
+from gencipher.cipherkey import CipherKey
+from gencipher.cribs import (
+    CribError,
+    crib_mapping,
+    free_positions,
+    on_free_positions
+)
+from gencipher.crossover import Crossover, ParentsLengthError
+from gencipher.mutation import Mutation
+
+
+def test_crib_mapping():
+    assert crib_mapping({"Rbo": "The", "q": "s"}) == {
+        "R": "T", "B": "H", "O": "E", "Q": "S"
+    }
+    assert crib_mapping({"Rbo, rb": "The th"}) == {
+        "R": "T", "B": "H", "O": "E"
+    }
+
+    with pytest.raises(CribError):
+        crib_mapping({"Rbo": "Th"})
+    with pytest.raises(CribError):
+        crib_mapping({"Rbo": "The", "R": "A"})
+    with pytest.raises(CribError):
+        crib_mapping({"Rbo": "The", "X": "T"})
+
+
+def test_free_positions():
+    positions = free_positions({"R": "T", "B": "H"})
+    assert len(positions) == 24
+    assert 7 not in positions and 19 not in positions
+
+
+def test_on_free_positions():
+    parent = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM")
+    positions = [0, 5, 10, 15, 20, 25]
+    restricted = on_free_positions(Mutation._scramble, positions)
+
+    for _ in range(20):
+        offspring = restricted(parent)
+        assert sorted(offspring) == sorted(parent)
+        assert all(offspring[idx] == parent[idx] for idx in range(26)
+                   if idx not in positions)
+
+    assert on_free_positions(Mutation._swap, [3])(parent) == parent
+
+    # Parents of different lengths are rejected before restricting
+    restricted = on_free_positions(Crossover._ox1, positions)
+    with pytest.raises(ParentsLengthError):
+        restricted(parent, parent[:-1])
@@ -0,0 +1,147 @@
+import re
+
+import numpy as np
+import pytest
+
+from gencipher.cipherkey import CipherKey
+from gencipher.distributed import (
+    DistributedDecipher, IslandNode, LoopbackTransport, ManagerTransport,
+    N_Nodes_Error, NodeError, NodeManager, pack_keys, unpack_keys
+)
+from gencipher.model import GeneticDecipher
+
+
+CIPHER_TEXT = (
+    "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+    "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+)
+PARAMS = {"n_population": 20, "crossover_type": "order-one"}
+
+
+def test_pack_keys():
+    population = {CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM"): -10.5,
+                  CipherKey("ABCDEFGHIJKLMNOPQRSTUVWXYZ"): -np.inf}
+    keys, fitness = pack_keys(population)
+    assert len(keys) == 52 and len(fitness) == 16
+    assert unpack_keys(keys, fitness) == population
+    assert unpack_keys(*pack_keys({})) == {}
+
+
+@pytest.mark.parametrize("engine", ["generational", "steady-state"])
+def test_immigrate(engine):
+    gencipher = GeneticDecipher("bigram", seed=0)
+    generator = gencipher.decipher_generator(CIPHER_TEXT, n_population=10,
+                                             engine=engine, tolerance=0)
+    next(generator)
+    member = next(iter(gencipher.population))
+    best = CipherKey("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    migrants = {best: 0.0, member: 0.0,
+                CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM"): -np.inf}
+    assert best not in gencipher.population
+
+    assert gencipher.immigrate(migrants) == 1
+    assert len(gencipher.population) == 10
+    assert gencipher.population[best] == 0.0
+    assert gencipher.best_key == (best, 0.0)
+    assert gencipher.immigrate({}) == 0
+    next(generator)
+
+
+def test_distributed_decipher():
+    transport = LoopbackTransport(3)
+    decipher = DistributedDecipher(transport, "bigram", n_migrants=3,
+                                   epoch_generations=2)
+    text = decipher.decipher(CIPHER_TEXT, n_epochs=3, tolerance=0,
+                             seed=0, **PARAMS)
+    assert len(decipher.history) == 3
+    assert decipher.history == sorted(decipher.history)
+    assert text == decipher.best_key[0].decode_cipher(CIPHER_TEXT)
+    assert decipher.evaluations > 3 * 20
+    assert all(node._island is None for node in transport.nodes)
+
+    # The same seed gives the same result
+    again = DistributedDecipher(LoopbackTransport(3), "bigram",
+                                n_migrants=3, epoch_generations=2)
+    assert again.decipher(CIPHER_TEXT, n_epochs=3, tolerance=0, seed=0,
+                          **PARAMS) == text
+
+    # The islands stop once one of them is within tolerance, or once
+    # they run out of generations
+    decipher.decipher(CIPHER_TEXT, n_epochs=5, tolerance=0.7, seed=0,
+                      **PARAMS)
+    assert len(decipher.history) == 1
+    decipher.decipher(CIPHER_TEXT, n_epochs=5, tolerance=1, seed=0,
+                      **PARAMS)
+    assert decipher.history == [-np.inf]
+    decipher.decipher(CIPHER_TEXT, n_epochs=5, tolerance=0, seed=0,
+                      max_evaluations=30, **PARAMS)
+    assert len(decipher.history) == 2
+
+
+def test_distributed_word_boundaries():
+    transport = LoopbackTransport(2)
+    decipher = DistributedDecipher(transport, "bigram", epoch_generations=1)
+    decipher.decipher(CIPHER_TEXT, n_epochs=1, seed=0,
+                      seeding="word-pattern", **PARAMS)
+    local = GeneticDecipher("bigram", seed=0)
+    local.decipher(CIPHER_TEXT, max_iter=0, seeding="word-pattern",
+                   n_population=20)
+    constraints = local.word_index.constraints(CIPHER_TEXT)
+    assert constraints
+
+    # The nodes seed their islands from the same word patterns
+    for node in transport.nodes:
+        island = node._gencipher["bigram"]
+        assert island.cipher_text.split() == \
+            re.findall(r"[A-Z]+", CIPHER_TEXT.upper())
+        assert island.word_index.constraints(island.cipher_text) == \
+            constraints
+
+
+def test_distributed_errors():
+    with pytest.raises(N_Nodes_Error):
+        LoopbackTransport(0)
+    with pytest.raises(N_Nodes_Error):
+        ManagerTransport([], b"")
+
+    decipher = DistributedDecipher(LoopbackTransport(2), "invalid")
+    with pytest.raises(NodeError):
+        decipher.decipher(CIPHER_TEXT)
+    decipher = DistributedDecipher(LoopbackTransport(2), "bigram")
+    with pytest.raises(NodeError):
+        decipher.decipher(CIPHER_TEXT, mutation_type="invalid")
+    assert "error" in IslandNode().handle({"type": "epoch"})
+
+
+def test_manager_transport():
+    # One server process per node, as on separate hosts
+    servers = [NodeManager(("127.0.0.1", 0), b"secret") for _ in range(2)]
+    for server in servers:
+        server.start()
+    try:
+        transport = ManagerTransport([server.address for server in servers],
+                                     b"secret")
+        decipher = DistributedDecipher(transport, "bigram",
+                                       epoch_generations=1)
+        text = decipher.decipher(CIPHER_TEXT, n_epochs=2, tolerance=0,
+                                 seed=0, **PARAMS)
+        assert transport.n_nodes == 2
+        assert len(decipher.history) == 2
+        assert text == decipher.best_key[0].decode_cipher(CIPHER_TEXT)
+
+        # Another coordinator on the same servers gets nodes of its own
+        other = ManagerTransport([server.address for server in servers],
+                                 b"secret")
+        assert servers[0]._number_of_objects() == 2
+        again = DistributedDecipher(other, "bigram", epoch_generations=1)
+        assert again.decipher(CIPHER_TEXT, n_epochs=2, tolerance=0, seed=0,
+                              **PARAMS) == text
+
+        # Closing releases the nodes on the servers
+        transport.close()
+        other.close()
+        assert transport.n_nodes == 0
+        assert all(server._number_of_objects() == 0 for server in servers)
+    finally:
+        for server in servers:
+            server.shutdown()
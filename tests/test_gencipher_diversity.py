@@ -0,0 +1,93 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import gencipher.diversity
+from gencipher.cipherkey import CipherKey, random_cipher_key
+from gencipher.diversity import (
+    hamming_distances, key_matrix, measure, niche_counts, position_entropy,
+    shared_fitness
+)
+
+
+IDENTITY = CipherKey("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+SWAPPED = CipherKey("BACDEFGHIJKLMNOPQRSTUVWXYZ")
+OTHER = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM")
+
+
+def test_key_matrix():
+    codes = key_matrix([IDENTITY, OTHER])
+    assert codes.shape == (2, 26)
+    assert codes[0].tolist() == list(range(26))
+    assert "".join(chr(code + 65) for code in codes[1]) == OTHER
+
+
+def test_position_entropy():
+    assert position_entropy(key_matrix([IDENTITY] * 3)).tolist() == [0] * 26
+
+    entropy = position_entropy(key_matrix([IDENTITY, SWAPPED]))
+    assert entropy[:2] == pytest.approx([np.log(2) / np.log(26)] * 2)
+    assert entropy[2:].tolist() == [0] * 24
+
+    # Every letter once at every position
+    keys = [CipherKey(IDENTITY[shift:] + IDENTITY[:shift])
+            for shift in range(26)]
+    assert position_entropy(key_matrix(keys)) == pytest.approx([1] * 26)
+
+
+def test_hamming_distances():
+    rng = np.random.default_rng(0)
+    keys = [random_cipher_key(rng) for _ in range(8)] + [IDENTITY, SWAPPED]
+    distances = hamming_distances(key_matrix(keys))
+    for (i, key1), (j, key2) in itertools.product(enumerate(keys),
+                                                  repeat=2):
+        assert distances[i, j] == sum(a != b for a, b in zip(key1, key2))
+    assert distances[-2, -1] == 2
+
+
+def test_measure():
+    diversity = measure([IDENTITY, SWAPPED, OTHER])
+    assert 0 < diversity.entropy < 1
+    distances = [sum(a != b for a, b in zip(key1, key2))
+                 for key1, key2 in itertools.combinations(
+                     [IDENTITY, SWAPPED, OTHER], 2)]
+    assert diversity.mean_distance == pytest.approx(np.mean(distances))
+    assert diversity.min_distance == 2
+
+    single = measure([IDENTITY])
+    assert (single.entropy, single.mean_distance,
+            single.min_distance) == (0, 0, 0)
+
+
+def test_shared_fitness():
+    codes = key_matrix([IDENTITY, SWAPPED, OTHER])
+    assert niche_counts(codes, 4).tolist() == [1.5, 1.5, 1]
+    assert niche_counts(codes, 2).tolist() == [1, 1, 1]
+
+    population = {IDENTITY: -10.0, SWAPPED: -12.0, OTHER: -11.0}
+    shared = shared_fitness(population, 4)
+    assert shared == {IDENTITY: -15.0, SWAPPED: -18.0, OTHER: -11.0}
+    # The near-duplicates now rank below the distinct key
+    assert max(shared, key=shared.__getitem__) == OTHER
+    assert shared_fitness(population, 1) == population
+
+
+def test_blocks(monkeypatch):
+    rng = np.random.default_rng(1)
+    keys = [random_cipher_key(rng) for _ in range(9)] + [IDENTITY, SWAPPED]
+    codes = key_matrix(keys)
+    distances = hamming_distances(codes)
+    diversity = measure(keys)
+    counts = niche_counts(codes, 20)
+
+    # Blocks of a few rows give the results of the whole matrix
+    monkeypatch.setattr(gencipher.diversity, "_BLOCK_ELEMENTS", 40)
+    assert niche_counts(codes, 20) == pytest.approx(counts)
+    assert counts == pytest.approx(
+        np.clip(1 - distances / 20, 0, None).sum(axis=1)
+    )
+    assert measure(keys) == pytest.approx(diversity)
+    pairs = distances[np.triu_indices(len(keys), k=1)]
+    assert diversity.mean_distance == pytest.approx(pairs.mean())
+    assert diversity.min_distance == 2
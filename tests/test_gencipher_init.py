@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+import gencipher
+from gencipher.model import GeneticDecipher
+
+
+def _imported_modules(statement):
+    code = (f"{statement}\nimport sys, json\n"
+            "print(json.dumps(sorted(sys.modules)))")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            capture_output=True, text=True, check=True)
+    return set(json.loads(output.stdout))
+
+
+def test_lazy_exports():
+    assert gencipher.GeneticDecipher is GeneticDecipher
+    assert "ResultCache" in dir(gencipher)
+    assert set(gencipher.__all__) <= set(dir(gencipher))
+    with pytest.raises(AttributeError):
+        gencipher.missing
+
+
+def test_import_is_lazy():
+    modules = _imported_modules("import gencipher")
+    assert "numpy" not in modules
+    assert "gencipher.model" not in modules
+
+    modules = _imported_modules("import gencipher.model")
+    assert "sqlite3" not in modules
+    assert "importlib.resources" not in modules
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["--workers", "many"]])
+def test_cli_parse_is_lazy(argv):
+    modules = _imported_modules(
+        "import io, contextlib\n"
+        "from gencipher.cli import parse_args\n"
+        "with contextlib.redirect_stdout(io.StringIO()), "
+        "contextlib.redirect_stderr(io.StringIO()):\n"
+        "    try:\n"
+        f"        parse_args({argv!r})\n"
+        "    except SystemExit:\n"
+        "        pass"
+    )
+    assert "gencipher.cli" in modules
+    for module in ("numpy", "sqlite3", "multiprocessing", "gencipher.model"):
+        assert module not in modules
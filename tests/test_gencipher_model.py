@@ -1,8 +1,17 @@
 import pytest
+from gencipher.cache import ResultCache
+from gencipher.cipherkey import CipherKey
+from gencipher.diversity import MAX_NICHE_POPULATION, NicheRadiusError
+from gencipher.population import BufferedPopulation
+from gencipher.profiles import Bucket, TuningProfile
+from gencipher.utils import InvalidInputError
 from gencipher.model import (
     GeneticDecipher,
+    CheckpointError,
+    CheckpointIntervalError,
     CipherTextLengthError,
-    N_Population_Error
+    N_Population_Error,
+    N_Threads_Error
 )
 
 
@@ -59,3 +68,390 @@ def test_n_population_error():
 
     with pytest.raises(N_Population_Error):
         gencipher.decipher(cipher_text, n_population=0)
+
+
+@pytest.mark.parametrize("budget", [
+    {"max_evaluations": 150},
+    {"max_time": 0.05}
+])
+def test_decipher_budget(budget):
+    gencipher = GeneticDecipher(ngram_type="bigram")
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+
+    deciphered_text = gencipher.decipher(cipher_text,
+                                         max_iter=1000,
+                                         tolerance=0.0,
+                                         mutation_rate=0.5,
+                                         **budget)
+
+    assert gencipher.budget.exhausted
+    assert len(gencipher.history["key"]) < 1000
+    if "max_evaluations" in budget:
+        assert gencipher.budget.evaluations == budget["max_evaluations"]
+    assert deciphered_text == gencipher.best_key[0].decode_cipher(cipher_text)
+
+
+def test_decipher_instrumentation():
+    exported = []
+    gencipher = GeneticDecipher(ngram_type="bigram",
+                                stats_callback=exported.append)
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+
+    gencipher.decipher(cipher_text, max_iter=3, tolerance=0.0)
+
+    assert gencipher.stats is not None
+    assert gencipher.stats.generations == exported
+    assert len(exported) == 3
+    for generation in exported:
+        assert generation.selection > 0
+        assert generation.fitness > 0
+        assert generation.evaluations > 0
+        assert 0 < generation.diversity <= 1
+        assert 0 < generation.entropy <= 1
+        assert 0 <= generation.min_distance <= generation.mean_distance
+    assert (gencipher.stats.totals()["evaluations"] + 100 ==
+            gencipher.budget.evaluations)
+
+    assert GeneticDecipher(ngram_type="bigram").stats is None
+
+
+@pytest.mark.parametrize("crossover_type", [
+    "order-one",
+    "partially-mapped",
+    "full",
+    "full-batch"
+])
+def test_decipher_seed(crossover_type):
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+    histories = []
+    for _ in range(2):
+        gencipher = GeneticDecipher(ngram_type="bigram", seed=7)
+        gencipher.decipher(cipher_text,
+                           max_iter=3,
+                           tolerance=0.0,
+                           n_population=30,
+                           mutation_rate=0.5,
+                           crossover_type=crossover_type)
+        histories.append(gencipher.history)
+
+    assert histories[0] == histories[1]
+
+
+def test_spawn():
+    children = GeneticDecipher(ngram_type="bigram", seed=7).spawn(3)
+    other_children = GeneticDecipher(ngram_type="bigram", seed=7).spawn(3)
+
+    draws = [child.integers(2 ** 32) for child in children]
+    assert len(set(draws)) == 3
+    assert draws == [child.integers(2 ** 32) for child in other_children]
+
+
+def test_decipher_threads():
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+    histories = []
+    for n_threads in (None, 3):
+        gencipher = GeneticDecipher(ngram_type="bigram", seed=3,
+                                    n_threads=n_threads, instrument=True)
+        gencipher.decipher(cipher_text, max_iter=3, tolerance=0.0,
+                           crossover_type="cycle", mutation_rate=0.3)
+        gencipher.close()
+        histories.append(gencipher.history)
+
+    assert histories[0] == histories[1]
+
+
+def test_n_threads_error():
+    with pytest.raises(N_Threads_Error):
+        GeneticDecipher(ngram_type="bigram", n_threads=0)
+
+
+def test_decipher_seeding():
+    gencipher = GeneticDecipher(ngram_type="bigram", seed=0)
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+
+    gencipher.decipher(cipher_text, max_iter=0, seeding="frequency",
+                       random_fraction=0.5)
+    assert len(gencipher.population) > 50
+
+    gencipher.decipher(cipher_text, max_iter=0, seeding="word-pattern")
+    assert gencipher.word_index is not None
+    assert len(gencipher.population) > 50
+
+    with pytest.raises(InvalidInputError):
+        gencipher.decipher(cipher_text, seeding="invalid_input")
+
+
+@pytest.mark.parametrize("crossover_type,mutation_type", [
+    ("order-one", "insert"),
+    ("partially-mapped", "swap"),
+    ("cycle", "inversion"),
+    ("full", "scramble"),
+    ("full-batch", "swap")
+])
+def test_decipher_cribs(crossover_type, mutation_type):
+    gencipher = GeneticDecipher(ngram_type="bigram", seed=0)
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+
+    gencipher.decipher(cipher_text,
+                       max_iter=3,
+                       n_population=20,
+                       crossover_type=crossover_type,
+                       mutation_type=mutation_type,
+                       mutation_rate=0.5,
+                       cribs={"Rbo": "The", "wjd": "and"})
+    for key in list(gencipher.population) + gencipher.history["key"]:
+        assert key.decode_cipher("RBOWJD") == "THEAND"
+
+    gencipher.decipher(cipher_text, max_iter=1, n_population=20,
+                       seeding="word-pattern", cribs={"R": "T"})
+    assert all(key.decode_cipher("R") == "T" for key in gencipher.population)
+
+
+def test_decipher_cache():
+    cache = ResultCache(min_confidence=0)
+    gencipher = GeneticDecipher(ngram_type="bigram", seed=0, cache=cache)
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+
+    deciphered_text = gencipher.decipher(cipher_text, max_iter=2,
+                                         n_population=20)
+    assert len(cache) == 1
+
+    cached_text = gencipher.decipher(cipher_text.upper(), max_iter=2,
+                                     n_population=20)
+    assert cached_text == deciphered_text.upper()
+    assert len(gencipher.history["key"]) == 1
+    assert gencipher.budget.evaluations == 0
+
+
+def test_decipher_key_library(tmp_path):
+    key = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM")
+    plain_text = ("It was the best of times, it was the worst of times, it "
+                  "was the age of wisdom, it was the age of foolishness.")
+    cipher_text = key.encode_cipher(plain_text)
+
+    # A library key within tolerance skips the genetic algorithm
+    file_path = tmp_path / "keys.txt"
+    file_path.write_text(f"ABCDEFGHIJKLMNOPQRSTUVWXYZ\n{key}\n")
+    gencipher = GeneticDecipher("bigram", seed=0, key_library=file_path)
+    assert gencipher.decipher(cipher_text, n_population=20,
+                              seeding="word-pattern") == plain_text
+    assert gencipher.budget.evaluations == 2
+    assert gencipher.history["key"] == [key]
+    # and the seeding work it would throw away
+    assert gencipher.word_index is None
+    with pytest.raises(InvalidInputError):
+        gencipher.decipher(cipher_text, seeding="invalid")
+
+    # Otherwise the library keys seed the initial population
+    gencipher = GeneticDecipher("bigram", seed=0,
+                                key_library=["ABCDEFGHIJKLMNOPQRSTUVWXYZ"])
+    gencipher.decipher(cipher_text, max_iter=0, n_population=20,
+                       tolerance=0)
+    assert gencipher.budget.evaluations == 21
+    assert "ABCDEFGHIJKLMNOPQRSTUVWXYZ" in gencipher.population
+
+    # Keys against the cribs are skipped, and solved keys are learned
+    gencipher.decipher(cipher_text, max_iter=1, n_population=20,
+                       tolerance=0.5, cribs={key[19]: "T"})
+    assert len(gencipher.key_library) == 2
+
+
+def test_decipher_niching():
+    cipher_text = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM").encode_cipher(
+        "It was the best of times, it was the worst of times."
+    )
+    gencipher = GeneticDecipher("bigram", seed=0, instrument=True)
+    gencipher.decipher(cipher_text, max_iter=5, n_population=30,
+                       tolerance=-1, niche_radius=26, mutation_rate=0.5)
+    assert len(gencipher.history["fitness"]) == 5
+    assert gencipher.stats.generations[-1].mean_distance > 0
+
+    with pytest.raises(NicheRadiusError):
+        gencipher.decipher(cipher_text, niche_radius=27)
+    with pytest.raises(NicheRadiusError):
+        gencipher.decipher(cipher_text, niche_radius=-1)
+    with pytest.raises(NicheRadiusError):
+        gencipher.decipher(cipher_text, niche_radius=4,
+                           n_population=MAX_NICHE_POPULATION + 1)
+
+
+def test_decipher_profile(tmp_path):
+    cipher_text = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM").encode_cipher(
+        "It was the best of times, it was the worst of times."
+    )
+    profile = TuningProfile([Bucket(50, {"max_iter": 1,
+                                         "n_population": 20})])
+    file_path = tmp_path / "profile.json"
+    profile.save(file_path)
+
+    # The profile replaces the defaults, not the given parameters
+    gencipher = GeneticDecipher("bigram", seed=0, profile=file_path)
+    gencipher.decipher(cipher_text, tolerance=0)
+    assert gencipher.n_population == 20
+    assert len(gencipher.history["fitness"]) == 1
+    gencipher.decipher(cipher_text, tolerance=0, max_iter=2)
+    assert len(gencipher.history["fitness"]) == 2
+
+    gencipher = GeneticDecipher("bigram", seed=0)
+    gencipher.decipher(cipher_text, max_iter=0)
+    assert gencipher.n_population == 100
+
+
+@pytest.mark.parametrize("engine", ["generational", "steady-state",
+                                    "buffered"])
+def test_decipher_checkpoint(tmp_path, engine):
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+    checkpoint_path = tmp_path / "run.ckpt"
+    params = {"max_iter": 6, "tolerance": 0, "n_population": 30,
+              "crossover_type": "partially-mapped", "mutation_rate": 0.3,
+              "engine": engine}
+
+    gencipher = GeneticDecipher("bigram", seed=1)
+    deciphered_text = gencipher.decipher(cipher_text, **params)
+
+    # Interrupt a checkpointed run after its fourth generation
+    interrupted = GeneticDecipher("bigram", seed=1)
+    generator = interrupted.decipher_generator(
+        cipher_text, checkpoint_path=checkpoint_path, checkpoint_interval=2,
+        **params
+    )
+    for _ in range(4):
+        next(generator)
+    generator.close()
+
+    resumed = GeneticDecipher("bigram", seed=99)
+    assert resumed.resume(checkpoint_path) == deciphered_text
+    assert resumed.history == gencipher.history
+    assert resumed.budget.evaluations == gencipher.budget.evaluations
+    assert resumed.population == gencipher.population
+
+    # A finished run resumes to its last result, even without history
+    assert resumed.resume(checkpoint_path) == deciphered_text
+    unrecorded = GeneticDecipher("bigram", history_size=0)
+    assert unrecorded.resume(checkpoint_path) == deciphered_text
+    assert len(unrecorded.history["text"]) == 0
+
+    with pytest.raises(CheckpointError):
+        GeneticDecipher("monogram").resume(checkpoint_path)
+    with pytest.raises(CheckpointIntervalError):
+        gencipher.decipher(cipher_text, checkpoint_interval=0)
+
+
+@pytest.mark.parametrize("crossover_type", ["full", "cycle"])
+def test_decipher_steady_state(crossover_type):
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+    gencipher = GeneticDecipher("bigram", seed=0)
+    deciphered_text = gencipher.decipher(cipher_text,
+                                         max_iter=5,
+                                         n_population=30,
+                                         crossover_type=crossover_type,
+                                         mutation_rate=0.5,
+                                         engine="steady-state")
+
+    assert len(deciphered_text) == len(cipher_text)
+    assert len(gencipher.population) == 30
+    assert gencipher.best_key[1] == max(gencipher.population.values())
+    fitness = gencipher.history["fitness"]
+    assert all(a <= b for a, b in zip(fitness, fitness[1:]))
+
+    gencipher.decipher(cipher_text, n_population=30, max_evaluations=45,
+                       crossover_type=crossover_type, engine="steady-state")
+    assert gencipher.budget.evaluations <= 45
+
+    with pytest.raises(InvalidInputError):
+        gencipher.decipher(cipher_text, engine="invalid")
+
+
+@pytest.mark.parametrize("crossover_type", ["full", "cycle"])
+def test_decipher_buffered(crossover_type):
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+    gencipher = GeneticDecipher("bigram", seed=0, history_size=3,
+                                instrument=True)
+    deciphered_text = gencipher.decipher(cipher_text,
+                                         max_iter=5,
+                                         n_population=30,
+                                         crossover_type=crossover_type,
+                                         mutation_rate=0.5,
+                                         engine="buffered")
+
+    assert len(deciphered_text) == len(cipher_text)
+    assert isinstance(gencipher.population, BufferedPopulation)
+    assert len(gencipher.population.fitness) == 30
+    assert gencipher.best_key[1] >= max(gencipher.population.values())
+    assert len(gencipher.history["key"]) == 3
+    assert len(gencipher.history["text"]) == 3
+    assert gencipher.stats is not None
+    assert [stats.generation for stats in gencipher.stats.generations] == [
+        3, 4, 5
+    ]
+    assert gencipher.stats.totals()["evaluations"] > 0
+
+    # Migrants replace the worst rows of a running population
+    generator = gencipher.decipher_generator(cipher_text, max_iter=2,
+                                             n_population=30,
+                                             engine="buffered")
+    next(generator)
+    population = gencipher.population
+    assert isinstance(population, BufferedPopulation)
+    migrant = CipherKey("ZYXWVUTSRQPONMLKJIHGFEDCBA")
+    assert gencipher.immigrate({migrant: 0.0}) == 1
+    assert population[migrant] == 0.0
+    assert gencipher.best_key == (migrant, 0.0)
+    assert gencipher.immigrate({migrant: 0.0}) == 0
+
+    gencipher.decipher(cipher_text, n_population=30, max_evaluations=45,
+                       crossover_type=crossover_type, engine="buffered")
+    assert gencipher.budget.evaluations <= 45
+
+
+def test_full_batch_crossover():
+    cipher_text = (
+        "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+        "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+    )
+    gencipher = GeneticDecipher("quadgram", seed=3)
+    gencipher.decipher(cipher_text, max_iter=0, n_population=40,
+                       crossover_type="full-batch")
+    ranked = sorted(gencipher.population, key=gencipher.population.get)
+    for loser, winner in zip(ranked, ranked[::-1]):
+        offspring = gencipher.BFX(winner, loser)
+        assert (gencipher.evaluate(offspring)
+                >= gencipher.population[winner])
+        assert sorted(offspring) == sorted(winner)
+
+    with pytest.raises(ValueError):
+        gencipher.BFX(ranked[0], "ABC")
+
+    gencipher.decipher(cipher_text, n_population=40, max_evaluations=60,
+                       crossover_type="full-batch", crossover_rate=1)
+    assert gencipher.budget.evaluations <= 60
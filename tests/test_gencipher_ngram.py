@@ -1,9 +1,17 @@
-from gencipher.ngram import Ngram, NgramType
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from gencipher.builder import count_corpus, write_scores
+from gencipher.cipherkey import random_cipher_key
+from gencipher.ngram import Ngram, NgramType, ScoresNotFoundError
+from gencipher.utils import InvalidInputError
 
 
 def test_fitness_ngram_class():
-    # Test the load of ngram score files
-    for ngram_type in NgramType.values():
+    # Test the load of the packaged ngram score files
+    for ngram_type in NgramType.values()[:-1]:
         ngram = Ngram(ngram_type)
 
     # Test the compute_fitness method
@@ -17,3 +25,116 @@ def test_fitness_ngram_class():
     n_population = 10
     population_fitness = ngram.generate_population(cipher_text, n_population)
     assert len(population_fitness) == n_population
+
+
+def _dictionary_fitness(ngram, text):
+    letters = "".join(c for c in text.upper() if c.isalpha())
+    return sum(ngram.scores.get(letters[i:i + ngram.ngram_len],
+                                ngram.scores["0"])
+               for i in range(len(letters) - ngram.ngram_len + 1))
+
+
+@pytest.mark.parametrize("ngram_type", ["monogram", "bigram", "trigram"])
+def test_score_keys(ngram_type):
+    ngram = Ngram(ngram_type)
+    cipher_text = "Rovvy, Nre qn yvi tsirk nzro."
+    keys = [random_cipher_key() for _ in range(10)]
+    expected = [_dictionary_fitness(ngram, key.decode_cipher(cipher_text))
+                for key in keys]
+    assert [ngram.compute_fitness(key.decode_cipher(cipher_text))
+            for key in keys] == pytest.approx(expected)
+
+    encoded_text = ngram.encode_text(cipher_text)
+    scores = ngram.score_keys(keys, encoded_text)
+    assert list(scores) == pytest.approx(expected)
+
+    with ThreadPoolExecutor(2) as executor:
+        scores = ngram.score_keys(keys, encoded_text, executor, n_chunks=2)
+    assert list(scores) == pytest.approx(expected)
+
+    codes = ngram.encode_text("".join(keys)).reshape(len(keys), -1)
+    assert list(ngram.score_codes(codes, encoded_text)) == (
+        pytest.approx(expected)
+    )
+    shared = Ngram.from_table(ngram_type, ngram.table.copy(),
+                              ngram.scores["0"], ngram.scores["fitness"])
+    assert list(shared.score_keys(keys, encoded_text)) == (
+        pytest.approx(expected)
+    )
+    assert shared.max_score == ngram.max_score
+    assert shared.fitness_percentage(-100) == ngram.fitness_percentage(-100)
+
+    # Test a text shorter than the n-gram
+    scores = ngram.score_keys(keys, ngram.encode_text("a"))
+    assert list(scores) == pytest.approx(
+        [ngram.compute_fitness(key.decode_cipher("a")) for key in keys]
+    )
+
+
+@pytest.mark.parametrize("table_format", ["dense", "uint8", "hashed"])
+def test_score_bounded(table_format):
+    ngram = Ngram("trigram", table_format=table_format)
+    rng = np.random.default_rng(0)
+    keys = [random_cipher_key(rng) for _ in range(20)]
+    encoded_text = ngram.encode_text(
+        "It was the best of times, it was the worst of times, it was the "
+        "age of wisdom, it was the age of foolishness." * 5
+    )
+    exact = ngram.score_keys(keys, encoded_text)
+    thresholds = np.full(len(keys), float(np.median(exact)))
+
+    scores = ngram.score_bounded(keys, encoded_text, thresholds,
+                                 block_size=16)
+    aborted = np.isinf(scores)
+    assert aborted.any()
+    assert np.all(exact[aborted] < thresholds[aborted])
+    assert scores[~aborted] == pytest.approx(exact[~aborted])
+    assert np.all(exact <= len(encoded_text) * ngram.max_score)
+
+    with ThreadPoolExecutor(2) as executor:
+        scores = ngram.score_keys(keys, encoded_text, executor, n_chunks=2,
+                                  thresholds=thresholds)
+    assert np.all(scores[~np.isinf(scores)] == pytest.approx(
+        exact[~np.isinf(scores)]
+    ))
+
+    # Keys unable to reach a single threshold are all dropped early
+    assert np.all(np.isinf(ngram.score_bounded(keys, encoded_text, 0.0)))
+    # Texts shorter than the n-gram
+    assert list(ngram.score_bounded(keys, ngram.encode_text("a"), 0.0)) == [
+        0.0
+    ] * len(keys)
+
+
+@pytest.mark.parametrize("table_format", ["int16", "uint8", "hashed"])
+def test_table_format(table_format):
+    ngram = Ngram("trigram", table_format=table_format)
+    text = "Hello, we are on the first night."
+    expected = _dictionary_fitness(ngram, text)
+    tolerance = 0.1 if table_format == "uint8" else 1e-3
+
+    assert ngram.compute_fitness(text) == pytest.approx(expected,
+                                                        abs=tolerance)
+    if table_format != "hashed":
+        dense_nbytes = Ngram("trigram").ngram_table.nbytes
+        assert ngram.ngram_table.nbytes < dense_nbytes
+
+    with pytest.raises(InvalidInputError):
+        Ngram("trigram", table_format="float16")
+
+
+def test_quintgram_entries(tmp_path):
+    # No quintgram scores are packaged; they are built from a corpus
+    with pytest.raises(ScoresNotFoundError):
+        Ngram("quintgram")
+
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text("Of the light and of the colours of the light. "
+                           * 20)
+    write_scores(count_corpus([corpus_path], orders=(5,), n_workers=0),
+                 tmp_path)
+    ngram = Ngram("quintgram", scores_folder=tmp_path)
+    assert ngram.table_format == "hashed"
+    assert ngram.ngram_table.nbytes < 4 * 1024 ** 2
+    assert (ngram.compute_fitness("of the light")
+            > ngram.compute_fitness("xq zvj kwpfy"))
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from gencipher.cipherkey import CipherKey
+from gencipher.population import BufferedPopulation, SteadyStatePopulation
+
+
+def test_steady_state_population():
+    fitness = {CipherKey("ABCDEFGHIJKLMNOPQRSTUVWXYZ"): -3.0,
+               CipherKey("BACDEFGHIJKLMNOPQRSTUVWXYZ"): -1.0,
+               CipherKey("CBADEFGHIJKLMNOPQRSTUVWXYZ"): -2.0}
+    population = SteadyStatePopulation(fitness)
+    assert len(population) == 3
+    assert population.worst == ("ABCDEFGHIJKLMNOPQRSTUVWXYZ", -3.0)
+
+    # Children no fitter than the worst member, or already members, are
+    # rejected
+    assert not population.offer(CipherKey("DBCAEFGHIJKLMNOPQRSTUVWXYZ"), -3.0)
+    assert not population.offer(CipherKey("BACDEFGHIJKLMNOPQRSTUVWXYZ"), 0.0)
+
+    child = CipherKey("DBCAEFGHIJKLMNOPQRSTUVWXYZ")
+    assert population.offer(child, 0.0)
+    assert len(population) == 3
+    assert population.worst == ("CBADEFGHIJKLMNOPQRSTUVWXYZ", -2.0)
+    assert fitness[child] == 0.0
+    assert "ABCDEFGHIJKLMNOPQRSTUVWXYZ" not in fitness
+    assert dict(population.items()) == fitness
+
+    rng = np.random.default_rng(0)
+    assert {population.sample(rng) for _ in range(50)} == set(fitness)
+
+
+def test_buffered_population():
+    members = [(CipherKey("ABCDEFGHIJKLMNOPQRSTUVWXYZ"), -3.0),
+               (CipherKey("BACDEFGHIJKLMNOPQRSTUVWXYZ"), -1.0)]
+    population = BufferedPopulation(members, 3)
+    # Rows cycle through the members, and the mapping holds each once
+    assert population.rows() == members + members[:1]
+    assert len(population) == 2
+    assert dict(population) == dict(members)
+    assert population["BACDEFGHIJKLMNOPQRSTUVWXYZ"] == -1.0
+    assert "CBADEFGHIJKLMNOPQRSTUVWXYZ" not in population
+    with pytest.raises(KeyError):
+        population[CipherKey("CBADEFGHIJKLMNOPQRSTUVWXYZ")]
+
+    child = CipherKey("CBADEFGHIJKLMNOPQRSTUVWXYZ")
+    population.remember(child, -2.0)
+    assert population[child] == -2.0
+    assert not population.offer(child, -4.0)
+    assert not population.offer(members[1][0], 0.0)
+    assert population.offer(child, -2.0)
+    assert population.rows() == [(child, -2.0)] + members[1:] + members[:1]
+
+    # The next generation is written to the spare buffers
+    population.spare_codes[:] = population.codes[::-1]
+    population.spare_fitness[:] = population.fitness[::-1]
+    population.swap()
+    assert population.rows() == members[:1] + members[1:] + [(child, -2.0)]
+    with pytest.raises(KeyError):
+        population[child[::-1]]
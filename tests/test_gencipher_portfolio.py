@@ -0,0 +1,75 @@
+import queue
+
+import numpy as np
+import pytest
+
+from gencipher.portfolio import (ConfigurationsError, RaceError,
+                                 _init_worker, _solve, race)
+
+
+CIPHER_TEXT = (
+    "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+    "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+)
+CONFIGURATIONS = [
+    {"ngram_type": "bigram", "crossover_type": "invalid"},
+    {"ngram_type": "bigram", "n_population": 20, "max_iter": 30},
+    {"ngram_type": "bigram", "n_population": 20, "max_iter": 30,
+     "crossover_type": "order-one"},
+    {"ngram_type": "monogram", "n_population": 20, "max_iter": 30,
+     "crossover_type": "cycle"},
+]
+
+
+@pytest.mark.parametrize("n_workers", [0, 2])
+def test_race(n_workers):
+    result = race(CIPHER_TEXT, CONFIGURATIONS, tolerance=0.5,
+                  n_workers=n_workers, margin=0.05, grace=1, seed=0)
+    assert result.solved
+    assert result.fitness >= 0.5
+    assert result.entries[result.winner].status == "solved"
+    assert result.text == result.key.decode_cipher(CIPHER_TEXT)
+    assert result.entries[0].status == "failed"
+    assert "invalid" in result.entries[0].error
+    assert all(entry.status in ("solved", "stopped", "finished", "failed",
+                                "pending")
+               for entry in result.entries)
+
+
+@pytest.mark.parametrize("n_workers", [0, 1])
+def test_race_unsolved(n_workers):
+    configurations = CONFIGURATIONS[1:]
+    result = race(CIPHER_TEXT, configurations, tolerance=-1,
+                  n_workers=n_workers, margin=0.01, grace=2, seed=0,
+                  cribs={"Rbo": "The"})
+    assert not result.solved
+    assert result.text.startswith("The")
+    statuses = [entry.status for entry in result.entries]
+    assert "finished" in statuses
+    assert "stopped" in statuses
+    assert result.fitness == max(entry.fitness for entry in result.entries)
+
+
+@pytest.mark.parametrize("n_workers", [0, 1])
+def test_race_errors(n_workers):
+    with pytest.raises(ConfigurationsError):
+        race(CIPHER_TEXT, [])
+    with pytest.raises(ConfigurationsError):
+        race(CIPHER_TEXT, [{"tolerance": 0}])
+    with pytest.raises(RaceError):
+        race(CIPHER_TEXT, [{"ngram_type": "invalid"}, CONFIGURATIONS[0]],
+             n_workers=n_workers)
+
+
+def test_solve():
+    # Run the worker side in process, as coverage does not follow the
+    # worker processes
+    progress = queue.Queue()
+    stop_flags = [0, 1]
+    _init_worker(progress, stop_flags)
+    seed = np.random.SeedSequence(0)
+    assert _solve(1, CONFIGURATIONS[1], CIPHER_TEXT, {}, seed) is None
+    assert progress.qsize() == 1
+    index, key, fitness, evaluations = progress.get()
+    assert index == 1 and len(key) == 26 and evaluations > 0
+    assert "invalid" in _solve(0, CONFIGURATIONS[0], CIPHER_TEXT, {}, seed)
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from gencipher.profiles import (
+    DEFAULT_PARAMS, Bucket, ProfileError, TuningProfile
+)
+
+
+def test_profile_params(tmp_path):
+    profile = TuningProfile([Bucket(1000, {"n_population": 50}),
+                             Bucket(100, {"mutation_rate": 0.2,
+                                          "max_iter": 5}, 1.5, 0.8)])
+    assert [bucket.length for bucket in profile.buckets] == [100, 1000]
+    assert profile.params(0) == {**DEFAULT_PARAMS, "mutation_rate": 0.2,
+                                 "max_iter": 5}
+    assert profile.params(300)["mutation_rate"] == 0.2
+    assert profile.params(400) == {**DEFAULT_PARAMS, "n_population": 50}
+
+    file_path = tmp_path / "profile.json"
+    profile.save(file_path)
+    loaded = TuningProfile.load(file_path)
+    assert loaded.buckets == profile.buckets
+    assert json.loads(file_path.read_text())["buckets"][1]["time"] is not None
+
+
+def test_profile_error(tmp_path):
+    with pytest.raises(ProfileError):
+        TuningProfile([])
+    with pytest.raises(ProfileError):
+        TuningProfile([Bucket(0, {})])
+    with pytest.raises(ProfileError):
+        TuningProfile([Bucket(100, {"tolerance": 0.1})])
+
+    file_path = tmp_path / "profile.json"
+    file_path.write_text(json.dumps({"buckets": [{"size": 100}]}))
+    with pytest.raises(ProfileError):
+        TuningProfile.load(file_path)
+    file_path.write_text(json.dumps({}))
+    with pytest.raises(ProfileError):
+        TuningProfile.load(file_path)
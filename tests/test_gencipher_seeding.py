@@ -0,0 +1,60 @@
+import pytest
+
+from gencipher.cipherkey import CipherKey
+from gencipher.seeding import (
+    RandomFractionError,
+    apply_mapping,
+    frequency_key,
+    perturb_key,
+    seed_keys
+)
+
+
+PLAIN_TEXT = (
+    "It was the best of times, it was the worst of times, it was the age "
+    "of wisdom, it was the age of foolishness, it was the epoch of belief, "
+    "it was the epoch of incredulity, it was the season of Light, it was "
+    "the season of Darkness, it was the spring of hope, it was the winter "
+    "of despair, we had everything before us, we had nothing before us."
+)
+CIPHER_KEY = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM")
+
+
+def test_frequency_key():
+    cipher_text = CIPHER_KEY.encode_cipher(PLAIN_TEXT)
+    key = frequency_key(cipher_text)
+
+    deciphered_text = key.decode_cipher(cipher_text)
+    matches = sum(a == b for a, b in zip(deciphered_text, PLAIN_TEXT)
+                  if a.isalpha())
+    assert matches / sum(a.isalpha() for a in PLAIN_TEXT) > 0.2
+
+
+def test_perturb_key():
+    key = perturb_key(CIPHER_KEY, n_swaps=2)
+    assert sorted(key) == sorted(CIPHER_KEY)
+    assert sum(a != b for a, b in zip(key, CIPHER_KEY)) <= 4
+
+
+def test_apply_mapping():
+    key = apply_mapping(CipherKey("ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+                        {"Q": "A", "W": "B"})
+    assert sorted(key) == sorted(CIPHER_KEY)
+    assert key.decode_cipher("QW") == "AB"
+
+
+@pytest.mark.parametrize("random_fraction", [0, 0.3, 1])
+def test_seed_keys(random_fraction):
+    keys = seed_keys(CIPHER_KEY, 20, random_fraction)
+
+    assert len(keys) == 20
+    assert (keys[0] == CIPHER_KEY) == (random_fraction < 1)
+
+    mapping = {"Z": "T", "I": "H"}
+    keys = seed_keys(CIPHER_KEY, 20, random_fraction, mapping=mapping)
+    n_perturbed = 20 - round(20 * random_fraction)
+    for key in keys[:n_perturbed]:
+        assert key.decode_cipher("ZI") == "TH"
+
+    with pytest.raises(RandomFractionError):
+        seed_keys(CIPHER_KEY, 20, random_fraction + 1.5)
@@ -0,0 +1,163 @@
+import json
+import queue
+import threading
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+from gencipher.budget import BudgetValueError
+from gencipher.model import N_Threads_Error
+from gencipher.service import (
+    DecipherServer, DecipherService, QueueSizeError, RequestParamError
+)
+
+
+CIPHER_TEXT = (
+    "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+    "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+)
+PARAMS = {"max_iter": 3, "n_population": 20}
+
+
+@pytest.fixture(scope="module")
+def server():
+    service = DecipherService("bigram", n_workers=2, seed=0)
+    with service, DecipherServer(service, ("127.0.0.1", 0)) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+
+
+def _request(server, path, body=None):
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    data = None if body is None else body.encode()
+    try:
+        with urlopen(Request(url, data=data)) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_service_decipher(server):
+    status, job = _request(server, "/decipher",
+                           json.dumps({"cipher_text": CIPHER_TEXT,
+                                       "cribs": {"Rbo": "The"},
+                                       "deadline": 30, **PARAMS}))
+    assert status == 202
+    assert job["status"] in ("queued", "running", "done")
+
+    status, job = _request(server, f"/jobs/{job['id']}?wait=30")
+    assert status == 200
+    assert job["status"] == "done"
+    assert job["generation"] == 3
+    assert job["text"].startswith("The")
+    assert job["evaluations"] > 20
+    assert 0 < job["fitness"] <= 1.1
+
+
+def test_service_errors(server):
+    assert _request(server, "/health") == (200, {"workers": 2, "queued": 0})
+    assert _request(server, "/jobs/unknown")[0] == 404
+    assert _request(server, "/unknown")[0] == 404
+    assert _request(server, "/unknown", "{}")[0] == 404
+    for body in ["not json", "[]", "{}", '{"cipher_text": 1}',
+                 json.dumps({"cipher_text": CIPHER_TEXT, "seed": 1}),
+                 json.dumps({"cipher_text": CIPHER_TEXT, "deadline": 0})]:
+        assert _request(server, "/decipher", body)[0] == 400
+
+    status, job = _request(server, "/decipher",
+                           json.dumps({"cipher_text": "a"}))
+    assert status == 202
+    assert _request(server, f"/jobs/{job['id']}?wait=x")[0] == 400
+    job = _request(server, f"/jobs/{job['id']}?wait=30")[1]
+    assert job["status"] == "failed"
+    assert "cipher text" in job["error"]
+
+    server.service.max_jobs = 0
+    _request(server, "/decipher", json.dumps({"cipher_text": CIPHER_TEXT,
+                                              **PARAMS}))
+    assert _request(server, f"/jobs/{job['id']}")[0] == 404
+    server.service.max_jobs = 1000
+
+
+def test_service_backpressure():
+    service = DecipherService("bigram", queue_size=1)
+    job = service.submit(CIPHER_TEXT, deadline=1e-6, **PARAMS)
+    with pytest.raises(queue.Full):
+        service.submit(CIPHER_TEXT)
+    time.sleep(1e-3)
+
+    with service:
+        assert job.finished.wait(30)
+    assert job.status == "expired"
+    assert service.get(job.id) is job
+
+    service.start()
+    service.start()
+    job = service.submit(CIPHER_TEXT, deadline=30, max_time=1e-3, **PARAMS)
+    service.stop()
+    assert job.status == "done"
+    assert job.generation >= 1
+
+
+def test_service_unexpected_error(monkeypatch):
+    service = DecipherService("bigram")
+
+    def fail(*args, **kwargs):
+        raise KeyError("table")
+
+    monkeypatch.setattr(service.workers[0], "decipher_generator", fail)
+    with service:
+        job = service.submit(CIPHER_TEXT, **PARAMS)
+        assert job.finished.wait(30)
+        assert job.status == "failed"
+        assert job.error == "KeyError: 'table'"
+
+        # The worker survives the failure
+        monkeypatch.undo()
+        job = service.submit(CIPHER_TEXT, **PARAMS)
+        assert job.finished.wait(30)
+        assert job.status == "done"
+
+
+def test_service_queue_full():
+    service = DecipherService("bigram", queue_size=1)
+    with DecipherServer(service, ("127.0.0.1", 0)) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        body = json.dumps({"cipher_text": CIPHER_TEXT, **PARAMS})
+        assert _request(server, "/decipher", body)[0] == 202
+        status, response = _request(server, "/decipher", body)
+        assert status == 503
+        assert "retry" in response["error"]
+        assert _request(server, "/health")[1]["queued"] == 1
+        server.shutdown()
+
+
+def test_service_body_limit(server):
+    server_port = server.server_port
+    request = Request(f"http://127.0.0.1:{server_port}/decipher", data=b"{}",
+                      headers={"Content-Length": str(1 << 30)})
+    with pytest.raises(HTTPError) as error:
+        urlopen(request)
+    assert error.value.code == 413
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"n_workers": 0}, N_Threads_Error),
+    ({"queue_size": 0}, QueueSizeError)
+])
+def test_service_values(kwargs, error):
+    with pytest.raises(error):
+        DecipherService("bigram", **kwargs)
+
+
+def test_service_submit_values():
+    service = DecipherService("bigram")
+    with pytest.raises(RequestParamError):
+        service.submit(CIPHER_TEXT, seed=1)
+    with pytest.raises(BudgetValueError):
+        service.submit(CIPHER_TEXT, deadline=-1)
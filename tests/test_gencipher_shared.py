@@ -0,0 +1,80 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from gencipher.cipherkey import random_cipher_key
+from gencipher.ngram import Ngram
+from gencipher import shared
+from gencipher.shared import SharedPopulation, SlotsError
+
+
+CIPHER_TEXT = (
+    "Rbo rpktigo vcrb bwucja wj kloj hcjd, km sktpqo, cq rbwr loklgo "
+    "vcgg cjqcqr kj skhcja wgkja wjd rpycja rk ltr rbcjaq cj cr."
+)
+
+
+def test_shared_population():
+    ngram = Ngram("bigram")
+    rng = np.random.default_rng(0)
+    keys = [random_cipher_key(rng) for _ in range(10)]
+    expected = ngram.score_keys(keys, ngram.encode_text(CIPHER_TEXT))
+
+    with SharedPopulation.create(ngram, CIPHER_TEXT, 10) as population:
+        assert len(population) == 10
+        assert np.all(population.fitness == -np.inf)
+        population.write({key: 0.0 for key in keys[:4]})
+        population.write({key: -np.inf for key in keys[4:]}, start=4)
+        population.write({})
+        assert list(population.read(stop=4).items()) == [
+            (key, 0.0) for key in keys[:4]
+        ]
+
+        # An attached population sees the writes of the creator
+        attached = SharedPopulation.attach(population.spec)
+        attached.score(2)
+        assert population.fitness[:2].tolist() == [0.0, 0.0]
+        assert population.fitness[2:] == pytest.approx(expected[2:])
+        assert list(population.read(2)) == keys[2:]
+        attached.close()
+
+        # The worker side of score_parallel, run in process as coverage
+        # does not follow the worker processes
+        shared._score_slots(population.spec, 0, 2)
+        assert population.fitness == pytest.approx(expected)
+
+        # Scoring another population releases the previous attachment
+        with SharedPopulation.create(ngram, CIPHER_TEXT, 1) as other:
+            shared._score_slots(other.spec, 0, 1)
+            assert list(shared._attached) == [other.spec.name]
+            shared._attached.pop(other.spec.name).close()
+
+        with pytest.raises(SlotsError):
+            population.write({key: 0.0 for key in keys}, start=1)
+        with pytest.raises(SlotsError):
+            population.write({keys[0]: 0.0}, start=-1)
+
+    with pytest.raises(SlotsError):
+        SharedPopulation.create(ngram, CIPHER_TEXT, 0)
+
+
+def test_score_parallel():
+    ngram = Ngram("bigram")
+    rng = np.random.default_rng(0)
+    keys = [random_cipher_key(rng) for _ in range(50)]
+    expected = ngram.score_keys(keys, ngram.encode_text(CIPHER_TEXT))
+
+    with SharedPopulation.create(ngram, CIPHER_TEXT, 50) as population:
+        population.write({key: -np.inf for key in keys})
+        with ProcessPoolExecutor(2) as executor:
+            population.score_parallel(executor, 4)
+            assert population.fitness == pytest.approx(expected)
+
+            # Later generations reuse the attachments of the workers
+            keys = [random_cipher_key(rng) for _ in range(50)]
+            population.write({key: -np.inf for key in keys})
+            population.score_parallel(executor, 4)
+        assert list(population.read().values()) == pytest.approx(
+            ngram.score_keys(keys, ngram.encode_text(CIPHER_TEXT))
+        )
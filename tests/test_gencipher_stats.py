@@ -0,0 +1,36 @@
+import time
+
+from gencipher.stats import PHASES, Recorder
+
+
+def test_recorder_exclusive_phases():
+    generations = []
+    recorder = Recorder(callback=generations.append)
+
+    with recorder.phase("crossover"):
+        time.sleep(0.01)
+        with recorder.phase("fitness"):
+            time.sleep(0.02)
+    stats = recorder.end_generation(evaluations=5,
+                                    diversity=0.5,
+                                    best_fitness=-10.0)
+
+    assert generations == [stats]
+    assert stats.generation == 1
+    assert stats.fitness >= 0.02
+    assert 0.01 <= stats.crossover < stats.fitness
+    assert stats.as_dict()["evaluations"] == 5
+
+    recorder.end_generation(evaluations=3, diversity=1.0, best_fitness=-9.0)
+    totals = recorder.stats.totals()
+    assert set(PHASES) < set(totals)
+    assert totals["evaluations"] == 8
+    assert recorder.stats.generations[-1].generation == 2
+
+    # A bounded recorder keeps the latest generations, but the totals
+    # of the whole run
+    bounded = Recorder(max_generations=1)
+    bounded.end_generation(evaluations=5, diversity=0.5, best_fitness=-10.0)
+    bounded.end_generation(evaluations=3, diversity=1.0, best_fitness=-9.0)
+    assert [stats.generation for stats in bounded.stats.generations] == [2]
+    assert bounded.stats.totals()["evaluations"] == 8
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from gencipher.tables import (
+    HashedTable,
+    build_table,
+    load_entries,
+    save_entries
+)
+from gencipher.utils import InvalidInputError
+
+
+INDICES = np.array([0, 7, 42, 300, 675])
+VALUES = np.array([-1.5, -2.25, -3.0, -4.75, -1.0])
+FLOOR = -8.0
+
+
+@pytest.mark.parametrize("table_format,tolerance", [
+    ("dense", 1e-12),
+    ("int16", 1e-3),
+    ("uint8", 0.05),
+    ("hashed", 1e-3)
+])
+def test_build_table(table_format, tolerance):
+    table = build_table(INDICES, VALUES, FLOOR, 2, table_format)
+    indices = np.array([[0, 7, 1], [675, 674, 300]])
+
+    expected = [-1.5 - 2.25 + FLOOR, -1.0 + FLOOR - 4.75]
+    assert list(table.score(indices)) == pytest.approx(expected,
+                                                       abs=tolerance)
+    assert table.nbytes > 0
+
+    with pytest.raises(InvalidInputError):
+        build_table(INDICES, VALUES, FLOOR, 2, "sparse")
+
+
+def test_hashed_table_collisions():
+    rng = np.random.default_rng(0)
+    indices = rng.choice(26 ** 4, 5000, replace=False)
+    values = rng.uniform(-7, -1, 5000)
+    table = HashedTable(indices, values, -9.0)
+
+    assert table.max_probes > 1
+    codes = table.lookup(np.concatenate([indices, [26 ** 4 - 1]]))
+    decoded = codes * table._quantizer.scale + table._quantizer.offset
+    assert decoded[:-1] == pytest.approx(values, abs=1e-3)
+    assert decoded[-1] == pytest.approx(-9.0)
+
+
+def test_save_load_entries(tmp_path):
+    file_path = tmp_path / "english_bigrams.npz"
+    save_entries(file_path, INDICES[::-1], VALUES[::-1], FLOOR, -2.5)
+
+    indices, values, floor, fitness = load_entries(file_path)
+    assert list(indices) == list(INDICES)
+    assert list(values) == pytest.approx(list(VALUES))
+    assert (floor, fitness) == (FLOOR, -2.5)
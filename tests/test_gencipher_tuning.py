@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+
+from gencipher.ngram import ScoresNotFoundError
+from gencipher.profiles import TuningProfile
+from gencipher.tuning import (
+    CorpusError, GridError, TuningRunError, letter_accuracy, main,
+    make_corpus, tune
+)
+from gencipher.utils import InvalidInputError
+
+
+PLAIN_TEXT = (
+    "It was the best of times, it was the worst of times, it was the age "
+    "of wisdom, it was the age of foolishness, it was the epoch of belief, "
+    "it was the epoch of incredulity, it was the season of Light, it was "
+    "the season of Darkness, it was the spring of hope, it was the winter "
+    "of despair, we had everything before us, we had nothing before us."
+)
+GRID = {"n_population": [10, 20], "max_iter": [2]}
+
+
+def test_make_corpus():
+    corpus = make_corpus(PLAIN_TEXT, [50, 1000], 3,
+                         np.random.default_rng(0))
+    assert [sample.length for sample in corpus] == [50] * 3 + [1000] * 3
+    for sample in corpus:
+        assert len(sample.plain_text) == sample.length
+        assert sample.cipher_text == sample.key.encode_cipher(
+            sample.plain_text
+        )
+        assert sample.key.decode_cipher(sample.cipher_text) == (
+            sample.plain_text
+        )
+
+    with pytest.raises(CorpusError):
+        make_corpus(" ")
+    with pytest.raises(CorpusError):
+        make_corpus(PLAIN_TEXT, [0])
+
+
+def test_letter_accuracy():
+    assert letter_accuracy("Abc, d", "aBx, d") == 0.75
+    assert letter_accuracy("...", "...") == 1.0
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_tune(n_workers):
+    corpus = make_corpus(PLAIN_TEXT, [60, 200], 2, np.random.default_rng(0))
+    profile = tune(corpus, GRID, "bigram", n_workers=n_workers, seed=0,
+                   accuracy=0)
+    assert [bucket.length for bucket in profile.buckets] == [60, 200]
+    for bucket in profile.buckets:
+        assert bucket.params["n_population"] in GRID["n_population"]
+        assert bucket.params["max_iter"] == 2
+        assert 0 < bucket.time < np.inf
+        assert bucket.success_rate == 1
+
+    # Runs that never solve have an infinite expected time to solution
+    profile = tune(corpus[:1], GRID, "bigram", seed=0, accuracy=2)
+    assert profile.buckets[0].time == np.inf
+    assert profile.buckets[0].success_rate == 0
+
+
+def test_tune_errors():
+    corpus = make_corpus(PLAIN_TEXT, [60], 1, np.random.default_rng(0))
+    with pytest.raises(GridError):
+        tune(corpus, {})
+    with pytest.raises(GridError):
+        tune(corpus, {"tolerance": [0.1]})
+    with pytest.raises(GridError):
+        tune(corpus, {"n_population": []})
+    with pytest.raises(InvalidInputError):
+        tune(corpus, GRID, "invalid")
+    with pytest.raises(ScoresNotFoundError):
+        tune(corpus, GRID, "quintgram", n_workers=2)
+    with pytest.raises(TuningRunError):
+        tune(corpus, {"mutation_type": ["invalid"]}, "bigram")
+
+
+def test_tuning_main(tmp_path, capsys):
+    input_path = tmp_path / "corpus.txt"
+    input_path.write_text(PLAIN_TEXT)
+    output_path = tmp_path / "profile.json"
+
+    status = main([str(input_path), "-o", str(output_path), "--lengths",
+                   "60", "--samples", "1", "--grid", json.dumps(GRID),
+                   "--ngram-type", "bigram", "--accuracy", "0",
+                   "--seed", "0"])
+    assert status == 0
+    profile = TuningProfile.load(output_path)
+    assert profile.buckets[0].length == 60
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["length"] == 60 and summary["max_iter"] == 2
+
+    with pytest.raises(SystemExit) as error:
+        main([str(input_path), "--ngram-type", "quintgram"])
+    assert error.value.code == 2
+    assert "No quintgram scores found" in capsys.readouterr().err
@@ -0,0 +1,44 @@
+from gencipher.cipherkey import CipherKey
+from gencipher.words import WordPatternIndex, word_pattern
+
+
+PLAIN_TEXT = (
+    "It was the best of times, it was the worst of times, it was the age "
+    "of wisdom, it was the age of foolishness, it was the epoch of belief, "
+    "it was the epoch of incredulity, it was the season of light, it was "
+    "the season of darkness, it was the spring of hope, it was the winter "
+    "of despair, we had everything before us, we had nothing before us."
+)
+CIPHER_KEY = CipherKey("QWERTYUIOPASDFGHJKLZXCVBNM")
+
+
+def test_word_pattern():
+    assert word_pattern("letter") == "ABCCBD"
+    assert word_pattern("The") == "ABC"
+    assert word_pattern("") == ""
+
+
+def test_candidates():
+    index = WordPatternIndex()
+
+    assert "THE" in index.candidates("XYZ")
+    assert "THAT" in index.candidates("abca")
+    assert all(word_pattern(word) == "ABCCBD"
+               for word in index.candidates("LETTER"))
+    assert index.candidates("QQQQQQQQ") == []
+
+
+def test_constraints():
+    index = WordPatternIndex()
+    cipher_text = CIPHER_KEY.encode_cipher(PLAIN_TEXT)
+
+    constraints = index.constraints(cipher_text)
+    assert len(constraints) > 5
+    assert len(set(constraints.values())) == len(constraints)
+
+    decoded = CIPHER_KEY.decode_cipher("".join(constraints)).upper()
+    matches = sum(a == b for a, b in zip(decoded, constraints.values()))
+    assert matches / len(constraints) > 0.8
+
+    assert index.constraints("") == {}
+    assert index.constraints(cipher_text, max_nodes=0) == {}